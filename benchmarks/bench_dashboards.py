@@ -0,0 +1,168 @@
+################### benchmark da carga, do preparo, de cada grafico/tabela dos dashboards e do mapa
+################### uso: python -m benchmarks.bench_dashboards [escalas ...] [--only=nome,nome] [--save]
+# cada funcao roda sobre o CSV original (escala 1) e sobre datasets sinteticos N vezes maiores (benchmarks.datasets),
+# medindo o tempo (mediana de REPEAT execucoes) e o pico de memoria alocada (tracemalloc, numa execucao separada).
+# A verificacao falha (codigo de saida 1) quando o tempo ou o pico ficam acima de TOLERANCE x o baseline gravado com --save
+# (mais SLACK_MS / SLACK_MB). A escala 1000 (~7,5 milhoes de linhas, varios GB de memoria) so roda quando pedida.
+import functools
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from benchmarks.datasets import scaled_dataset
+from utils.charts import (barplot_bycity, barplot_bycountry, barplot_bycuisines, barplot_delivery, best_by_cuisine,
+                          best_restaurants, card_content, delivery_bycity, histogram_aggrating, pieplot_price, rating_bycity,
+                          table_statistic)
+from utils.cube import build_cube, rollup_count
+from utils.data_loader import DATASET_PATH, clean_code, enrich_data, optimize_dtypes, rename_columns
+from utils.maps import fast_map_restaurants, lod_map_restaurants, map_payload_size, map_restaurants
+from utils.stats import build_cost_histogram
+from utils.tables import TABLE_CACHE
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baselines", "dashboards.json")
+SCALES = [1, 10, 100, 1000]
+DEFAULT_SCALES = [1, 10, 100]
+TOLERANCE = 1.5
+SLACK_MS = 20.0
+SLACK_MB = 5.0
+CARD_CUISINES = ["North Indian", "American", "Cafe", "Italian", "Pizza"]
+
+################### quantidade de repeticoes do tempo por escala (datasets grandes rodam uma unica vez)
+def repeat_for(scale):
+    return 5 if scale == 1 else 3 if scale == 10 else 1
+
+################### argumentos sempre com o cache de tabelas html vazio (mede a montagem, nao o acerto no cache)
+def without_table_cache(*args):
+    TABLE_CACHE.clear()
+    return args
+
+################### benchmarks: nome -> (argumentos a partir do contexto da escala, funcao medida, maior escala)
+# os argumentos sao montados fora da medicao a cada repeticao (copias para as funcoes que alteram o DataFrame);
+# maior escala None = todas. O mapa com um folium.Marker por restaurante so roda no CSV original
+BENCHMARKS = {
+"read_csv": (lambda ctx: (ctx["csv_path"],), pd.read_csv, None),
+"clean_code": (lambda ctx: (ctx["raw"].copy(),), clean_code, None),
+"enrich_data": (lambda ctx: (ctx["cleaned"].copy(),), enrich_data, None),
+"rename_columns": (lambda ctx: (ctx["enriched"],), rename_columns, None),
+"optimize_dtypes": (lambda ctx: (ctx["renamed"],), optimize_dtypes, None),
+"build_cube": (lambda ctx: (ctx["df1"],), build_cube, None),
+"build_cost_histogram": (lambda ctx: (ctx["cube"], ctx["df1"]), build_cost_histogram, None),
+"barplot_bycountry": (lambda ctx: (ctx["cube"],),
+                      functools.partial(barplot_bycountry, var2="restaurant_id", title="Quantidade de restaurantes"), None),
+"barplot_bycountry[city]": (lambda ctx: (ctx["cube"],),
+                            functools.partial(barplot_bycountry, var2="city", title="Quantidade de cidades"), None),
+"table_statistic": (lambda ctx: without_table_cache(ctx["cube"]), table_statistic, None),
+"table_statistic[usd,details]": (lambda ctx: without_table_cache(ctx["cube"], ctx["histogram"]),
+                                 lambda cube, histogram: table_statistic(cube, usd=True, details=True, histogram=histogram),
+                                 None),
+"barplot_delivery": (lambda ctx: (ctx["cube"],), barplot_delivery, None),
+"barplot_bycity": (lambda ctx: (ctx["cube"],), barplot_bycity, None),
+"rating_bycity": (lambda ctx: (ctx["cube"],),
+                  functools.partial(rating_bycity, restricao="maior", valor=4, title="TOP{n}"), None),
+"delivery_bycity": (lambda ctx: (ctx["cube"],),
+                    functools.partial(delivery_bycity, var_selecao="is_delivering_now", title="TOP{n}"), None),
+"best_by_cuisine": (lambda ctx: (ctx["df1"],), best_by_cuisine, None),
+"card_content": (lambda ctx: (ctx["best"],), lambda best: [card_content(best, cuisine) for cuisine in CARD_CUISINES], None),
+"barplot_bycuisines": (lambda ctx: (ctx["cuisine_counts"],), barplot_bycuisines, None),
+"pieplot_price": (lambda ctx: (ctx["cube"],), pieplot_price, None),
+"histogram_aggrating": (lambda ctx: (ctx["df1"],), histogram_aggrating, None),
+"best_restaurants": (lambda ctx: without_table_cache(ctx["df1"]), best_restaurants, None),
+"map_restaurants": (lambda ctx: (ctx["df1"],), lambda df: map_payload_size(map_restaurants(df)), 1),
+"fast_map_restaurants": (lambda ctx: (ctx["df1"],), lambda df: map_payload_size(fast_map_restaurants(df)), 10),
+"lod_map_restaurants": (lambda ctx: (ctx["df1"],), lambda df: map_payload_size(lod_map_restaurants(df)[0]), None),
+}
+
+#----------------------------------------------------------------------------------------------------------------------------#
+#                                                        FUNCOES                                                             #
+#----------------------------------------------------------------------------------------------------------------------------#
+
+################### dados de entrada de todos os benchmarks de uma escala (cada etapa do preparo parte da anterior)
+def build_context(scale, directory):
+    raw = scaled_dataset(scale)
+    csv_path = DATASET_PATH
+    if scale != 1:
+        csv_path = os.path.join(directory, f"zomato_{scale}x.csv")
+        raw.to_csv(csv_path, index=False)
+    cleaned = clean_code(raw.copy())
+    enriched = enrich_data(cleaned.copy())
+    renamed = rename_columns(enriched)
+    df1 = optimize_dtypes(renamed).reset_index(drop=True)
+    cube = build_cube(df1)
+    return {"raw": raw, "csv_path": csv_path, "cleaned": cleaned, "enriched": enriched, "renamed": renamed, "df1": df1,
+            "cube": cube, "histogram": build_cost_histogram(cube, df1), "best": best_by_cuisine(df1),
+            "cuisine_counts": rollup_count(cube, "cuisines")}
+
+################### tempo (mediana, ms) e pico de memoria alocada durante a funcao (MB)
+# o lixo dos benchmarks anteriores e recolhido antes de cada execucao medida: uma coleta do gc durante a funcao media
+# o custo dos objetos de outro benchmark (e dependia da ordem em que eles rodaram)
+def measure(setup, function, ctx, repeat):
+    times = []
+    for _ in range(repeat):
+        args = setup(ctx)
+        gc.collect()
+        start = time.perf_counter()
+        function(*args)
+        times.append((time.perf_counter() - start) * 1000)
+    args = setup(ctx)
+    tracemalloc.start()
+    try:
+        function(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"ms": round(float(np.median(times)), 2), "peak_mb": round(peak / 1024 ** 2, 2)}
+
+################### comparando uma medida com o baseline: "ok" ou a descricao da regressao
+def check(result, reference):
+    if reference is None:
+        return "sem baseline"
+    problems = []
+    if result["ms"] > reference["ms"] * TOLERANCE + SLACK_MS:
+        problems.append(f"tempo (baseline {reference['ms']:,.1f} ms)")
+    if result["peak_mb"] > reference["peak_mb"] * TOLERANCE + SLACK_MB:
+        problems.append(f"memória (baseline {reference['peak_mb']:,.1f} MB)")
+    return "regressão: " + ", ".join(problems) if problems else "ok"
+
+def run(scales, names):
+    baseline = json.load(open(BASELINE_PATH, encoding="utf-8")) if os.path.exists(BASELINE_PATH) else {}
+    results, failures = {}, []
+    with tempfile.TemporaryDirectory() as directory:
+        for scale in scales:
+            ctx = build_context(scale, directory)
+            print(f"== escala {scale}x: {len(ctx['raw']):,} linhas brutas, {len(ctx['df1']):,} após a limpeza, "
+                  f"{len(ctx['cube']):,} células no cubo")
+            for name in names:
+                setup, function, max_scale = BENCHMARKS[name]
+                if max_scale is not None and scale > max_scale:
+                    continue
+                key = f"{scale}x/{name}"
+                results[key] = measure(setup, function, ctx, repeat_for(scale))
+                status = check(results[key], baseline.get(key))
+                if status.startswith("regressão"):
+                    failures.append(key)
+                print(f"{name:<30} {results[key]['ms']:>11,.1f} ms {results[key]['peak_mb']:>10,.1f} MB  [{status}]")
+            del ctx
+    return baseline, results, failures
+
+if __name__ == "__main__":
+    scales = [int(arg) for arg in sys.argv[1:] if not arg.startswith("--")] or DEFAULT_SCALES
+    only = [arg.split("=", 1)[1].split(",") for arg in sys.argv[1:] if arg.startswith("--only=")]
+    names = only[0] if only else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS] + [str(scale) for scale in scales if scale not in SCALES]
+    if unknown:
+        sys.exit(f"Benchmark/escala desconhecido: {', '.join(unknown)} (escalas: {SCALES}; benchmarks: {', '.join(BENCHMARKS)})")
+    baseline, results, failures = run(scales, names)
+    if "--save" in sys.argv:
+        # as medidas novas substituem somente as chaves medidas; as demais escalas/benchmarks continuam no arquivo
+        baseline.update(results)
+        os.makedirs(os.path.dirname(BASELINE_PATH), exist_ok=True)
+        with open(BASELINE_PATH, "w", encoding="utf-8") as file:
+            json.dump(dict(sorted(baseline.items())), file, indent=2)
+        print(f"Baseline gravado em {BASELINE_PATH}")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,97 @@
+################### perfil de importacao (python -X importtime) de cada pagina e dos modulos compartilhados
+################### uso: python -m benchmarks.bench_imports [--save]
+# cada alvo e importado num processo novo (partida a frio). A verificacao falha (codigo de saida 1) quando:
+# - um alvo importa uma biblioteca pesada que nao usa (FORBIDDEN);
+# - o tempo total fica acima de TOLERANCE x o baseline gravado com --save (mais SLACK_MS).
+import ast
+import json
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baselines", "imports.json")
+PAGES = ["Home.py", "pages/1_Visao_paises.py", "pages/2_Visao_cidades.py", "pages/3_Visao_culinaria.py",
+         "pages/4_Visao_proximidade.py"]
+MODULES = ["utils.data_loader", "utils.cube", "utils.filters", "utils.maps", "utils.stats", "utils.tables", "utils.charts",
+           "utils.instrumentation", "utils.sidebar", "utils.static_export"]
+TOLERANCE = 1.5
+SLACK_MS = 50.0
+REPEAT = 3
+TOP = 5
+
+################### bibliotecas pesadas que cada alvo nao deve importar (o proprio streamlit ja importa PIL e plotly)
+FORBIDDEN = {
+"pages/1_Visao_paises.py": ["folium", "haversine"],
+"pages/2_Visao_cidades.py": ["folium", "haversine"],
+"pages/3_Visao_culinaria.py": ["folium", "haversine"],
+"pages/4_Visao_proximidade.py": ["folium"],
+"utils.maps": ["folium", "branca", "jinja2"],
+"utils.charts": ["streamlit", "folium"],
+"utils.instrumentation": ["streamlit", "plotly"],
+"utils.sidebar": ["streamlit", "pandas"],
+"utils.static_export": ["streamlit", "folium"],
+}
+
+################### modulos carregados na inicializacao do interpretador (iguais para todos os alvos)
+STARTUP = {"site", "encodings", "_frozen_importlib_external", "io", "codecs", "abc"}
+
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+#----------------------------------------------------------------------------------------------------------------------------#
+#                                                        FUNCOES                                                             #
+#----------------------------------------------------------------------------------------------------------------------------#
+
+################### somente as instrucoes de import do arquivo da pagina (o restante do script nao e executado)
+def page_imports(path):
+    tree = ast.parse(open(os.path.join(ROOT, path), encoding="utf-8").read())
+    return "\n".join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+################### executando os imports num processo novo com -X importtime: {modulo: (proprio_us, acumulado_us, nivel)}
+def import_profile(code):
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr[-2000:])
+    profile = {}
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            profile[name] = (int(self_us), int(cumulative_us), len(indent) // 2)
+    return profile
+
+################### resumo de um alvo: tempo total (menor de REPEAT execucoes), importacoes mais pesadas e proibidas
+def summarize(target):
+    code = page_imports(target) if target.endswith(".py") else f"import {target}"
+    runs = [import_profile(code) for _ in range(REPEAT)]
+    profile = min(runs, key=lambda run: sum(c for _, c, level in run.values() if level == 0))
+    total_ms = sum(c for name, (_, c, level) in profile.items() if level == 0 and name not in STARTUP) / 1000
+    heaviest = sorted(((c / 1000, name) for name, (_, c, level) in profile.items()
+                       if level <= 1 and name not in STARTUP and name != target), reverse=True)[:TOP]
+    loaded = {name.split(".")[0] for name in profile}
+    forbidden = [name for name in FORBIDDEN.get(target, []) if name in loaded]
+    return {"total_ms": total_ms, "heaviest": heaviest, "forbidden": forbidden}
+
+if __name__ == "__main__":
+    baseline = json.load(open(BASELINE_PATH, encoding="utf-8")) if os.path.exists(BASELINE_PATH) else {}
+    results, failures = {}, []
+    for target in PAGES + MODULES:
+        summary = summarize(target)
+        results[target] = round(summary["total_ms"], 1)
+        limit = baseline.get(target, float("inf")) * TOLERANCE + SLACK_MS
+        status = "ok"
+        if summary["forbidden"]:
+            status = f"importa {', '.join(summary['forbidden'])}"
+        elif summary["total_ms"] > limit:
+            status = f"regressão (baseline {baseline[target]:.1f} ms)"
+        if status != "ok":
+            failures.append(target)
+        print(f"{target:<30} {summary['total_ms']:>8.1f} ms  [{status}]  " +
+              ", ".join(f"{name} {ms:.0f}ms" for ms, name in summary["heaviest"]))
+    if "--save" in sys.argv:
+        os.makedirs(os.path.dirname(BASELINE_PATH), exist_ok=True)
+        with open(BASELINE_PATH, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+        print(f"Baseline gravado em {BASELINE_PATH}")
+    sys.exit(1 if failures else 0)
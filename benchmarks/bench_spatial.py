@@ -0,0 +1,50 @@
+################### benchmark das consultas de proximidade: indice em grade x busca exaustiva em todas as linhas
+################### uso: python -m benchmarks.bench_spatial [fator_de_escala ...]
+import sys
+import time
+import numpy as np
+from utils.spatial import SPATIAL_COLUMNS, SpatialIndex, brute_force_nearest, brute_force_within
+from utils.data_loader import load_data
+
+QUERIES = 200
+RADIUS_KM = 5.0
+K = 10
+
+################### replicando as coordenadas reais com um deslocamento aleatorio (~1 km) para simular datasets maiores
+def scaled_coordinates(lat, lon, factor, seed=42):
+    rng = np.random.default_rng(seed)
+    lat = np.tile(lat, factor) + rng.normal(0, 0.01, len(lat) * factor)
+    lon = np.tile(lon, factor) + rng.normal(0, 0.01, len(lon) * factor)
+    return np.clip(lat, -90, 90), (lon + 180) % 360 - 180
+
+################### mediana do tempo (ms) de uma consulta
+def median_ms(query, points):
+    times = []
+    for point_lat, point_lon in points:
+        start = time.perf_counter()
+        query(point_lat, point_lon)
+        times.append((time.perf_counter() - start) * 1000)
+    return float(np.median(times))
+
+def run(factor):
+    df1 = load_data(columns=SPATIAL_COLUMNS)
+    lat, lon = scaled_coordinates(df1["latitude"].to_numpy(), df1["longitude"].to_numpy(), factor)
+    rng = np.random.default_rng(0)
+    sample = rng.integers(0, len(lat), QUERIES)
+    points = np.column_stack([lat[sample], lon[sample]])
+    start = time.perf_counter()
+    index = SpatialIndex(lat, lon)
+    build_ms = (time.perf_counter() - start) * 1000
+    results = {
+        "raio (índice)": median_ms(lambda a, b: index.within(a, b, RADIUS_KM), points),
+        "raio (exaustiva)": median_ms(lambda a, b: brute_force_within(lat, lon, a, b, RADIUS_KM), points),
+        f"k={K} (índice)": median_ms(lambda a, b: index.nearest(a, b, K), points),
+        f"k={K} (exaustiva)": median_ms(lambda a, b: brute_force_nearest(lat, lon, a, b, K), points),
+    }
+    print(f"\n{len(lat):,} restaurantes (fator {factor}) - construção do índice: {build_ms:.1f} ms")
+    for name, ms in results.items():
+        print(f"  {name:<18} {ms:8.3f} ms/consulta")
+
+if __name__ == "__main__":
+    for factor in [int(x) for x in sys.argv[1:]] or [1, 10, 100]:
+        run(factor)
@@ -0,0 +1,48 @@
+################### benchmark das tabelas html: pandas Styler x render_table (montagem direta das colunas)
+################### uso: python -m benchmarks.bench_tables [linhas ...]
+import sys
+import time
+import numpy as np
+import pandas as pd
+from utils.tables import TABLE_CACHE, build_table_html, render_table
+
+ROWS = [10, 1_000, 100_000]
+REPEAT = 5
+
+################### tabela sintetica com o formato da tabela de melhores restaurantes (textos ja formatados)
+def synthetic_table(rows, seed=42):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({"Restaurante": np.char.add("Restaurante ", rng.integers(0, 10 ** 6, rows).astype(str)),
+                         "País": rng.choice(["India", "Brazil", "England", "Turkey"], rows),
+                         "Cidade": rng.choice(["New Delhi", "São Paulo", "London", "Istanbul"], rows),
+                         "Preço médio*": [f"{value:,.0f}" for value in rng.integers(10, 5000, rows)],
+                         "Avaliação Média": [f"{value:,.2f}" for value in rng.uniform(0, 5, rows)]})
+
+################### mediana do tempo (ms) de uma funcao
+def median_ms(function, repeat=REPEAT):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append((time.perf_counter() - start) * 1000)
+    return float(np.median(times))
+
+def styler_html(df):
+    return (df.style.set_table_styles([{"selector": "th", "props": "background-color: #800000; color: white; font-size:10pt"}])
+            .set_properties(**{"font-size": "10pt"}).hide(axis="index").to_html())
+
+def run(rows):
+    df = synthetic_table(rows)
+    repeat = 1 if rows >= 100_000 else REPEAT
+    TABLE_CACHE.clear()
+    render_table(df, font_size="10pt")
+    return {"Styler": median_ms(lambda: styler_html(df), repeat),
+            "render_table (sem cache)": median_ms(lambda: build_table_html(df, "10pt", "T_bench"), repeat),
+            "render_table (em cache)": median_ms(lambda: render_table(df, font_size="10pt"), repeat),
+            "bytes Styler": len(styler_html(df)), "bytes render_table": len(render_table(df, font_size="10pt"))}
+
+if __name__ == "__main__":
+    for rows in [int(arg) for arg in sys.argv[1:]] or ROWS:
+        results = run(rows)
+        print(f"{rows:>9,} linhas | " + " | ".join(f"{name}: {value:,.2f} ms" if not name.startswith("bytes")
+                                                  else f"{name}: {value:,}" for name, value in results.items()))
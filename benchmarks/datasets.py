@@ -0,0 +1,16 @@
+################### datasets usados nos benchmarks: o CSV original (escala 1) e versoes sinteticas N vezes maiores
+import pandas as pd
+from utils.data_loader import DATASET_PATH
+from utils.synthetic import SEED, synthetic_dataset
+
+#----------------------------------------------------------------------------------------------------------------------------#
+#                                                        FUNCOES                                                             #
+#----------------------------------------------------------------------------------------------------------------------------#
+
+################### dataset bruto (mesmas 21 colunas do CSV) com scale vezes o numero de linhas do arquivo original
+# acima da escala 1 as linhas vem do gerador sintetico (utils.synthetic), que segue as distribuicoes reais por pais
+def scaled_dataset(scale, path=DATASET_PATH, seed=SEED):
+    raw = pd.read_csv(path)
+    if scale == 1:
+        return raw
+    return synthetic_dataset(len(raw) * scale, seed=seed, path=path)
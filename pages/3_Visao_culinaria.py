@@ -1,201 +1,78 @@
 ################### bibliotecas necessarias (libraries)
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-import folium
-from haversine import haversine
 import streamlit as st
-from PIL import Image
-from streamlit_folium import folium_static
-from datetime import datetime
-import numpy as np
-import inflection
 from streamlit_extras.metric_cards import style_metric_cards
+from utils.debug import finish_page, plotly_chart, start_page
+from utils.charts import (barplot_bycuisines, best_by_cuisine, best_restaurants, card_content, histogram_aggrating,
+                          pieplot_price)
+from utils.data_loader import load_data
+from utils.figure_cache import cached_figure
+from utils.cube import load_cube, load_cube_filters, rollup_count
+from utils.cuisines import load_cuisine_index
+from utils.filters import load_filter_engine
+from utils.sidebar import sidebar_filters, sidebar_footer, sidebar_header
 
 st.set_page_config(page_title="Visão Restaurantes", page_icon="👩‍🍳", layout="wide")
-
-#----------------------------------------------------------------------------------------------------------------------------#
-#                                                     DICIONARIOS                                                            #
-#----------------------------------------------------------------------------------------------------------------------------#
-
-################### dicionario com os codigos dos paises
-COUNTRIES = {
-1: "India",
-14: "Australia",
-30: "Brazil",
-37: "Canada",
-94: "Indonesia",
-148: "New Zeland",
-162: "Philippines",
-166: "Qatar",
-184: "Singapure",
-189: "South Africa",
-191: "Sri Lanka",
-208: "Turkey",
-214: "United Arab Emirates",
-215: "England",
-216: "United States of America",
-}
-
-################### dicionario com os codigos das cores
-COLORS = {
-"3F7E00": "darkgreen",
-"5BA829": "green",
-"9ACD32": "lightgreen",
-"CDD614": "orange",
-"FFBA00": "red",
-"CBCBC8": "darkred",
-"FF7800": "darkred",
-}
+start_page("culinaria")
 
 #----------------------------------------------------------------------------------------------------------------------------#
 #                                                        FUNCOES                                                             #
 #----------------------------------------------------------------------------------------------------------------------------#
 
-################### fazendo a limpeza no dataset
-def clean_code (df):
-    df = df.dropna().drop_duplicates()
-    df.drop("Switch to order menu", inplace=True, axis=1)
-    df.drop(df.loc[df["Average Cost for two"] == 25000017,:].index.item(), inplace=True, axis=0)
-    df["Cuisines"] = df["Cuisines"].astype(str).apply(lambda x: x.split(",")[0])
-    return df
-
-################### criando a variavel com o nome dos paises com base nos codigos
-def country_name(country_id):
-    return COUNTRIES[country_id]
-
-################### criando a categoria do tipo de preco de comida com base no range de valores
-def create_price_type(price_range):
-    if price_range == 1:
-        return "cheap"
-    elif price_range == 2:
-        return "normal"
-    elif price_range == 3:
-        return "expensive"
-    else:
-        return "gourmet"
-
-################### criando a variavel com o nome das cores com base nos codigos
-def color_name(color_code):
-    return COLORS[color_code]
-
-################### renomeando as colunas do DataFrame
-def rename_columns(dataframe):
-    df = dataframe.copy()
-    title = lambda x: inflection.titleize(x)
-    snakecase = lambda x: inflection.underscore(x)
-    spaces = lambda x: x.replace(" ", "")
-    cols_old = list(df.columns)
-    cols_old = list(map(title, cols_old))
-    cols_old = list(map(spaces, cols_old))
-    cols_new = list(map(snakecase, cols_old))
-    df.columns = cols_new
-    return df
-
-################### criando os cards dos melhores restaurantes por tipo de culinaria
-def card_cuisines(df, type_food):
-    df_aux = (df.loc[df1["cuisines"]==type_food, ["restaurant_id","restaurant_name","country_name","city",
-                                                  "average_cost_for_two","currency","aggregate_rating"]]
-               .groupby(["restaurant_id","restaurant_name","country_name","city","average_cost_for_two","currency"])
-               .max().sort_values(["aggregate_rating", "restaurant_id"], ascending=[False,True]).reset_index())
-    rest = df_aux.loc[0, "restaurant_name"]
-    nota = df_aux.loc[0, "aggregate_rating"]
-    pais = df_aux.loc[0, "country_name"]
-    cidade = df_aux.loc[0, "city"]
-    cf2 = df_aux.loc[0, "average_cost_for_two"]
-    moeda = df_aux.loc[0, "currency"]
-    multi = f'''Restaurante: {rest}  \nPaís: {pais}  \nCidade: {cidade}  \nMédia de preço para dois: {cf2} ({moeda})'''
-    label = f"{type_food}:  \n{rest}"
-    nota =f"{nota}/5.0"
+################### criando os cards dos melhores restaurantes por tipo de culinaria (a partir de best_by_cuisine)
+def card_cuisines(best, type_food):
+    label, nota, multi = card_content(best, type_food)
     card = st.metric(label, nota, help=multi)
     return card
-
-################### criando grafico de barras dos melhores tipos de culinaria
-def barplot_bycuisines(df):
-    df_aux = (df.loc[:, ["cuisines", "restaurant_id"]].groupby("cuisines").nunique()
-              .sort_values("restaurant_id", ascending=False).reset_index().head(5))
-    df_aux.columns = ["Tipos de culinária", "Quantidade de restaurantes"]
-    fig = px.bar(df_aux, x="Tipos de culinária", y="Quantidade de restaurantes", text_auto=True, width=500, height=400,
-                 template="plotly_white")
-    fig.update_traces(marker_color="darkred")
-    fig.update_layout(xaxis_title=None, yaxis_title=None, plot_bgcolor="white")
-    fig.update_xaxes(showline=True, linewidth=1.5, linecolor="gray")
-    return fig
-
-################### criando grafico de setores sobre tipo de preco dos restaurantes
-def pieplot_price(df):
-    df_aux = (df.loc[:, ["price_type", "restaurant_id"]].groupby("price_type").nunique()
-              .sort_values("restaurant_id", ascending=False).reset_index())
-    df_aux.columns = ["Tipo de preço", "Quantidade de restaurantes"]
-    fig = px.pie(df_aux, values="Quantidade de restaurantes", names="Tipo de preço", width=500, height=400, template="plotly_white",
-                 color_discrete_sequence=px.colors.sequential.RdBu)
-    return fig
-
-################### criando o histograma sobre avaliacao media dos restaurantes
-def histogram_aggrating(df):
-    df_aux = df.loc[:, ["aggregate_rating", "restaurant_id"]]
-    df_aux.columns = ["Avaliação média", "Quantidade de restaurantes"]
-    fig = px.histogram(df_aux, x="Avaliação média", nbins=30, text_auto=True, width=500, height=400, template="plotly_white")
-    fig.update_traces(marker_color="darkred")
-    fig.update_layout(yaxis_title="Quantidade de restaurantes", plot_bgcolor="white")
-    fig.update_xaxes(showline=True, linewidth=1.5, linecolor="gray")
-    return fig
-
-################### criando uma tabela com os melhores restaurantes conforme avaliacao media
-def best_restaurants(df):
-    df_aux = (df.loc[:, ["restaurant_id", "restaurant_name", "country_name", "city", "cuisines", "average_cost_for_two",
-                         "currency", "aggregate_rating", "votes", "price_type"]]
-              .groupby(["restaurant_id", "restaurant_name", "country_name", "city", "cuisines", "average_cost_for_two",
-                        "currency","votes", "price_type"]).mean()
-              .sort_values(["aggregate_rating", "restaurant_id"], ascending=[False,True]).reset_index().head(15))
-    df_aux = df_aux.loc[df_aux["aggregate_rating"]==4.9, df_aux.columns != "restaurant_id"]
-    df_aux.columns = ["Restaurante","País","Cidade","Culinária","Preço médio*","Moeda","Quantidade de Avaliações", 
-                      "Tipo de Preço", "Avaliação Média"]
-    df_aux[["Preço médio*", "Quantidade de Avaliações"]] = (df_aux[["Preço médio*", "Quantidade de Avaliações"]]
-                                                            .applymap("{:,.0f}".format))
-    df_aux["Avaliação Média"] = df_aux["Avaliação Média"].map("{:,.2f}".format)
-    df_aux = (df_aux.style.set_table_styles([{"selector": "th","props": "background-color: #800000; color: white; font-size:10pt"}])
-              .set_properties(**{'font-size': '10pt'}).hide(axis="index").to_html())
-    return df_aux
     
 #-----------------------------------------------------------------------------------------------------------------------------#
 #                                      INICIO DA ESTRUTURA LOGICA DO CODIGO                                                   #
 #-----------------------------------------------------------------------------------------------------------------------------#
 
-################### importando o dataset
-df = pd.read_csv("dataset/zomato.csv")
+################### colunas usadas por esta pagina (somente elas sao lidas do snapshot)
+COLUMNS = ["restaurant_id", "restaurant_name", "country_name", "city", "cuisines", "price_type", "average_cost_for_two",
+           "currency", "aggregate_rating", "votes"]
 
-################### limpando o dataset e aplicando as funcoes criadas para preparar o dataset para analise
-df1 = clean_code(df)
-df1["Country Name"] = df1["Country Code"].apply(lambda x: country_name(x))
-df1["Price type"] = df1["Price range"].apply(lambda x: create_price_type(x))
-df1["Color name"] = df1["Rating color"].apply(lambda x: color_name(x))
-df1 = rename_columns(df1)
+################### importando o dataset ja limpo e preparado (cache compartilhado pelo processo)
+data = load_data(columns=COLUMNS)
+filters = load_filter_engine()
+cuisine_index = load_cuisine_index()
+cube = load_cube()
+cube_filters = load_cube_filters()
 
 #============================#
 # Barra Lateral do Streamlit #
 #============================#
 
-image = Image.open("zomato.jpg")
-st.sidebar.image(image, width=210)
-st.sidebar.markdown("# Zomato Restaurants")
-st.sidebar.markdown("### Food Delivery")
-st.sidebar.divider()
-st.sidebar.markdown("## Filtros:")
-country_options = st.sidebar.multiselect("Selecione os países:", df1["country_name"].unique(), default = ["Philippines", "Brazil",
-                        "United States of America", "Canada", "United Arab Emirates", "India", "England", "Turkey"])
-price_options = st.sidebar.multiselect("Selecione os tipos de preço:", df1["price_type"].unique(), 
-                                       default = ["expensive", "gourmet", "normal", "cheap"])
-cuisines_options = st.sidebar.multiselect("Selecione os tipos de culinária:", df1["cuisines"].unique(), default = ["North Indian", "BBQ",
-                        "American", "Cafe", "Italian", "Pizza", "Brazilian", "Home-made"])
-select_country_filter = df1["country_name"].isin(country_options)
-df1 = df1.loc[select_country_filter, :]
-select_price_filter = df1["price_type"].isin(price_options)
-df1 = df1.loc[select_price_filter, :]
-select_cuisines_filter = df1["cuisines"].isin(cuisines_options)
-df1 = df1.loc[select_cuisines_filter, :]
-st.sidebar.divider()
-st.sidebar.markdown(":gray[Developed by Thaylla Alves]")
+sidebar_header()
+# filtros guardados na sessao (paises, tipos de preco e culinarias):
+selections, _ = sidebar_filters(["country_name", "price_type"])
+# com todas as culinarias, um restaurante "Italian, Pizza, Cafe" aparece nos filtros e contagens de Pizza e Cafe;
+# desmarcando, vale somente a primeira culinaria de cada restaurante (comportamento anterior, para comparacao)
+all_cuisines = st.sidebar.checkbox("Considerar todas as culinárias de cada restaurante", value=True)
+cuisine_dimension = "all_cuisines" if all_cuisines else "cuisines"
+cuisines_selections, _ = sidebar_filters([cuisine_dimension], title=False)
+selections.update(cuisines_selections)
+cuisines_options = selections[cuisine_dimension]
+selection = filters.select(**selections)
+df1 = selection.apply(data)
+if all_cuisines:
+    # o cubo agrupa pela primeira culinaria, entao o grafico de preco usa as contagens dos bitmaps do motor de filtros
+    # (mesmo formato do cubo), os cards usam os pares (restaurante, culinaria) do indice e o ranking as contagens do indice
+    cube = selection.counts("price_type").reset_index()
+    card_data = cuisine_index.explode(data, selection.mask, cuisines_options)
+    cuisine_counts = cuisine_index.counts(selection.mask, cuisines_options)
+else:
+    cube = cube_filters.select(**selections).apply(cube)
+    card_data = df1
+    cuisine_counts = rollup_count(cube, "cuisines")
+# tamanho de cada ranking:
+with st.sidebar.expander("Tamanho dos rankings"):
+    top_cuisines = st.slider("Tipos de culinária com mais restaurantes", 3, 20, 5)
+    top_restaurants = st.slider("Restaurantes com a maior avaliação média", 5, 50, 15)
+# culinarias exibidas nos cards (qualquer quantidade; sem restaurantes o card avisa em vez de falhar):
+card_options = st.sidebar.multiselect("Culinárias dos cards:", cuisine_index.names,
+                                      default = ["North Indian", "American", "Cafe", "Italian", "Pizza"])
+sidebar_footer()
 
 #=====================#
 # Layout do Streamlit #
@@ -203,42 +80,39 @@ st.sidebar.markdown(":gray[Developed by Thaylla Alves]")
 
 st.header("👩‍🍳 Visão de Negócios: Restaurantes")
 with st.container():
-    st.markdown("<h2 style='text-align: center; font-size:14pt; color: gray'>Melhores restaurantes do TOP5 tipos de culinária</h2>",
+    st.markdown(f"<h2 style='text-align: center; font-size:14pt; color: gray'>Melhores restaurantes de {len(card_options)} tipos de culinária</h2>",
                 unsafe_allow_html=True)
     style_metric_cards(border_left_color="#800000", box_shadow=False) 
-    col1, col2, col3, col4, col5 = st.columns(5)
-    with col1:
-        metricas = card_cuisines(df1, type_food="North Indian")
-    with col2:
-        metricas = card_cuisines(df1, type_food="American")
-    with col3:
-        metricas = card_cuisines(df1, type_food="Cafe")
-    with col4:
-        metricas = card_cuisines(df1, type_food="Italian")
-    with col5:
-        metricas = card_cuisines(df1, type_food="Pizza")  
+    best = cached_figure("culinaria", selections, best_by_cuisine, card_data)
+    for start in range(0, len(card_options), 5):
+        for col, type_food in zip(st.columns(5), card_options[start:start + 5]):
+            with col:
+                metricas = card_cuisines(best, type_food=type_food)
 with st.container():
     st.divider()
     col1, col2 = st.columns(2)
     with col1:
-        st.markdown("<h2 style='text-align: center; font-size:15pt; color: gray'>TOP5 - Quantidade de restaurantes por Tipo de Culinária</h2>", unsafe_allow_html=True)
-        fig = barplot_bycuisines(df1)
-        st.plotly_chart(fig, theme=None, use_container_width=True)
+        st.markdown(f"<h2 style='text-align: center; font-size:15pt; color: gray'>TOP{top_cuisines} - Quantidade de restaurantes por Tipo de Culinária</h2>", unsafe_allow_html=True)
+        fig = cached_figure("culinaria", selections, barplot_bycuisines, cuisine_counts, n=top_cuisines)
+        plotly_chart(fig, theme=None, use_container_width=True)
     with col2:
         st.markdown("<h2 style='text-align: center; font-size:15pt; color: gray'>Distribuição do tipo de preço dos restaurantes</h2>",
                     unsafe_allow_html=True)
-        fig = pieplot_price(df1)
-        st.plotly_chart(fig, theme=None, use_container_width=True)
+        fig = cached_figure("culinaria", selections, pieplot_price, cube)
+        plotly_chart(fig, theme=None, use_container_width=True)
 with st.container():
     st.divider()
     st.markdown("<h2 style='text-align: center; font-size:15pt; color: gray'>Distribuição das avaliações médias dos restaurantes</h2>",
                 unsafe_allow_html=True)
-    fig = histogram_aggrating(df1)
-    st.plotly_chart(fig, theme=None, use_container_width=True)
+    fig = cached_figure("culinaria", selections, histogram_aggrating, df1)
+    plotly_chart(fig, theme=None, use_container_width=True)
 with st.container():
     st.divider()
-    st.markdown("<h2 style='text-align: center; font-size:15pt; color: gray'>TOP 15 Restaurantes com a maior avaliação média</h2>",
+    st.markdown(f"<h2 style='text-align: center; font-size:15pt; color: gray'>TOP {top_restaurants} Restaurantes com a maior avaliação média</h2>",
                 unsafe_allow_html=True)
-    df_aux = best_restaurants(df1)
+    df_aux = cached_figure("culinaria", selections, best_restaurants, df1, n=top_restaurants)
     st.markdown(df_aux, unsafe_allow_html=True)
-    st.markdown("<h2 style='text-align: right; font-size:9pt; color: gray'>* Preço médio para duas pessoas", unsafe_allow_html=True)
\ No newline at end of file
+    st.markdown("<h2 style='text-align: right; font-size:9pt; color: gray'>* Preço médio para duas pessoas", unsafe_allow_html=True)
+
+################### fim do rerun: registra os tempos dos trechos (painel de debug e exportacao das metricas)
+finish_page()
@@ -0,0 +1,60 @@
+################### bibliotecas necessarias (libraries)
+import streamlit as st
+from utils.debug import finish_page, start_page
+from utils.sidebar import sidebar_footer, sidebar_header
+from utils.spatial import load_spatial_index, nearest_restaurants, restaurants_within
+
+st.set_page_config(page_title="Visão Proximidade", page_icon="📍", layout="wide")
+start_page("proximidade")
+
+#-----------------------------------------------------------------------------------------------------------------------------#
+#                                      INICIO DA ESTRUTURA LOGICA DO CODIGO                                                   #
+#-----------------------------------------------------------------------------------------------------------------------------#
+
+################### importando o dataset e o indice espacial (construidos uma vez por processo)
+df1, index = load_spatial_index()
+
+#============================#
+# Barra Lateral do Streamlit #
+#============================#
+
+sidebar_header()
+st.sidebar.markdown("## Ponto de referência:")
+# cidade usada apenas para sugerir as coordenadas iniciais:
+cities = sorted(df1["city"].unique())
+city = st.sidebar.selectbox("Selecione uma cidade:", cities, index=cities.index("São Paulo") if "São Paulo" in cities else 0)
+city_center = df1.loc[df1["city"] == city, ["latitude", "longitude"]].median()
+latitude = st.sidebar.number_input("Latitude:", min_value=-90.0, max_value=90.0, value=float(city_center["latitude"]),
+                                   format="%.5f")
+longitude = st.sidebar.number_input("Longitude:", min_value=-180.0, max_value=180.0, value=float(city_center["longitude"]),
+                                    format="%.5f")
+st.sidebar.markdown("## Consulta:")
+mode = st.sidebar.radio("Tipo de busca:", ["Restaurantes dentro do raio", "Restaurantes mais próximos"])
+if mode == "Restaurantes dentro do raio":
+    radius = st.sidebar.slider("Raio (km):", min_value=0.5, max_value=50.0, value=2.0, step=0.5)
+else:
+    k = st.sidebar.slider("Quantidade de restaurantes:", min_value=1, max_value=50, value=10)
+sidebar_footer()
+
+#=====================#
+# Layout do Streamlit #
+#=====================#
+
+st.header("📍 Visão de Negócios: Proximidade")
+with st.container():
+    if mode == "Restaurantes dentro do raio":
+        df_aux = restaurants_within(latitude, longitude, radius)
+        subtitle = f"Restaurantes a até {radius:g} km do ponto ({latitude:.5f}, {longitude:.5f})"
+    else:
+        df_aux = nearest_restaurants(latitude, longitude, k)
+        subtitle = f"{k} restaurantes mais próximos do ponto ({latitude:.5f}, {longitude:.5f})"
+    st.markdown(f"<h2 style='text-align: left; font-size:14pt; color: gray'>{subtitle}</h2>", unsafe_allow_html=True)
+    st.metric("Restaurantes encontrados", len(df_aux))
+    df_aux = df_aux[["restaurant_name", "country_name", "city", "cuisines", "aggregate_rating", "average_cost_for_two",
+                     "currency", "distance_km"]]
+    df_aux.columns = ["Restaurante", "País", "Cidade", "Culinária", "Avaliação Média", "Preço médio*", "Moeda", "Distância (km)"]
+    st.dataframe(df_aux.round({"Distância (km)": 2}), hide_index=True, use_container_width=True)
+    st.markdown("<h2 style='text-align: right; font-size:9pt; color: gray'>* Preço médio para duas pessoas", unsafe_allow_html=True)
+
+################### fim do rerun: registra os tempos dos trechos (painel de debug e exportacao das metricas)
+finish_page()
@@ -0,0 +1,37 @@
+################### bibliotecas necessarias (libraries)
+import os
+import shutil
+import numpy as np
+import pytest
+from utils.data_loader import DATASET_PATH, cache_info, clear_cache, load_data
+
+#----------------------------------------------------------------------------------------------------------------------------#
+#                                                        TESTES                                                              #
+#----------------------------------------------------------------------------------------------------------------------------#
+
+################### copia do CSV sem snapshot ao lado (forca o preparo do CSV completo)
+@pytest.fixture
+def csv_path(tmp_path):
+    path = os.path.join(tmp_path, "zomato.csv")
+    shutil.copy(DATASET_PATH, path)
+    clear_cache()
+    yield path
+    clear_cache()
+
+################### o DataFrame compartilhado nao aceita alteracoes no lugar, nem pela copia rasa devolvida a pagina
+def test_load_data_is_read_only(csv_path):
+    df1 = load_data(csv_path)
+    for col in ["aggregate_rating", "city", "restaurant_name", "votes"]:
+        with pytest.raises(ValueError, match="read-only"):
+            df1.loc[0, col] = df1.loc[1, col]
+    df1["extra"] = 1
+    assert "extra" not in load_data(csv_path).columns
+
+################### as colunas pedidas sao visoes do DataFrame completo, sem uma copia no cache por projecao
+def test_load_data_columns_are_views(csv_path):
+    full = load_data(csv_path)
+    df1 = load_data(csv_path, columns=["aggregate_rating", "votes"])
+    assert list(df1.columns) == ["aggregate_rating", "votes"]
+    for col in df1.columns:
+        assert np.shares_memory(df1[col].to_numpy(), full[col].to_numpy())
+    assert cache_info()["entries"] == 1
@@ -0,0 +1,17 @@
+################### bibliotecas necessarias (libraries)
+import numpy as np
+import pandas as pd
+import pytest
+from utils.figure_cache import MAX_HASHED_VALUES, normalize
+
+#----------------------------------------------------------------------------------------------------------------------------#
+#                                                        TESTES                                                              #
+#----------------------------------------------------------------------------------------------------------------------------#
+
+################### dados pequenos entram na chave pelo conteudo; dados grandes sao recusados em vez de hasheados a cada rerun
+def test_normalize_hashes_small_data_and_rejects_large_data():
+    small = pd.DataFrame({"value": np.arange(10)})
+    assert normalize({"data": small}) == normalize({"data": small.copy()})
+    assert normalize({"data": small}) != normalize({"data": small + 1})
+    with pytest.raises(TypeError, match="grande demais"):
+        normalize({"data": np.zeros(MAX_HASHED_VALUES + 1)})
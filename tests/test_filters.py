@@ -0,0 +1,23 @@
+################### bibliotecas necessarias (libraries)
+import numpy as np
+import pandas as pd
+from utils.filters import FilterEngine, Range
+
+#----------------------------------------------------------------------------------------------------------------------------#
+#                                                        TESTES                                                              #
+#----------------------------------------------------------------------------------------------------------------------------#
+
+################### os bitmaps de cada valor (inclusive das dimensoes preguicosas) batem com o filtro do pandas
+def test_bitmaps_match_pandas():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"country_name": rng.choice(["Brazil", "India", "Qatar"], 1001),
+                       "aggregate_rating": rng.choice([0.0, 3.5, 4.2, 4.9], 1001)})
+    engine = FilterEngine(df, ["country_name"], ["aggregate_rating"])
+    assert list(engine.pending) == ["aggregate_rating"]
+    for country in ["Brazil", "India", "Qatar"]:
+        expected = np.packbits(df["country_name"].to_numpy() == country)
+        assert (engine.bitmaps["country_name"][engine.positions["country_name"][country]] == expected).all()
+    selection = engine.select(country_name=["Brazil", "Qatar"], aggregate_rating=Range(4, 5))
+    expected = df["country_name"].isin(["Brazil", "Qatar"]) & df["aggregate_rating"].between(4, 5)
+    assert (selection.mask == expected.to_numpy()).all()
+    assert not engine.pending
@@ -0,0 +1,38 @@
+################### bibliotecas necessarias (libraries)
+import os
+import pandas as pd
+import pytest
+from utils.cube import CUBE_DIMENSIONS, build_cube
+from utils.data_loader import DATASET_PATH, prepare_data
+from utils.incremental import refresh
+from utils.snapshot import cube_snapshot_path, read_snapshot, snapshot_path
+
+pytest.importorskip("pyarrow")
+
+#----------------------------------------------------------------------------------------------------------------------------#
+#                                                        TESTES                                                              #
+#----------------------------------------------------------------------------------------------------------------------------#
+
+################### cubo em uma ordem fixa de celulas (a atualizacao incremental nao preserva a ordem)
+def sorted_cube(cube):
+    cube = cube.astype({col: str for col in CUBE_DIMENSIONS})
+    return cube.sort_values(CUBE_DIMENSIONS).reset_index(drop=True)
+
+################### preparando somente as linhas alteradas, o snapshot e o cubo ficam iguais aos do preparo completo
+def test_refresh_matches_full_prepare(tmp_path):
+    path = os.path.join(tmp_path, "zomato.csv")
+    raw = pd.read_csv(DATASET_PATH)
+    raw.to_csv(path, index=False)
+    refresh(path)
+    ids = raw["Restaurant ID"].drop_duplicates()
+    raw.loc[raw["Restaurant ID"].isin(ids.iloc[:20]), "Average Cost for two"] += 1
+    raw.loc[raw["Restaurant ID"].isin(ids.iloc[20:25]), "City"] = "Nova Cidade"
+    raw = raw.loc[~raw["Restaurant ID"].isin(ids.iloc[30:40]), :]
+    inserted = raw.iloc[:3].assign(**{"Restaurant ID": [-1, -2, -3], "Cuisines": "Culinaria Nova, Pizza"})
+    pd.concat([raw.iloc[:100], inserted, raw.iloc[100:]]).to_csv(path, index=False)
+    manifest = refresh(path)
+    assert (manifest["inserted"], manifest["updated"], manifest["deleted"]) == (3, 25, 10)
+    full = prepare_data(pd.read_csv(path))
+    pd.testing.assert_frame_equal(read_snapshot(snapshot_path(path)), full)
+    pd.testing.assert_frame_equal(sorted_cube(read_snapshot(cube_snapshot_path(path))), sorted_cube(build_cube(full)),
+                                  check_dtype=False)
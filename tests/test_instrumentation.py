@@ -0,0 +1,24 @@
+################### bibliotecas necessarias (libraries)
+from utils import instrumentation
+from utils.instrumentation import METRIC_PREFIX, to_prometheus
+
+#----------------------------------------------------------------------------------------------------------------------------#
+#                                                        TESTES                                                              #
+#----------------------------------------------------------------------------------------------------------------------------#
+
+################### valores de cada serie do texto do Prometheus: nome da metrica -> texto do valor
+def samples(text):
+    return {line.split("{", 1)[0]: line.rsplit(" ", 1)[1] for line in text.splitlines() if not line.startswith("#")}
+
+################### contadores acima de 1e7 voltam exatos (sem notacao cientifica arredondada) e os segundos sem perda
+def test_prometheus_counters_round_trip_exactly(monkeypatch):
+    monkeypatch.setattr(instrumentation, "RERUN_TOTALS", {"paises": [12_345_679, 0.1 + 0.2]})
+    span_totals = {("paises", "load_data"): [10_000_001, 1234.5678901234, 752_700_001, 98_765_432_123]}
+    monkeypatch.setattr(instrumentation, "SPAN_TOTALS", span_totals)
+    values = samples(to_prometheus())
+    assert int(values[f"{METRIC_PREFIX}_reruns_total"]) == 12_345_679
+    assert float(values[f"{METRIC_PREFIX}_rerun_seconds_total"]) == 0.1 + 0.2
+    assert int(values[f"{METRIC_PREFIX}_span_calls_total"]) == 10_000_001
+    assert float(values[f"{METRIC_PREFIX}_span_seconds_total"]) == 1234.5678901234
+    assert int(values[f"{METRIC_PREFIX}_span_rows_total"]) == 752_700_001
+    assert int(values[f"{METRIC_PREFIX}_span_payload_bytes_total"]) == 98_765_432_123
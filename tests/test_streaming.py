@@ -0,0 +1,18 @@
+################### bibliotecas necessarias (libraries)
+import numpy as np
+import pandas as pd
+from utils.streaming import RowFingerprints
+
+#----------------------------------------------------------------------------------------------------------------------------#
+#                                                        TESTES                                                              #
+#----------------------------------------------------------------------------------------------------------------------------#
+
+################### somente a primeira ocorrencia de cada linha e nova, dentro do bloco e entre blocos
+def test_new_rows_keeps_first_occurrence_across_chunks():
+    values = np.random.default_rng(0).integers(0, 500, 3000)
+    fingerprints = RowFingerprints()
+    is_new = np.concatenate([fingerprints.new_rows(pd.DataFrame({"value": values[i:i + 250]}))
+                             for i in range(0, len(values), 250)])
+    _, first = np.unique(values, return_index=True)
+    assert (np.flatnonzero(is_new) == np.sort(first)).all()
+    assert (np.diff(fingerprints.seen.astype(np.float64)) >= 0).all() and len(fingerprints.seen) == len(first)
@@ -0,0 +1,88 @@
+################### bibliotecas necessarias (libraries)
+import asyncio
+import json
+import sys
+from urllib.parse import parse_qs
+from utils.data_loader import DATASET_PATH
+from utils.figure_cache import FigureCache
+from utils.queries import QUERIES, QueryError, parse_params, query_etag, query_version, run_query
+
+# servico ASGI sem dependencias (qualquer servidor ASGI serve o objeto app, ex.: uvicorn utils.api:app):
+#   GET /queries                              -> consultas disponiveis e seus parametros
+#   GET /queries/<consulta>?country=Brazil&country=India&price_type=cheap&n=10
+#   GET /health
+# as respostas levam ETag e X-Dataset-Version; com If-None-Match igual ao ETag atual a resposta e 304 sem recalcular nada
+
+################### corpos JSON ja codificados, guardados pelo ETag (a mesma resposta nao e serializada duas vezes)
+RESPONSE_CACHE = FigureCache(max_entries=512)
+MAX_AGE = 60
+
+#----------------------------------------------------------------------------------------------------------------------------#
+#                                                        FUNCOES                                                             #
+#----------------------------------------------------------------------------------------------------------------------------#
+
+################### resposta em JSON compacto (UTF-8)
+def encode(payload):
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+################### enviando uma resposta completa pelo protocolo ASGI
+async def respond(send, status, body=b"", headers=()):
+    headers = [(b"content-type", b"application/json; charset=utf-8"), (b"content-length", str(len(body)).encode())] + [
+               (name.encode(), value.encode()) for name, value in headers]
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+################### respondendo uma consulta: o ETag e calculado antes (barato) e a consulta roda numa thread
+# (o cubo e as agregacoes usam pandas/numpy, que liberam o GIL boa parte do tempo) para nao travar o loop
+async def handle_query(name, query_string, request_headers, send, path=DATASET_PATH):
+    params = parse_qs(query_string, keep_blank_values=False)
+    selections, kwargs = parse_params(name, params)
+    version = await asyncio.to_thread(query_version, selections, path)
+    etag = query_etag(name, selections, kwargs, version)
+    headers = [("etag", etag), ("x-dataset-version", version), ("cache-control", f"max-age={MAX_AGE}")]
+    if etag in [tag.strip() for tag in request_headers.get("if-none-match", "").split(",")]:
+        return await respond(send, 304, headers=headers)
+    body = await asyncio.to_thread(RESPONSE_CACHE.get_or_build, etag, lambda: encode(run_query(name, params, path)))
+    await respond(send, 200, body, headers)
+
+################### aplicacao ASGI (http + lifespan)
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    if scope["type"] != "http":
+        return
+    if scope["method"] != "GET":
+        return await respond(send, 405, encode({"error": "somente GET"}), [("allow", "GET")])
+    route = scope["path"].rstrip("/")
+    headers = {name.decode("latin-1").lower(): value.decode("latin-1") for name, value in scope.get("headers", [])}
+    try:
+        if route == "/health":
+            return await respond(send, 200, encode({"status": "ok"}))
+        if route == "/queries":
+            return await respond(send, 200, encode({name: sorted(spec) + ["country", "price_type"]
+                                                    for name, (_, spec) in QUERIES.items()}))
+        if route.startswith("/queries/"):
+            return await handle_query(route[len("/queries/"):], scope.get("query_string", b"").decode("utf-8"), headers,
+                                      send)
+        return await respond(send, 404, encode({"error": f"rota desconhecida: {scope['path']}"}))
+    except QueryError as error:
+        return await respond(send, error.status, encode({"error": str(error)}))
+
+#-----------------------------------------------------------------------------------------------------------------------------#
+#                                   SERVIDOR (python -m utils.api [host] [porta], requer uvicorn)                             #
+#-----------------------------------------------------------------------------------------------------------------------------#
+
+if __name__ == "__main__":
+    # uvicorn e opcional: sem ele o app continua importavel por qualquer outro servidor ASGI
+    try:
+        import uvicorn
+    except ImportError:
+        sys.exit("uvicorn não está instalado: pip install uvicorn (ou sirva utils.api:app com outro servidor ASGI)")
+    uvicorn.run(app, host=sys.argv[1] if len(sys.argv) > 1 else "127.0.0.1",
+                port=int(sys.argv[2]) if len(sys.argv) > 2 else 8000)
@@ -0,0 +1,189 @@
+################### bibliotecas necessarias (libraries)
+import numpy as np
+import pandas as pd
+import plotly.express as px
+from utils.cube import rollup_count, rollup_nunique
+from utils.ranking import best_per_group, top_k
+from utils.data_loader import DATASET_PATH
+from utils.stats import describe_cost, format_number, load_cost_histogram, to_usd
+from utils.tables import render_table
+
+# graficos e tabelas dos dashboards: as funcoes recebem os dados ja filtrados e devolvem a figura plotly (ou o html da
+# tabela), sem chamar o streamlit, entao podem ser importadas e medidas fora das paginas (ver benchmarks.bench_dashboards)
+
+#----------------------------------------------------------------------------------------------------------------------------#
+#                                                     VISAO PAISES                                                           #
+#----------------------------------------------------------------------------------------------------------------------------#
+
+################### criando grafico de barras na visao por pais
+def barplot_bycountry(cube, var2, title):
+    if var2 == "restaurant_id":
+        df_aux = rollup_count(cube, "country_name").rename(columns={"restaurants": var2})
+    else:
+        df_aux = rollup_nunique(cube, "country_name", var2)
+    df_aux = df_aux.sort_values(var2, ascending=False).reset_index()
+    df_aux.columns = ["País", title]
+    fig = px.bar(df_aux, x=title, y="País", orientation="h", width=500, height=400,text_auto=True, template="plotly_white")
+    fig.update_traces(marker_color="darkred")
+    fig.update_layout(title_text=f"{title} por País", title_x=0.5, title_font_color="gray", xaxis_title=None, yaxis_title=None,
+                      plot_bgcolor="white")
+    fig.update_yaxes(showline=True, linewidth=1.5, linecolor="gray")
+    return fig
+
+################### criando tabela com estatisticas descritivas na visao por pais
+# com usd=True os precos sao convertidos para dolar pela tabela local de cambio e com details=True a mediana e os
+# percentis 25%/75% (calculados pelo histograma do preco do dataset em csv_path) entram na tabela; o histograma e
+# carregado aqui, somente quando a tabela e construida (histogram informa um ja carregado, ex.: nos benchmarks)
+def table_statistic(cube, usd=False, details=False, csv_path=DATASET_PATH, histogram=None):
+    if details and histogram is None:
+        histogram = load_cost_histogram(csv_path)
+    stats = describe_cost(cube, histogram if details else None, ["country_name", "currency"])
+    decimals = 0
+    if usd:
+        stats = to_usd(stats)
+        decimals = 2
+    df_aux = pd.DataFrame({"País": stats.index.get_level_values("country_name"),
+                           "Moeda": ("USD (" + stats["currency_code"] + ")" if usd
+                                     else stats.index.get_level_values("currency")),
+                           "Preço Médio": format_number(stats["cost_mean"], 2),
+                           "Desvio padrão": format_number(stats["cost_std"], 2),
+                           "Preço Máximo": format_number(stats["cost_max"], decimals),
+                           "Preço Mínimo": format_number(stats["cost_min"], decimals)})
+    if details:
+        df_aux["Percentil 25%"] = format_number(stats["cost_p25"], 2)
+        df_aux["Mediana"] = format_number(stats["cost_p50"], 2)
+        df_aux["Percentil 75%"] = format_number(stats["cost_p75"], 2)
+    return render_table(df_aux, font_size="11pt")
+
+################### criando grafico de barras sobre restaurante que entrega (ou nao) na visao por pais
+def barplot_delivery(cube):
+    df_aux = (rollup_count(cube, ["country_name", "is_delivering_now"]).sort_values("restaurants", ascending=False)
+              .reset_index())
+    df_aux.columns = ["País", "Faz entrega?", "Quantidade de restaurante"]
+    df_aux["Faz entrega?"] = np.where(df_aux["Faz entrega?"], "Sim", "Não")
+    fig = px.bar(df_aux, y="País", x="Quantidade de restaurante", color="Faz entrega?", text_auto=True, template="plotly_white",
+                 color_discrete_sequence=["darkred", "darkgreen"])
+    fig.update_layout(title_text="Quantidade de restaurantes que fazem entrega por País", title_x=0.5, title_font_color="gray",
+                      xaxis_title=None, yaxis_title=None, plot_bgcolor="white")
+    fig.update_yaxes(showline=True, linewidth=1.5, linecolor="gray")
+    return fig
+
+#----------------------------------------------------------------------------------------------------------------------------#
+#                                                     VISAO CIDADES                                                          #
+#----------------------------------------------------------------------------------------------------------------------------#
+
+################### grafico de barras na visao cidade
+def barplot_bycity(cube, n=10):
+    df_aux = top_k(rollup_count(cube, ["city", "country_name"]), "restaurants", n).reset_index()
+    df_aux.columns = ["Cidade", "País", "Quantidade de restaurantes"]
+    fig = px.bar(df_aux, x="Cidade", y="Quantidade de restaurantes", color="País", text_auto=True, template="plotly_white",
+                 color_discrete_sequence=px.colors.qualitative.G10)
+    fig.update_layout(title_text=f"Quantidade de restaurantes por Cidade (TOP{n})", title_x=0.45, title_font_color="gray",
+                      xaxis_title=None, yaxis_title=None, plot_bgcolor="white")
+    fig.update_xaxes(showline=True, linewidth=1.5, linecolor="gray")
+    return fig
+
+################### titulos dos graficos de avaliacao e de entrega da visao cidade ({n} recebe o tamanho do ranking)
+CITY_TITLES = {
+"rating_above": "Quantidade de restaurantes com avaliação<br>média acima de 4 por Cidade (TOP{n})",
+"rating_below": "Quantidade de restaurantes com avaliação<br>média abaixo de 2,5 por Cidade (TOP{n})",
+"is_delivering_now": "Quantidade de restaurantes que fazem entrega por Cidade (TOP{n})",
+"has_online_delivery": "Quantidade de restaurantes que aceitam pedidos online por Cidade (TOP{n})",
+}
+
+################### grafico de barras sobre avaliacao media na visao cidade
+def rating_bycity(cube, restricao, valor, title, n=10):
+    if restricao == "maior":
+        df_aux = top_k(rollup_count(cube.loc[cube["aggregate_rating"]>valor, :], ["city", "country_name"]), "restaurants", n)
+    else:
+        df_aux = top_k(rollup_count(cube.loc[cube["aggregate_rating"]<valor, :], ["city", "country_name"]), "restaurants", n)
+    df_aux = df_aux.reset_index()
+    df_aux.columns = ["Cidade", "País", "Quantidade de restaurantes"]
+    fig = px.bar(df_aux, y="Cidade", x="Quantidade de restaurantes", color="País", text_auto=True, template="plotly_white",
+                 color_discrete_sequence=px.colors.qualitative.G10, width=300, height=450)
+    fig.update_layout(title_text=title.format(n=n),title_font_color="gray",xaxis_title=None, yaxis_title=None, plot_bgcolor="white",
+                      title_x=0.5, yaxis={'categoryorder':'total ascending'},
+                      legend=dict(orientation="h", yanchor="bottom", y=-0.35, xanchor="right",x=0.9))
+    fig.update_yaxes(showline=True, linewidth=1.5, linecolor="gray")
+    return fig
+
+################### grafico de barras sobre entrega ou pedido online na visao cidade
+def delivery_bycity(cube, var_selecao, title, n=25):
+    df_aux = top_k(rollup_count(cube.loc[cube[var_selecao]==1, :], ["city", "country_name"]), "restaurants", n).reset_index()
+    df_aux.columns = ["Cidade", "País", "Quantidade de restaurantes"]
+    fig = px.bar(df_aux, x="Cidade", y="Quantidade de restaurantes", color="País", text_auto=True, template="plotly_white",
+                 color_discrete_sequence=px.colors.qualitative.G10)
+    fig.update_layout(title_text= title.format(n=n), title_font_color="gray",xaxis_title=None, yaxis_title=None, plot_bgcolor="white",
+                      title_x=0.25, xaxis={'categoryorder':'total descending'})
+    fig.update_xaxes(showline=True, linewidth=1.5, linecolor="gray")
+    return fig
+
+#----------------------------------------------------------------------------------------------------------------------------#
+#                                                    VISAO CULINARIA                                                         #
+#----------------------------------------------------------------------------------------------------------------------------#
+
+################### melhor restaurante (maior avaliacao, desempate pelo menor restaurant_id) de cada tipo de culinaria
+def best_by_cuisine(df):
+    return best_per_group(df.loc[:, ["restaurant_id","restaurant_name","country_name","city","average_cost_for_two","currency",
+                                     "aggregate_rating","cuisines"]], "cuisines", "aggregate_rating", tiebreak="restaurant_id")
+
+################### conteudo do card do melhor restaurante de um tipo de culinaria (a partir de best_by_cuisine):
+################### (rotulo, valor, texto de ajuda) no formato de st.metric
+def card_content(best, type_food):
+    if type_food not in best.index:
+        return f"{type_food}:  \nSem restaurantes", "-", "Nenhum restaurante com os filtros selecionados"
+    rest = best.loc[type_food, "restaurant_name"]
+    nota = best.loc[type_food, "aggregate_rating"]
+    pais = best.loc[type_food, "country_name"]
+    cidade = best.loc[type_food, "city"]
+    cf2 = best.loc[type_food, "average_cost_for_two"]
+    moeda = best.loc[type_food, "currency"]
+    multi = f'''Restaurante: {rest}  \nPaís: {pais}  \nCidade: {cidade}  \nMédia de preço para dois: {cf2} ({moeda})'''
+    label = f"{type_food}:  \n{rest}"
+    nota =f"{nota}/5.0"
+    return label, nota, multi
+
+################### criando grafico de barras dos melhores tipos de culinaria
+# counts: quantidade de restaurantes por culinaria (rollup_count do cubo ou CuisineIndex.counts com todas as culinarias)
+def barplot_bycuisines(counts, n=5):
+    df_aux = top_k(counts, "restaurants", n).reset_index()
+    df_aux.columns = ["Tipos de culinária", "Quantidade de restaurantes"]
+    fig = px.bar(df_aux, x="Tipos de culinária", y="Quantidade de restaurantes", text_auto=True, width=500, height=400,
+                 template="plotly_white")
+    fig.update_traces(marker_color="darkred")
+    fig.update_layout(xaxis_title=None, yaxis_title=None, plot_bgcolor="white")
+    fig.update_xaxes(showline=True, linewidth=1.5, linecolor="gray")
+    return fig
+
+################### criando grafico de setores sobre tipo de preco dos restaurantes
+def pieplot_price(cube):
+    df_aux = rollup_count(cube, "price_type").sort_values("restaurants", ascending=False).reset_index()
+    df_aux.columns = ["Tipo de preço", "Quantidade de restaurantes"]
+    fig = px.pie(df_aux, values="Quantidade de restaurantes", names="Tipo de preço", width=500, height=400, template="plotly_white",
+                 color_discrete_sequence=px.colors.sequential.RdBu)
+    return fig
+
+################### criando o histograma sobre avaliacao media dos restaurantes
+def histogram_aggrating(df):
+    df_aux = df.loc[:, ["aggregate_rating", "restaurant_id"]]
+    df_aux.columns = ["Avaliação média", "Quantidade de restaurantes"]
+    fig = px.histogram(df_aux, x="Avaliação média", nbins=30, text_auto=True, width=500, height=400, template="plotly_white")
+    fig.update_traces(marker_color="darkred")
+    fig.update_layout(yaxis_title="Quantidade de restaurantes", plot_bgcolor="white")
+    fig.update_xaxes(showline=True, linewidth=1.5, linecolor="gray")
+    return fig
+
+################### criando uma tabela com os melhores restaurantes conforme avaliacao media
+def best_restaurants(df, n=15):
+    df_aux = (df.loc[:, ["restaurant_id", "restaurant_name", "country_name", "city", "cuisines", "average_cost_for_two",
+                         "currency", "aggregate_rating", "votes", "price_type"]]
+              .groupby(["restaurant_id", "restaurant_name", "country_name", "city", "cuisines", "average_cost_for_two",
+                        "currency","votes", "price_type"], observed=True).mean().reset_index())
+    df_aux = top_k(df_aux, "aggregate_rating", n, tiebreak="restaurant_id").reset_index(drop=True)
+    df_aux = df_aux.loc[df_aux["aggregate_rating"]==4.9, df_aux.columns != "restaurant_id"]
+    df_aux.columns = ["Restaurante","País","Cidade","Culinária","Preço médio*","Moeda","Quantidade de Avaliações",
+                      "Tipo de Preço", "Avaliação Média"]
+    df_aux["Preço médio*"] = format_number(df_aux["Preço médio*"], 0)
+    df_aux["Quantidade de Avaliações"] = format_number(df_aux["Quantidade de Avaliações"], 0)
+    df_aux["Avaliação Média"] = format_number(df_aux["Avaliação Média"], 2)
+    return render_table(df_aux, font_size="10pt")
@@ -0,0 +1,100 @@
+################### bibliotecas necessarias (libraries)
+import os
+import numpy as np
+import pandas as pd
+from utils.data_loader import DATASET_PATH, load_derived
+from utils.filters import FILTER_DIMENSIONS, LAZY_DIMENSIONS, FilterEngine
+from utils.snapshot import cube_snapshot_path, is_snapshot_fresh, read_manifest, read_snapshot
+
+################### dimensoes e colunas do cubo de agregados
+# aggregate_rating ja e discreto (passos de 0.1) e funciona como faixa de avaliacao, permitindo qualquer corte (> 4, < 2.5, ...)
+CUBE_DIMENSIONS = ["country_name", "city", "cuisines", "price_type", "currency", "is_delivering_now", "has_online_delivery",
+                   "aggregate_rating"]
+CUBE_COLUMNS = CUBE_DIMENSIONS + ["restaurant_id", "average_cost_for_two"]
+
+################### a partir deste tamanho (e sem snapshot) o cubo e construido lendo o CSV em blocos (utils.streaming)
+STREAMING_MIN_BYTES = 256 * 1024 ** 2
+
+#----------------------------------------------------------------------------------------------------------------------------#
+#                                                        FUNCOES                                                             #
+#----------------------------------------------------------------------------------------------------------------------------#
+
+################### construindo o cubo: uma linha por combinacao existente das dimensoes com a quantidade de restaurantes
+################### e as estatisticas parciais do preco para dois (n, soma, M2 de Welford, minimo e maximo)
+# a soma de restaurants entre celulas e exata porque cada restaurant_id aparece em uma unica linha do dataset limpo
+def build_cube(df):
+    grouped = df.groupby(CUBE_DIMENSIONS, observed=True)
+    cost = df["average_cost_for_two"].astype(np.float64)
+    deviation = cost - grouped["average_cost_for_two"].transform("mean")
+    cube = grouped.agg(restaurants=("restaurant_id", "nunique"), cost_n=("average_cost_for_two", "count"),
+                       cost_sum=("average_cost_for_two", "sum"), cost_min=("average_cost_for_two", "min"),
+                       cost_max=("average_cost_for_two", "max"))
+    cube["cost_m2"] = (deviation ** 2).groupby([df[col] for col in CUBE_DIMENSIONS], observed=True).sum()
+    return cube.reset_index()
+
+################### juntando cubos parciais (ex.: um por bloco do CSV) celula a celula; n, soma, minimo e maximo sao somados
+################### ou comparados e o M2 e combinado pelo algoritmo paralelo de Chan
+def merge_cubes(cubes):
+    cube = pd.concat(cubes, ignore_index=True)
+    for col in CUBE_DIMENSIONS:
+        if cube[col].dtype == object:
+            cube[col] = cube[col].astype("category")
+    merged = rollup_cost(cube, CUBE_DIMENSIONS)[["cost_n", "cost_sum", "cost_min", "cost_max", "cost_m2"]]
+    merged.insert(0, "restaurants", rollup_count(cube, CUBE_DIMENSIONS)["restaurants"])
+    return merged.reset_index()
+
+################### cubo + motor de filtros (bitmaps) sobre as linhas do cubo, construidos juntos
+def build_cube_with_filters(df):
+    cube = build_cube(df)
+    return cube, FilterEngine(cube, FILTER_DIMENSIONS, LAZY_DIMENSIONS)
+
+################### cubo + filtros construidos a partir do CSV lido em blocos (memoria limitada pelo tamanho do bloco)
+def stream_cube_with_filters(path):
+    # importado aqui porque utils.streaming usa as funcoes deste modulo
+    from utils.streaming import stream_cube
+    cube = stream_cube(path)
+    return cube, FilterEngine(cube, FILTER_DIMENSIONS, LAZY_DIMENSIONS)
+
+################### cubo + filtros lidos do snapshot do cubo gravado pela atualizacao incremental (utils.incremental)
+def read_cube_with_filters(path):
+    cube = read_snapshot(cube_snapshot_path(path))
+    return cube, FilterEngine(cube, FILTER_DIMENSIONS, LAZY_DIMENSIONS)
+
+################### carregando (ou construindo) o cubo e seus filtros, compartilhados pelo processo
+def load_cube_and_filters(path=DATASET_PATH):
+    if read_manifest(path) is not None and is_snapshot_fresh(path, cube_snapshot_path(path)):
+        return load_derived("cube", read_cube_with_filters, path, from_path=True)
+    if not is_snapshot_fresh(path) and os.path.getsize(path) >= STREAMING_MIN_BYTES:
+        return load_derived("cube", stream_cube_with_filters, path, from_path=True)
+    return load_derived("cube", build_cube_with_filters, path, columns=CUBE_COLUMNS)
+
+################### carregando o cubo do dataset
+def load_cube(path=DATASET_PATH):
+    return load_cube_and_filters(path)[0].copy(deep=False)
+
+################### motor de filtros do cubo: cube_filters.select(country_name=[...]).apply(cube)
+def load_cube_filters(path=DATASET_PATH):
+    return load_cube_and_filters(path)[1]
+
+################### somando as celulas do cubo pelas dimensoes pedidas (quantidade de restaurantes)
+def rollup_count(cube, by):
+    return cube.groupby(by, observed=True)[["restaurants"]].sum()
+
+################### quantidade de valores distintos de uma dimensao (ex.: cidades) por grupo
+# somente as colunas usadas sao copiadas pelo filtro das celulas com restaurantes
+def rollup_nunique(cube, by, dimension):
+    columns = ([by] if isinstance(by, str) else list(by)) + [dimension]
+    return cube.loc[cube["restaurants"] > 0, columns].groupby(by, observed=True)[[dimension]].nunique()
+
+################### combinando as estatisticas parciais das celulas (algoritmo paralelo de Chan para media/variancia)
+def rollup_cost(cube, by):
+    grouped = cube.groupby(by, observed=True)
+    stats = grouped.agg(cost_n=("cost_n", "sum"), cost_sum=("cost_sum", "sum"), cost_min=("cost_min", "min"),
+                        cost_max=("cost_max", "max"))
+    cell_mean = cube["cost_sum"] / cube["cost_n"]
+    group_mean = grouped["cost_sum"].transform("sum") / grouped["cost_n"].transform("sum")
+    m2 = cube["cost_m2"] + cube["cost_n"] * (cell_mean - group_mean) ** 2
+    stats["cost_m2"] = m2.groupby([cube[col] for col in by], observed=True).sum()
+    stats["cost_mean"] = stats["cost_sum"] / stats["cost_n"]
+    stats["cost_std"] = np.sqrt(stats["cost_m2"] / (stats["cost_n"] - 1)).where(stats["cost_n"] > 1)
+    return stats
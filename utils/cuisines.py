@@ -0,0 +1,64 @@
+################### bibliotecas necessarias (libraries)
+import numpy as np
+import pandas as pd
+from utils.data_loader import DATASET_PATH, load_derived
+
+################### separador das culinarias na coluna all_cuisines (mesmo formato do CSV original)
+CUISINE_SEPARATOR = ","
+
+#----------------------------------------------------------------------------------------------------------------------------#
+#                                                        FUNCOES                                                             #
+#----------------------------------------------------------------------------------------------------------------------------#
+
+################### indice restaurante <-> culinaria com todas as culinarias de cada linha (nao somente a primeira)
+# os nomes sao internados (ids inteiros em ordem alfabetica) e os pares ficam em formato CSR: as culinarias da linha i
+# sao ids[offsets[i]:offsets[i + 1]]; rows repete o numero da linha de cada par para as operacoes vetorizadas
+class CuisineIndex:
+    def __init__(self, all_cuisines):
+        self.n_rows = len(all_cuisines)
+        exploded = pd.Series(np.asarray(all_cuisines, dtype=object)).str.split(CUISINE_SEPARATOR).explode().str.strip()
+        exploded = exploded.loc[exploded.notna() & (exploded != "")]
+        codes, names = pd.factorize(exploded, sort=True)
+        # culinarias repetidas na mesma linha contam uma unica vez
+        pairs = np.unique(exploded.index.to_numpy(dtype=np.int64) * len(names) + codes)
+        id_dtype = np.int16 if len(names) < np.iinfo(np.int16).max else np.int32
+        self.names = np.asarray(names, dtype=object)
+        self.rows = (pairs // max(len(names), 1)).astype(np.int32)
+        self.ids = (pairs % max(len(names), 1)).astype(id_dtype)
+        self.offsets = np.searchsorted(self.rows, np.arange(self.n_rows + 1)).astype(np.int64)
+        self.positions = {name: i for i, name in enumerate(self.names)}
+
+    ################### ids das culinarias informadas (nomes desconhecidos sao ignorados)
+    def codes(self, cuisines):
+        return np.array([self.positions[name] for name in cuisines if name in self.positions], dtype=np.int64)
+
+    ################### mascara dos pares (linha, culinaria) das linhas selecionadas e, opcionalmente, das culinarias informadas
+    def pair_mask(self, mask=None, cuisines=None):
+        keep = np.ones(len(self.ids), dtype=bool) if mask is None else np.asarray(mask)[self.rows]
+        if cuisines is not None:
+            selected = np.zeros(len(self.names), dtype=bool)
+            selected[self.codes(cuisines)] = True
+            keep &= selected[self.ids]
+        return keep
+
+    ################### mascara das linhas que possuem ao menos uma das culinarias informadas
+    def rows_with(self, cuisines):
+        result = np.zeros(self.n_rows, dtype=bool)
+        result[self.rows[self.pair_mask(cuisines=cuisines)]] = True
+        return result
+
+    ################### quantidade de restaurantes por culinaria (cada restaurante conta em todas as suas culinarias)
+    def counts(self, mask=None, cuisines=None):
+        counts = np.bincount(self.ids[self.pair_mask(mask, cuisines)], minlength=len(self.names))
+        result = pd.DataFrame({"restaurants": counts}, index=pd.Index(self.names, name="cuisines"))
+        return result.loc[result["restaurants"] > 0, :]
+
+    ################### uma linha por par (restaurante, culinaria): as linhas de df (alinhadas com o indice) sao repetidas
+    ################### e a coluna cuisines passa a ser a culinaria do par
+    def explode(self, df, mask=None, cuisines=None):
+        keep = self.pair_mask(mask, cuisines)
+        return df.iloc[self.rows[keep]].assign(cuisines=self.names[self.ids[keep]])
+
+################### carregando (ou construindo) o indice de culinarias do dataset, compartilhado pelo processo
+def load_cuisine_index(path=DATASET_PATH):
+    return load_derived("cuisine_index", lambda df1: CuisineIndex(df1["all_cuisines"]), path, columns=["all_cuisines"])
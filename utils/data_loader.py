@@ -0,0 +1,327 @@
+################### bibliotecas necessarias (libraries)
+import hashlib
+import os
+import threading
+import numpy as np
+import pandas as pd
+import inflection
+from utils.instrumentation import rows_of, span
+from utils.outliers import OutlierStage
+from utils.snapshot import (is_snapshot_fresh, manifest_path, read_manifest, read_snapshot, snapshot_path,
+                            write_snapshot)
+
+################### caminho padrao do dataset
+DATASET_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "dataset", "zomato.csv")
+
+#----------------------------------------------------------------------------------------------------------------------------#
+#                                                     DICIONARIOS                                                            #
+#----------------------------------------------------------------------------------------------------------------------------#
+
+################### dicionario com os codigos dos paises
+COUNTRIES = {
+1: "India",
+14: "Australia",
+30: "Brazil",
+37: "Canada",
+94: "Indonesia",
+148: "New Zeland",
+162: "Philippines",
+166: "Qatar",
+184: "Singapure",
+189: "South Africa",
+191: "Sri Lanka",
+208: "Turkey",
+214: "United Arab Emirates",
+215: "England",
+216: "United States of America",
+}
+
+################### dicionario com os codigos das cores
+COLORS = {
+"3F7E00": "darkgreen",
+"5BA829": "green",
+"9ACD32": "lightgreen",
+"CDD614": "orange",
+"FFBA00": "red",
+"CBCBC8": "darkred",
+"FF7800": "darkred",
+}
+
+################### tipos explicitos e compactos das colunas do dataset preparado
+# textos repetidos viram category, flags 0/1 viram bool e inteiros sao reduzidos quando cabem sem perda;
+# aggregate_rating, latitude e longitude continuam float64 (float32 altera comparacoes como == 4.9)
+SCHEMA = {
+"restaurant_id": "int32",
+"restaurant_name": "object",
+"country_code": "int16",
+"city": "category",
+"address": "object",
+"locality": "category",
+"locality_verbose": "category",
+"longitude": "float64",
+"latitude": "float64",
+"cuisines": "category",
+"all_cuisines": "object",
+"average_cost_for_two": "int32",
+"currency": "category",
+"has_table_booking": "bool",
+"has_online_delivery": "bool",
+"is_delivering_now": "bool",
+"price_range": "int8",
+"aggregate_rating": "float64",
+"rating_color": "category",
+"rating_text": "category",
+"votes": "int32",
+"country_name": "category",
+"price_type": "category",
+"color_name": "category",
+}
+
+#----------------------------------------------------------------------------------------------------------------------------#
+#                                                        FUNCOES                                                             #
+#----------------------------------------------------------------------------------------------------------------------------#
+
+################### selecionando as linhas validas do dataset (sem dados faltantes, duplicadas e outliers de preco)
+# os outliers de preco sao removidos pela etapa configuravel de utils.outliers (por padrao OUTLIER_RULES); passando
+# o proprio OutlierStage e possivel consultar depois o relatorio das linhas descartadas (stage.report())
+def clean_rows(df, outliers=None):
+    outliers = OutlierStage() if outliers is None else outliers
+    df = df.dropna().drop_duplicates()
+    df = df.drop(columns="Switch to order menu")
+    return outliers.apply(df)
+
+################### fazendo a limpeza no dataset
+def clean_code(df, outliers=None):
+    return split_cuisines(clean_rows(df, outliers))
+
+################### guardando a lista completa de culinarias (All Cuisines, usada pelo indice de utils.cuisines) e mantendo
+################### em Cuisines somente a primeira culinaria de cada restaurante
+def split_cuisines(df):
+    df["All Cuisines"] = df["Cuisines"].astype(str)
+    df["Cuisines"] = df["All Cuisines"].str.split(",", n=1).str[0]
+    return df
+
+################### erro levantado quando o dataset possui codigos de pais/cor fora dos dicionarios
+class EnrichmentError(ValueError):
+    def __init__(self, message, report):
+        super().__init__(message)
+        self.report = report
+
+################### criando a variavel com o nome dos paises com base nos codigos
+def country_name(country_code):
+    return country_code.map(COUNTRIES)
+
+################### criando a categoria do tipo de preco de comida com base no range de valores
+def create_price_type(price_range):
+    conditions = [price_range == 1, price_range == 2, price_range == 3]
+    return pd.Series(np.select(conditions, ["cheap", "normal", "expensive"], default="gourmet"), index=price_range.index)
+
+################### criando a variavel com o nome das cores com base nos codigos
+def color_name(color_code):
+    return color_code.map(COLORS)
+
+################### verificando se algum codigo ficou sem correspondencia nos dicionarios
+def check_unknown_codes(df, mapped, column):
+    unknown = mapped.isna()
+    if unknown.any():
+        report = df.loc[unknown, ["Restaurant ID", "Restaurant Name", column]]
+        codes = sorted(report[column].astype(str).unique())
+        raise EnrichmentError(f"{unknown.sum()} linha(s) com '{column}' desconhecido: {', '.join(codes)}\n"
+                              f"{report.head(20).to_string(index=False)}", report)
+
+################### criando as variaveis derivadas (pais, tipo de preco e cor) de forma vetorizada
+def enrich_data(df):
+    countries = country_name(df["Country Code"])
+    check_unknown_codes(df, countries, "Country Code")
+    colors = color_name(df["Rating color"])
+    check_unknown_codes(df, colors, "Rating color")
+    df["Country Name"] = countries
+    df["Price type"] = create_price_type(df["Price range"])
+    df["Color name"] = colors
+    return df
+
+################### renomeando as colunas do DataFrame
+def rename_columns(dataframe):
+    df = dataframe.copy()
+    title = lambda x: inflection.titleize(x)
+    snakecase = lambda x: inflection.underscore(x)
+    spaces = lambda x: x.replace(" ", "")
+    cols_old = list(df.columns)
+    cols_old = list(map(title, cols_old))
+    cols_old = list(map(spaces, cols_old))
+    cols_new = list(map(snakecase, cols_old))
+    df.columns = cols_new
+    return df
+
+################### convertendo as colunas para os tipos compactos do SCHEMA
+# inteiros/flags so sao convertidos quando todos os valores cabem no novo tipo; caso contrario a coluna mantem o tipo original
+def optimize_dtypes(df):
+    df = df.copy()
+    for col, dtype in SCHEMA.items():
+        if col not in df.columns or df[col].dtype == dtype:
+            continue
+        converted = df[col].astype(dtype)
+        lossy_check = pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_bool_dtype(dtype)
+        if lossy_check and not (converted.astype(df[col].dtype) == df[col]).all():
+            continue
+        df[col] = converted
+    return df
+
+################### comparando o uso de memoria por coluna antes e depois da conversao dos tipos
+def memory_report(before, after):
+    report = pd.DataFrame({"dtype_before": before.dtypes.astype(str), "dtype_after": after.dtypes.astype(str),
+                           "bytes_before": before.memory_usage(deep=True, index=False),
+                           "bytes_after": after.memory_usage(deep=True, index=False)})
+    report.loc["TOTAL", ["bytes_before", "bytes_after"]] = report[["bytes_before", "bytes_after"]].sum()
+    report["reduction_pct"] = (1 - report["bytes_after"] / report["bytes_before"]) * 100
+    return report
+
+################### preparando as linhas selecionadas por clean_rows (culinarias, colunas novas, nomes e tipos compactos);
+################### cada linha e preparada sozinha, entao a atualizacao incremental prepara somente as linhas alteradas
+def prepare_rows(df):
+    df1 = split_cuisines(df)
+    df1 = enrich_data(df1)
+    df1 = rename_columns(df1)
+    df1 = optimize_dtypes(df1)
+    return df1.reset_index(drop=True)
+
+################### limpando o dataset e aplicando as funcoes criadas para preparar o dataset para analise
+def prepare_data(df):
+    return prepare_rows(clean_rows(df))
+
+################### gerando o snapshot colunar do dataset preparado (lido pelos dashboards no lugar do CSV)
+def build_snapshot(path=DATASET_PATH):
+    return write_snapshot(prepare_data(pd.read_csv(path)), snapshot_path(path))
+
+#----------------------------------------------------------------------------------------------------------------------------#
+#                                                 CACHE DO PROCESSO                                                          #
+#----------------------------------------------------------------------------------------------------------------------------#
+
+# o DataFrame preparado e construido uma unica vez por processo e reaproveitado por todas as sessoes/reruns;
+# a chave inclui o mtime e o tamanho do arquivo para que um dataset atualizado seja recarregado automaticamente
+_CACHE = {}
+_CACHE_LOCK = threading.RLock()
+CACHE_STATS = {"hits": 0, "misses": 0}
+# versoes ja calculadas: (CSV, registro de versao, paises) -> versao; o registro so e lido de novo quando muda
+_VERSIONS = {}
+MAX_VERSIONS = 1024
+
+################### chave do cache: caminho absoluto + mtime + tamanho do arquivo
+def dataset_key(path=DATASET_PATH):
+    stat = os.stat(path)
+    return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+################### chave da fonte de onde o DataFrame preparado e lido: o snapshot colunar quando esta atualizado, senao o CSV
+# o DataFrame e as estruturas derivadas dele (indices com posicoes de linha) usam a mesma chave, entao uma estrutura
+# construida sobre a ordem das linhas do CSV nunca e aplicada ao snapshot gravado depois (ou vice-versa)
+def source_key(path=DATASET_PATH):
+    snapshot = snapshot_path(path)
+    return dataset_key(snapshot if is_snapshot_fresh(path, snapshot, required=SCHEMA) else path)
+
+################### guardando um valor no cache e descartando as versoes antigas do mesmo dataset (CSV ou snapshot)
+def store(key, value, path):
+    sources = {os.path.abspath(path), os.path.abspath(snapshot_path(path))}
+    for old_key in [k for k in _CACHE if k[0] in sources and k[:3] != key[:3]]:
+        del _CACHE[old_key]
+    _CACHE[key] = value
+
+################### versao do dataset (usada nas chaves dos caches de figuras e consultas)
+# depois de uma atualizacao incremental (utils.incremental) cada pais tem sua propria versao, entao informando os paises
+# selecionados a versao so muda quando algum deles foi alterado; sem registro de versao vale o mtime/tamanho do CSV
+# a versao e memorizada pelo mtime/tamanho do CSV e do registro: as paginas e as consultas pedem a versao a cada figura
+def dataset_version(path=DATASET_PATH, countries=None):
+    try:
+        stat = os.stat(manifest_path(path))
+        manifest_key = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        manifest_key = None
+    key = (dataset_key(path), manifest_key, None if countries is None else tuple(sorted(map(str, countries))))
+    version = _VERSIONS.get(key)
+    if version is None:
+        if len(_VERSIONS) >= MAX_VERSIONS:
+            _VERSIONS.clear()
+        version = _VERSIONS[key] = compute_version(path, countries)
+    return version
+
+################### calculando a versao do dataset a partir do registro de versao (ou do mtime/tamanho do CSV)
+def compute_version(path=DATASET_PATH, countries=None):
+    manifest = read_manifest(path)
+    if manifest is None:
+        _, mtime_ns, size = dataset_key(path)
+        return f"{mtime_ns:x}-{size:x}"
+    if countries is None:
+        return f"v{manifest['version']}"
+    versions = "|".join(f"{country}:{manifest['countries'].get(country, 0)}" for country in sorted(map(str, countries)))
+    return "c" + hashlib.sha1(versions.encode("utf-8")).hexdigest()[:16]
+
+################### marcando os arrays do DataFrame do cache como somente leitura
+# o DataFrame do cache e compartilhado por todas as sessoes do processo: uma alteracao no lugar (df.loc[...] = ...,
+# inplace=True) passa a levantar ValueError em vez de corromper o dataset das outras sessoes; nas colunas category
+# o array protegido e o dos codigos
+def read_only(df):
+    for values in df._mgr.arrays:
+        getattr(values, "_ndarray", values).flags.writeable = False
+    return df
+
+################### carregando o dataset preparado (compartilhado e somente leitura)
+# quando existe um snapshot colunar mais novo que o CSV, le somente as colunas pedidas direto do snapshot;
+# caso contrario prepara o CSV completo uma unica vez e entrega as colunas pedidas como visoes do DataFrame completo
+# a pagina recebe uma copia rasa (incluir ou substituir colunas nao afeta o cache), mas os valores sao somente leitura:
+# para altera-los, faca df.copy() antes ou trabalhe sobre o resultado de um filtro (Selection.apply ja devolve uma copia)
+def load_data(path=DATASET_PATH, columns=None):
+    columns = tuple(columns) if columns else None
+    snapshot = snapshot_path(path)
+    source = source_key(path)
+    use_snapshot = source[0] == os.path.abspath(snapshot)
+    key = source + (columns if use_snapshot else None,)
+    with span("load_data") as current, _CACHE_LOCK:
+        current.cached = key in _CACHE
+        if current.cached:
+            CACHE_STATS["hits"] += 1
+        else:
+            CACHE_STATS["misses"] += 1
+            df1 = read_snapshot(snapshot, columns) if use_snapshot else prepare_data(pd.read_csv(path))
+            store(key, read_only(df1), path)
+        df1 = _CACHE[key]
+        if columns and not use_snapshot:
+            df1 = pd.DataFrame({col: df1[col] for col in columns}, copy=False)
+        current.rows = len(df1)
+    return df1.copy(deep=False)
+
+################### carregando (ou construindo) uma estrutura derivada do dataset preparado (cubo, indices, ...)
+# fica no mesmo cache do DataFrame, com a mesma chave de fonte (CSV ou snapshot), e portanto e reconstruida somente
+# quando o dataset muda; com from_path=True o builder recebe o caminho do CSV (ex.: leitura em blocos) em vez do
+# DataFrame preparado
+def load_derived(name, builder, path=DATASET_PATH, columns=None, from_path=False):
+    key = source_key(path) + (("derived", name),)
+    with span(f"load_derived[{name}]") as current, _CACHE_LOCK:
+        current.cached = key in _CACHE
+        if current.cached:
+            CACHE_STATS["hits"] += 1
+        else:
+            CACHE_STATS["misses"] += 1
+            value = builder(path) if from_path else builder(load_data(path, columns))
+            store(key, value, path)
+        current.rows = rows_of(_CACHE[key])
+        return _CACHE[key]
+
+################### contadores de acerto/falha do cache
+def cache_info():
+    return {"hits": CACHE_STATS["hits"], "misses": CACHE_STATS["misses"], "entries": len(_CACHE)}
+
+################### limpando o cache (ex.: para forcar a releitura do dataset)
+def clear_cache():
+    with _CACHE_LOCK:
+        _CACHE.clear()
+        CACHE_STATS["hits"] = 0
+        CACHE_STATS["misses"] = 0
+        _VERSIONS.clear()
+
+#-----------------------------------------------------------------------------------------------------------------------------#
+#                             RELATORIO DE MEMORIA (python -m utils.data_loader)                                              #
+#-----------------------------------------------------------------------------------------------------------------------------#
+
+if __name__ == "__main__":
+    df_before = rename_columns(enrich_data(clean_code(pd.read_csv(DATASET_PATH)))).reset_index(drop=True)
+    pd.set_option("display.width", 200)
+    print(memory_report(df_before, optimize_dtypes(df_before)).to_string(float_format="{:,.1f}".format))
@@ -0,0 +1,63 @@
+################### bibliotecas necessarias (libraries)
+import threading
+import plotly.io as pio
+import streamlit as st
+from utils.data_loader import cache_info
+from utils.figure_cache import FIGURE_CACHE, static_info
+from utils.instrumentation import (current_trace, finish_rerun, measure_payload, span, start_rerun, to_json_lines,
+                                   to_prometheus, trace_table)
+
+# area da barra lateral reservada pelo painel de debug para os tempos do rerun (preenchida no fim da pagina)
+_PANEL = threading.local()
+
+################### inicio de um rerun da pagina (chamado pelo topo da barra lateral)
+def start_page(page):
+    _PANEL.container = None
+    start_rerun(page)
+
+################### painel opcional na barra lateral com as metricas dos caches do processo
+def debug_panel():
+    if not st.sidebar.checkbox("Painel de debug", value=False):
+        return
+    figures = FIGURE_CACHE.info()
+    data = cache_info()
+    st.sidebar.markdown("#### Cache de figuras")
+    st.sidebar.markdown(f"Entradas: {figures['entries']}/{figures['max_entries']}  \n"
+                        f"Acertos: {figures['hits']} | Falhas: {figures['misses']} | Descartes: {figures['evictions']}  \n"
+                        f"Taxa de acerto: {figures['hit_rate']:.1%}  \n"
+                        f"Latência média (acerto): {figures['avg_hit_ms']:.3f} ms  \n"
+                        f"Latência média (construção): {figures['avg_build_ms']:.1f} ms")
+    st.sidebar.markdown("#### Cache do dataset")
+    st.sidebar.markdown(f"Entradas: {data['entries']}  \nAcertos: {data['hits']} | Falhas: {data['misses']}")
+    static = static_info()
+    if static["enabled"]:
+        st.sidebar.markdown("#### Exportação estática")
+        st.sidebar.markdown(f"{static['directory']}  \n" + ("Recusada: carimbo do código diferente do atual"
+                                                              if static["rejected"] else f"Figuras: {static['figures']}"))
+    # com o painel aberto os bytes das figuras e do mapa tambem sao medidos
+    trace = current_trace()
+    if trace is not None:
+        trace.measure_payload = True
+    _PANEL.container = st.sidebar.container()
+
+################### grafico plotly medido: tempo do st.plotly_chart (serializacao + envio) e, com o painel aberto, bytes do JSON
+def plotly_chart(fig, name="plotly_chart", **kwargs):
+    with span(name) as current:
+        element = st.plotly_chart(fig, **kwargs)
+    if measure_payload():
+        current.bytes = len(pio.to_json(fig, validate=False).encode("utf-8"))
+    return element
+
+################### fim do rerun da pagina: registra as medidas e, com o painel aberto, mostra os trechos e as exportacoes
+def finish_page():
+    trace = finish_rerun()
+    container = getattr(_PANEL, "container", None)
+    _PANEL.container = None
+    if trace is None or container is None:
+        return
+    with container:
+        st.markdown(f"#### Tempo do rerun: {trace.total_ms:,.1f} ms")
+        st.dataframe(trace_table(trace), hide_index=True, use_container_width=True)
+        st.download_button("Exportar reruns (JSON lines)", to_json_lines(), file_name="reruns.jsonl",
+                           mime="application/x-ndjson")
+        st.download_button("Exportar métricas (Prometheus)", to_prometheus(), file_name="metrics.prom", mime="text/plain")
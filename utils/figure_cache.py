@@ -0,0 +1,201 @@
+################### bibliotecas necessarias (libraries)
+import copy
+import functools
+import hashlib
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_list_like
+from utils.data_loader import DATASET_PATH, dataset_version
+from utils.instrumentation import rows_of, span
+from utils.snapshot import static_export_dir
+
+################### quantidade maxima de figuras/tabelas guardadas (as menos usadas recentemente sao descartadas)
+MAX_ENTRIES = 256
+# maior dado (valores de um DataFrame/Series/array) aceito como argumento nomeado: o conteudo entra na chave e seria
+# recalculado a cada rerun, mesmo no acerto do cache
+MAX_HASHED_VALUES = 10_000
+
+################### paginas estaticas pre-renderizadas (python -m utils.static_export): com ZOMATO_SERVE_STATIC=1 as figuras
+################### exportadas sao servidas direto do arquivo quando a pagina, os filtros, os argumentos e a versao do dataset
+################### sao os da exportacao; qualquer outra combinacao e calculada normalmente (depois de mudar os graficos,
+################### exporte de novo: a versao do dataset nao muda com o codigo)
+SERVE_STATIC = os.environ.get("ZOMATO_SERVE_STATIC", "") not in ("", "0")
+# diretorio servido: por padrao o da exportacao do dataset (dataset/zomato.static); ZOMATO_STATIC_DIR indica outro
+# (o mesmo informado na exportacao: python -m utils.static_export <diretorio>)
+STATIC_DIR = os.environ.get("ZOMATO_STATIC_DIR") or None
+STATIC_FIGURES = "figures.pkl"
+
+################### carimbo da exportacao: formato do arquivo de figuras + codigo dos modulos que preparam os dados e
+################### constroem as figuras/tabelas; uma exportacao com carimbo diferente do codigo atual e recusada
+STATIC_SCHEMA = 1
+STAMP_MODULES = ["data_loader", "outliers", "cube", "filters", "cuisines", "stats", "ranking", "tables", "charts",
+                 "figure_cache"]
+
+#----------------------------------------------------------------------------------------------------------------------------#
+#                                                        FUNCOES                                                             #
+#----------------------------------------------------------------------------------------------------------------------------#
+
+################### impressao digital do conteudo de um DataFrame/Series/array (colunas, tipos, indice e valores)
+def content_hash(value):
+    digest = hashlib.sha1(type(value).__name__.encode("utf-8"))
+    if isinstance(value, np.ndarray):
+        digest.update(f"{value.dtype}{value.shape}".encode("utf-8"))
+        values = np.ascontiguousarray(value)
+        digest.update(values.tobytes() if value.dtype != object else pd.util.hash_array(values.ravel()).tobytes())
+        return digest.hexdigest()
+    frame = value.to_frame() if isinstance(value, pd.Series) else value
+    digest.update("\x1f".join(f"{col}:{dtype}" for col, dtype in frame.dtypes.items()).encode("utf-8"))
+    try:
+        digest.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+    except TypeError:
+        raise TypeError("dados com valores nao hashable (listas, dicionarios) nao podem entrar na chave do cache") from None
+    return digest.hexdigest()
+
+################### normalizando filtros/argumentos para uma chave estavel; com unordered=True a ordem dos valores
+################### selecionados nao importa (["Brazil", "India"] e ["India", "Brazil"] geram a mesma chave)
+# dados pequenos passados como argumento nomeado (DataFrame, Series, array) entram na chave pelo conteudo; dados grandes
+# sao recusados (carregue-os dentro da funcao a partir do caminho do dataset, cuja versao ja faz parte da chave); o dado
+# principal do cached_figure (data) fica fora da chave, pois e o resultado dos filtros sobre a versao do dataset
+def normalize(value, unordered=False):
+    if isinstance(value, (pd.DataFrame, pd.Series, np.ndarray)):
+        if value.size > MAX_HASHED_VALUES:
+            raise TypeError(f"{type(value).__name__} com {value.size:,} valores e grande demais para entrar na chave do "
+                            "cache: carregue o dado dentro da funcao ou informe uma versao")
+        return (type(value).__name__, content_hash(value))
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), normalize(v, unordered)) for k, v in value.items()))
+    if is_list_like(value):
+        items = tuple(normalize(v, unordered) for v in value)
+        return tuple(sorted(items, key=repr)) if unordered or isinstance(value, set) else items
+    return value
+
+################### cache LRU de figuras compartilhado entre as sessoes do processo, com metricas de acerto e latencia
+class FigureCache:
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "hit_seconds": 0.0, "build_seconds": 0.0}
+
+    def get_or_build(self, key, builder):
+        start = time.perf_counter()
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                value = self._entries[key]
+                self.stats["hits"] += 1
+                self.stats["hit_seconds"] += time.perf_counter() - start
+                return value
+        value = builder()
+        with self._lock:
+            self.stats["misses"] += 1
+            self.stats["build_seconds"] += time.perf_counter() - start
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+        return value
+
+    def info(self):
+        with self._lock:
+            hits, misses = self.stats["hits"], self.stats["misses"]
+            return {"entries": len(self._entries), "max_entries": self.max_entries, "hits": hits, "misses": misses,
+                    "evictions": self.stats["evictions"], "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+                    "avg_hit_ms": 1000 * self.stats["hit_seconds"] / hits if hits else 0.0,
+                    "avg_build_ms": 1000 * self.stats["build_seconds"] / misses if misses else 0.0}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+FIGURE_CACHE = FigureCache()
+
+################### copia de um valor do cache para a sessao: figuras plotly, mapas folium e DataFrames sao mutaveis
+################### (um update_layout, ou o proprio render do mapa, alteraria a figura de todas as sessoes)
+# a figura plotly e copiada sem validar de novo (os dados ja foram validados na construcao); textos e numeros sao imutaveis
+def detached(value):
+    if isinstance(value, (str, bytes, int, float, bool, type(None))):
+        return value
+    if isinstance(value, tuple):
+        return tuple(detached(item) for item in value)
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy()
+    if hasattr(value, "to_plotly_json"):
+        return type(value)(value.to_dict(), _validate=False)
+    return copy.deepcopy(value)
+
+# figuras exportadas: arquivo lido de novo somente quando muda (a exportacao agendada regrava o arquivo de forma atomica)
+_STATIC = {"stamp": None, "figures": {}, "rejected": False}
+_STATIC_LOCK = threading.Lock()
+
+################### chave de uma figura: (pagina, funcao, filtros, argumentos, versao do dataset)
+# a versao considera somente os paises selecionados: uma atualizacao incremental que altera apenas outros paises
+# nao invalida a figura
+def figure_key(page, selections, function, path=DATASET_PATH, **kwargs):
+    version = dataset_version(path, selections.get("country_name"))
+    return (page, function.__name__, normalize(selections, unordered=True), normalize(kwargs), version)
+
+################### carimbo do codigo atual (calculado uma vez por processo)
+@functools.lru_cache(maxsize=None)
+def code_stamp():
+    digest = hashlib.sha1(f"schema={STATIC_SCHEMA}".encode("utf-8"))
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for module in STAMP_MODULES:
+        with open(os.path.join(directory, f"{module}.py"), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+################### diretorio das figuras exportadas servidas para o dataset
+def static_dir(path=DATASET_PATH):
+    return STATIC_DIR or static_export_dir(path)
+
+################### figuras da ultima exportacao estatica do dataset: chave (figure_key) -> figura/tabela
+# sem exportacao, ou com uma exportacao de outro codigo/formato (carimbo diferente), devolve {}
+def static_figures(path=DATASET_PATH):
+    file = os.path.join(static_dir(path), STATIC_FIGURES)
+    try:
+        stat = os.stat(file)
+    except OSError:
+        return {}
+    stamp = (file, stat.st_mtime_ns, stat.st_size)
+    with _STATIC_LOCK:
+        if _STATIC["stamp"] != stamp:
+            with open(file, "rb") as f:
+                payload = pickle.load(f)
+            valid = isinstance(payload, dict) and payload.get("code_stamp") == code_stamp()
+            _STATIC["figures"] = payload["figures"] if valid else {}
+            _STATIC["rejected"] = not valid
+            _STATIC["stamp"] = stamp
+        return _STATIC["figures"]
+
+################### situacao da exportacao servida (painel de debug)
+def static_info(path=DATASET_PATH):
+    figures = static_figures(path) if SERVE_STATIC else {}
+    return {"enabled": SERVE_STATIC, "directory": static_dir(path), "figures": len(figures),
+            "rejected": SERVE_STATIC and _STATIC["rejected"]}
+
+################### figura (ou tabela html) em cache: a funcao so e executada quando a combinacao ainda nao foi pedida por
+################### nenhuma sessao (nem exportada, com SERVE_STATIC); cada chamada recebe a sua copia do valor guardado
+def cached_figure(page, selections, function, data, path=DATASET_PATH, **kwargs):
+    key = figure_key(page, selections, function, path, **kwargs)
+    built = []
+
+    def build():
+        built.append(True)
+        return function(data, **kwargs)
+
+    with span(function.__name__, rows=rows_of(data)) as current:
+        value = static_figures(path).get(key) if SERVE_STATIC else None
+        if value is None:
+            value = FIGURE_CACHE.get_or_build(key, build)
+        value = detached(value)
+    current.cached = not built
+    if isinstance(value, str):
+        current.bytes = len(value.encode("utf-8"))
+    return value
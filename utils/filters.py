@@ -0,0 +1,161 @@
+################### bibliotecas necessarias (libraries)
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+from utils.cuisines import load_cuisine_index
+from utils.data_loader import DATASET_PATH, load_derived
+from utils.instrumentation import instrumented
+
+################### dimensoes filtraveis do dataset (sidebar) e intervalo fechado [low, high] para filtros numericos
+# as dimensoes preguicosas (cidade, avaliacao) nao sao usadas pelas paginas: seus bitmaps so sao montados no primeiro filtro
+FILTER_DIMENSIONS = ["country_name", "price_type", "cuisines"]
+LAZY_DIMENSIONS = ["city", "aggregate_rating"]
+Range = namedtuple("Range", ["low", "high"])
+# quantidade de bits ligados de cada byte (contagem das linhas direto dos bitmaps compactados)
+POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1)
+
+################### selecao padrao dos filtros da barra lateral (paises, tipos de preco e culinarias)
+DEFAULT_SELECTIONS = {
+"country_name": ["Philippines", "Brazil", "United States of America", "Canada", "United Arab Emirates", "India", "England",
+                 "Turkey"],
+"price_type": ["expensive", "gourmet", "normal", "cheap"],
+"cuisines": ["North Indian", "BBQ", "American", "Cafe", "Italian", "Pizza", "Brazilian", "Home-made"],
+}
+
+#----------------------------------------------------------------------------------------------------------------------------#
+#                                                        FUNCOES                                                             #
+#----------------------------------------------------------------------------------------------------------------------------#
+
+################### selecao avaliada sob demanda: a mascara so e calculada no primeiro acesso e as paginas recebem as
+################### posicoes das linhas (uma unica copia em apply) em vez de refiltrar o DataFrame a cada filtro
+class Selection:
+    def __init__(self, engine, selections):
+        self.engine = engine
+        self.selections = selections
+        self._mask = None
+
+    @property
+    def mask(self):
+        if self._mask is None:
+            self._mask = self.engine.evaluate(self.selections)
+        return self._mask
+
+    @property
+    def rows(self):
+        return np.flatnonzero(self.mask)
+
+    @property
+    def count(self):
+        return int(self.mask.sum())
+
+    @instrumented("filter")
+    def apply(self, df):
+        return df.iloc[self.rows]
+
+    ################### quantidade de linhas selecionadas por valor de uma dimensao (mesmo formato de rollup_count)
+    def counts(self, dimension):
+        return self.engine.counts(self.selections, dimension)
+
+################### motor de filtros: um bitmap (bits compactados com np.packbits) por valor de cada dimensao, combinados
+################### com OR entre os valores selecionados de uma dimensao e AND entre dimensoes
+class FilterEngine:
+    def __init__(self, df, dimensions=(), lazy=()):
+        self.n_rows = len(df)
+        self.n_bytes = (self.n_rows + 7) // 8
+        self.values = {}
+        self.positions = {}
+        self.bitmaps = {}
+        self.pending = {}
+        for dimension in dimensions:
+            self.add_dimension(dimension, df[dimension])
+        for dimension in lazy:
+            self.add_dimension(dimension, df[dimension], lazy=True)
+
+    ################### novas dimensoes (ex.: cidade, avaliacao) podem ser adicionadas sem copiar o DataFrame;
+    ################### com lazy=True a coluna e guardada e os bitmaps so sao montados no primeiro uso da dimensao
+    def add_dimension(self, name, values, lazy=False):
+        if lazy:
+            self.pending[name] = values
+            return
+        codes, uniques = pd.factorize(values, sort=True)
+        valid = codes >= 0
+        self.add_pairs(name, np.flatnonzero(valid), codes[valid], uniques)
+
+    ################### dimensao com varios valores por linha (ex.: todas as culinarias): um par (linha, codigo) por valor;
+    ################### cada par liga um bit direto nos bitmaps uint8 (pares repetidos nao alteram o resultado)
+    def add_pairs(self, name, rows, codes, uniques):
+        rows = np.asarray(rows, dtype=np.int64)
+        bits = np.right_shift(np.uint8(0x80), (rows & 7).astype(np.uint8))
+        flat = np.asarray(codes, dtype=np.int64) * self.n_bytes + (rows >> 3)
+        bitmaps = np.zeros(len(uniques) * self.n_bytes, dtype=np.uint8)
+        np.bitwise_or.at(bitmaps, flat, bits)
+        self.bitmaps[name] = bitmaps.reshape(len(uniques), self.n_bytes)
+        self.values[name] = np.asarray(uniques)
+        self.positions[name] = {value: i for i, value in enumerate(self.values[name])}
+        self.pending.pop(name, None)
+
+    ################### montando os bitmaps de uma dimensao preguicosa no primeiro uso
+    def _dimension(self, name):
+        if name in self.pending:
+            self.add_dimension(name, self.pending[name])
+        return name
+
+    ################### indices dos bitmaps que atendem a selecao de uma dimensao (lista de valores ou Range)
+    def _codes(self, name, selected):
+        self._dimension(name)
+        if isinstance(selected, Range):
+            values = self.values[name]
+            return np.flatnonzero((values >= selected.low) & (values <= selected.high))
+        positions = self.positions[name]
+        return np.array([positions[value] for value in selected if value in positions], dtype=np.int64)
+
+    ################### bitmap compactado das linhas que atendem a todas as dimensoes selecionadas
+    def evaluate_packed(self, selections):
+        packed = np.full(self.n_bytes, 0xFF, dtype=np.uint8)
+        for name, selected in selections.items():
+            if selected is None:
+                continue
+            codes = self._codes(name, selected)
+            if len(codes) == 0:
+                return np.zeros(self.n_bytes, dtype=np.uint8)
+            packed &= np.bitwise_or.reduce(self.bitmaps[name][codes], axis=0)
+        return packed
+
+    ################### mascara booleana (uma posicao por linha) da selecao
+    def evaluate(self, selections):
+        return np.unpackbits(self.evaluate_packed(selections), count=self.n_rows).astype(bool)
+
+    ################### quantidade de linhas da selecao por valor de uma dimensao, contando os bits de cada bitmap da
+    ################### dimensao combinado com o da selecao (sem materializar as linhas); valores sem linhas ficam de fora
+    def counts(self, selections, dimension):
+        packed = self.evaluate_packed(selections)
+        counts = POPCOUNT[self.bitmaps[self._dimension(dimension)] & packed].sum(axis=1, dtype=np.int64)
+        result = pd.DataFrame({"restaurants": counts}, index=pd.Index(self.values[dimension], name=dimension))
+        return result.loc[result["restaurants"] > 0, :]
+
+    ################### selecao preguicosa: ex. engine.select(country_name=[...], aggregate_rating=Range(4, 5))
+    def select(self, **selections):
+        return Selection(self, selections)
+
+################### carregando (ou construindo) o motor de filtros das linhas do dataset, compartilhado pelo processo
+# inclui a dimensao all_cuisines (todas as culinarias de cada restaurante, pelo indice de utils.cuisines)
+def build_filter_engine(df1, path=DATASET_PATH):
+    engine = FilterEngine(df1, FILTER_DIMENSIONS, LAZY_DIMENSIONS)
+    index = load_cuisine_index(path)
+    engine.add_pairs("all_cuisines", index.rows, index.ids, index.names)
+    return engine
+
+def load_filter_engine(path=DATASET_PATH):
+    return load_derived("filters", lambda df1: build_filter_engine(df1, path), path,
+                        columns=FILTER_DIMENSIONS + LAZY_DIMENSIONS)
+
+################### opcoes dos filtros da barra lateral, calculadas uma unica vez por versao do dataset
+# mesma ordem de antes (ordem de aparicao no dataset); all_cuisines lista todas as culinarias do indice (ordem alfabetica)
+def build_filter_options(df1, path=DATASET_PATH):
+    options = {dimension: list(pd.unique(df1[dimension].astype(object))) for dimension in ["country_name", "price_type", "cuisines"]}
+    options["all_cuisines"] = list(load_cuisine_index(path).names)
+    return options
+
+def load_filter_options(path=DATASET_PATH):
+    return load_derived("filter_options", lambda df1: build_filter_options(df1, path), path,
+                        columns=["country_name", "price_type", "cuisines"])
@@ -0,0 +1,148 @@
+################### bibliotecas necessarias (libraries)
+import os
+import sys
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+from utils.cube import CUBE_DIMENSIONS, build_cube
+from utils.data_loader import DATASET_PATH, clean_rows, clear_cache, optimize_dtypes, prepare_rows
+from utils.snapshot import (cube_snapshot_path, read_manifest, read_snapshot, rows_snapshot_path, snapshot_path,
+                            write_manifest, write_snapshot)
+
+################### chave que identifica um restaurante entre duas versoes do dataset (no CSV bruto e no preparado)
+KEY = "restaurant_id"
+RAW_KEY = "Restaurant ID"
+
+#----------------------------------------------------------------------------------------------------------------------------#
+#                                                        FUNCOES                                                             #
+#----------------------------------------------------------------------------------------------------------------------------#
+
+################### hash (uint64) de cada linha considerando as colunas informadas
+def row_hashes(df, columns):
+    return pd.util.hash_pandas_object(df[columns], index=False).to_numpy()
+
+################### comparando duas versoes do dataset preparado pelo restaurant_id: inseridos, alterados e removidos
+def diff_frames(old, new, key=KEY):
+    for name, df in [("anterior", old), ("novo", new)]:
+        if df[key].duplicated().any():
+            raise ValueError(f"O dataset {name} possui '{key}' repetido; a atualização incremental exige chave única")
+    columns = [col for col in new.columns if col != key]
+    old_ids, new_ids = old[key].to_numpy(), new[key].to_numpy()
+    # posicao de cada restaurante antigo no dataset novo (-1 quando foi removido)
+    position = pd.Index(new_ids).get_indexer(old_ids)
+    kept = position >= 0
+    # o hash de colunas category depende apenas dos valores, entao categorias diferentes nas duas versoes nao importam
+    changed = row_hashes(old.loc[kept, :], columns) != row_hashes(new.iloc[position[kept]], columns)
+    return {"inserted": new_ids[~pd.Index(new_ids).isin(old_ids)],
+            "updated": old_ids[kept][changed],
+            "deleted": old_ids[~kept]}
+
+################### impressao digital de cada linha valida do CSV bruto (todas as colunas), na ordem do CSV
+# gravada a cada atualizacao: comparando a do CSV novo com a anterior pelo diff_frames, somente as linhas inseridas e
+# alteradas precisam ser preparadas
+def raw_fingerprints(rows):
+    return pd.DataFrame({KEY: rows[RAW_KEY].to_numpy(), "fingerprint": row_hashes(rows, list(rows.columns))})
+
+################### aplicando a diferenca ao DataFrame preparado: as linhas removidas/alteradas saem do snapshot, as
+################### inseridas/alteradas sao preparadas (somente elas) e o resultado volta a ordem de linhas do CSV
+# as categorias ficam iguais as do preparo completo: os valores ainda usados no snapshot + os das linhas novas, em ordem
+def apply_diff(old, rows, fingerprints, diff, key=KEY):
+    kept = old.loc[~(old[key].isin(diff["updated"]) | old[key].isin(diff["deleted"])).to_numpy(), :]
+    added = rows.loc[rows[RAW_KEY].isin(diff["inserted"]) | rows[RAW_KEY].isin(diff["updated"]), :]
+    added = prepare_rows(added.copy())
+    dtypes = {col: pd.CategoricalDtype(sorted(set(kept[col].unique()) | set(added[col].unique())))
+              for col in kept.columns if kept[col].dtype == "category"}
+    frame = optimize_dtypes(pd.concat([kept.astype(dtypes), added.astype(dtypes)], ignore_index=True))
+    position = pd.Index(fingerprints[key]).get_indexer(frame[key])
+    return frame.iloc[np.argsort(position)].reset_index(drop=True)
+
+################### mascara das linhas (do DataFrame ou do cubo) que pertencem as celulas informadas
+# cada dimensao e codificada pela posicao do valor entre os valores das celulas (nas colunas category, pelas categorias,
+# sem converter as linhas) e os codigos das dimensoes formam uma unica chave inteira por celula
+def in_cells(df, cells):
+    key, valid = np.zeros(len(df), dtype=np.int64), np.ones(len(df), dtype=bool)
+    cell_key = np.zeros(len(cells), dtype=np.int64)
+    for col in CUBE_DIMENSIONS:
+        values = pd.Index(cells[col].astype(object).unique())
+        if df[col].dtype == "category":
+            codes = values.get_indexer(df[col].cat.categories.astype(object))[df[col].cat.codes.to_numpy()]
+        else:
+            codes = values.get_indexer(df[col].astype(object) if df[col].dtype == bool else df[col])
+        valid &= codes >= 0
+        key = key * len(values) + codes
+        cell_key = cell_key * len(values) + values.get_indexer(cells[col].astype(object))
+    return valid & np.isin(key, cell_key)
+
+################### atualizando o cubo somente nas celulas afetadas pelas linhas alteradas (antes e depois da mudanca)
+def update_cube(cube, old, frame, diff, key=KEY):
+    changed_ids = pd.Index(diff["inserted"]).append(pd.Index(diff["updated"])).append(pd.Index(diff["deleted"]))
+    touched = pd.concat([old.loc[old[key].isin(changed_ids), CUBE_DIMENSIONS].astype(object),
+                         frame.loc[frame[key].isin(changed_ids), CUBE_DIMENSIONS].astype(object)])
+    kept = cube.loc[~in_cells(cube, touched), :]
+    rebuilt = build_cube(frame.loc[in_cells(frame, touched), :])
+    cube = pd.concat([kept.astype({col: object for col in CUBE_DIMENSIONS if kept[col].dtype == "category"}),
+                      rebuilt.astype({col: object for col in CUBE_DIMENSIONS if rebuilt[col].dtype == "category"})],
+                     ignore_index=True)
+    for col in CUBE_DIMENSIONS:
+        if cube[col].dtype == object:
+            cube[col] = cube[col].astype("category")
+    return cube
+
+################### paises atingidos pela mudanca (usados para invalidar somente as figuras desses paises)
+def changed_countries(old, frame, diff, key=KEY):
+    changed_ids = pd.Index(diff["inserted"]).append(pd.Index(diff["updated"])).append(pd.Index(diff["deleted"]))
+    countries = pd.concat([old.loc[old[key].isin(changed_ids), "country_name"].astype(str),
+                           frame.loc[frame[key].isin(changed_ids), "country_name"].astype(str)])
+    return sorted(countries.unique())
+
+################### atualizacao incremental: compara as linhas do CSV novo com as da versao anterior pelo restaurant_id,
+################### prepara somente as inseridas/alteradas, atualiza o cubo so nas celulas afetadas, grava os snapshots
+################### e registra a nova versao (global e por pais)
+# o CSV novo e lido e filtrado por inteiro (duplicadas e limites de outlier dependem de todas as linhas); o preparo
+# (culinarias, pais/preco/cor, nomes e tipos) e feito somente nas linhas alteradas. O DataFrame resultante e igual ao
+# preparo completo do CSV, na mesma ordem de linhas; sem a versao anterior (ou com um snapshot que nao corresponde as
+# impressoes digitais gravadas) o CSV e preparado por inteiro
+def refresh(path=DATASET_PATH):
+    rows = clean_rows(pd.read_csv(path))
+    fingerprints = raw_fingerprints(rows)
+    snapshot, cube_path, rows_path = snapshot_path(path), cube_snapshot_path(path), rows_snapshot_path(path)
+    previous = read_manifest(path, current=False)
+    old = old_fingerprints = None
+    if previous is not None and all(os.path.exists(file) for file in [snapshot, cube_path, rows_path]):
+        old, old_fingerprints = read_snapshot(snapshot), read_snapshot(rows_path)
+        if not np.array_equal(old[KEY].to_numpy(), old_fingerprints[KEY].to_numpy()):
+            old = None
+    if old is None:
+        frame = prepare_rows(rows)
+        cube = build_cube(frame)
+        ids = frame[KEY].to_numpy()
+        diff = {"inserted": ids, "updated": ids[:0], "deleted": ids[:0]}
+        countries = sorted(frame["country_name"].astype(str).unique())
+        previous = {"version": 0, "countries": {}}
+    else:
+        diff = diff_frames(old_fingerprints, fingerprints)
+        frame = apply_diff(old, rows, fingerprints, diff)
+        cube = update_cube(read_snapshot(cube_path), old, frame, diff)
+        countries = changed_countries(old, frame, diff)
+    version = previous["version"] + 1 if any(len(ids) for ids in diff.values()) else previous["version"]
+    country_versions = dict(previous["countries"])
+    for country in countries:
+        country_versions[country] = version
+    write_snapshot(frame, snapshot)
+    write_snapshot(cube, cube_path)
+    write_snapshot(fingerprints, rows_path)
+    manifest = write_manifest(path, {"version": version, "countries": country_versions,
+                                     "updated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                                     "inserted": int(len(diff["inserted"])), "updated": int(len(diff["updated"])),
+                                     "deleted": int(len(diff["deleted"])), "changed_countries": countries})
+    clear_cache()
+    return manifest
+
+#-----------------------------------------------------------------------------------------------------------------------------#
+#                                   ATUALIZACAO INCREMENTAL (python -m utils.incremental [csv])                               #
+#-----------------------------------------------------------------------------------------------------------------------------#
+
+if __name__ == "__main__":
+    manifest = refresh(sys.argv[1] if len(sys.argv) > 1 else DATASET_PATH)
+    print(f"Versão {manifest['version']}: {manifest['inserted']} inseridos, {manifest['updated']} alterados, "
+          f"{manifest['deleted']} removidos ({', '.join(manifest['changed_countries']) or 'nenhum país alterado'})")
@@ -0,0 +1,200 @@
+################### bibliotecas necessarias (libraries)
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+import numpy as np
+import pandas as pd
+
+################### exportacao opcional a cada rerun (sem as variaveis de ambiente as metricas ficam so na memoria):
+# - ZOMATO_METRICS_JSONL: arquivo em que cada rerun e acrescentado como uma linha JSON;
+# - ZOMATO_METRICS_PROM: arquivo texto no formato do Prometheus (regravado a cada rerun, para o coletor local ler)
+JSONL_PATH = os.environ.get("ZOMATO_METRICS_JSONL")
+PROMETHEUS_PATH = os.environ.get("ZOMATO_METRICS_PROM")
+
+################### quantidade de reruns guardados na memoria do processo (os mais antigos sao descartados)
+HISTORY_SIZE = 500
+METRIC_PREFIX = "zomato_dashboard"
+
+#----------------------------------------------------------------------------------------------------------------------------#
+#                                                        FUNCOES                                                             #
+#----------------------------------------------------------------------------------------------------------------------------#
+
+################### um trecho medido: tempo de parede, linhas processadas, bytes enviados ao navegador e, para as figuras,
+################### se vieram do cache; depth e o nivel de aninhamento (um load_data dentro de um load_derived, por ex.)
+class Span:
+    __slots__ = ("name", "depth", "ms", "rows", "bytes", "cached")
+
+    def __init__(self, name, depth, rows=None):
+        self.name = name
+        self.depth = depth
+        self.ms = 0.0
+        self.rows = rows
+        self.bytes = None
+        self.cached = None
+
+    def as_dict(self):
+        return {"name": self.name, "depth": self.depth, "ms": round(self.ms, 3), "rows": self.rows, "bytes": self.bytes,
+                "cached": self.cached}
+
+################### medidas de um rerun de uma pagina; measure_payload liga a medicao dos bytes que exigem serializar de
+################### novo a figura/mapa (ligada pelo painel de debug ou quando ha exportacao configurada)
+class Trace:
+    def __init__(self, page, measure_payload=False):
+        self.page = page
+        self.timestamp = time.time()
+        self.start = time.perf_counter()
+        self.total_ms = None
+        self.spans = []
+        self.depth = 0
+        self.measure_payload = measure_payload
+
+    def as_dict(self):
+        return {"timestamp": round(self.timestamp, 3), "page": self.page, "total_ms": round(self.total_ms or 0.0, 3),
+                "spans": [span.as_dict() for span in self.spans]}
+
+# o rerun atual de cada sessao: o streamlit executa cada sessao na sua propria thread, entao cada uma ve o seu rerun
+_TRACE = contextvars.ContextVar("trace", default=None)
+_LOCK = threading.Lock()
+HISTORY = deque(maxlen=HISTORY_SIZE)
+# acumulados do processo para o Prometheus: (pagina, trecho) -> [chamadas, segundos, linhas, bytes]; pagina -> [reruns, segundos]
+SPAN_TOTALS = {}
+RERUN_TOTALS = {}
+
+################### quantidade de linhas de um DataFrame/Series/array (None para os demais valores)
+def rows_of(value):
+    if isinstance(value, (pd.DataFrame, pd.Series, np.ndarray)):
+        return len(value)
+    return None
+
+################### iniciando as medidas de um rerun (um rerun anterior que nao terminou, ex. st.rerun, e descartado)
+def start_rerun(page, measure_payload=False):
+    trace = Trace(page, measure_payload or bool(JSONL_PATH or PROMETHEUS_PATH))
+    _TRACE.set(trace)
+    return trace
+
+################### rerun atual (None fora de uma pagina: benchmarks, consultas sem streamlit, ...)
+def current_trace():
+    return _TRACE.get()
+
+################### se os bytes enviados ao navegador devem ser medidos neste rerun
+def measure_payload():
+    trace = _TRACE.get()
+    return trace is not None and trace.measure_payload
+
+################### medindo um trecho: with span("load_cube") as s: ... (s.rows/s.bytes podem ser preenchidos dentro dele)
+# fora de um rerun o trecho e executado normalmente e nada e registrado
+@contextlib.contextmanager
+def span(name, rows=None):
+    trace = _TRACE.get()
+    if trace is None:
+        yield Span(name, 0, rows)
+        return
+    current = Span(name, trace.depth, rows)
+    trace.spans.append(current)
+    trace.depth += 1
+    start = time.perf_counter()
+    try:
+        yield current
+    finally:
+        current.ms = (time.perf_counter() - start) * 1000
+        trace.depth -= 1
+
+################### decorator: mede cada chamada da funcao; as linhas sao as do resultado quando ele e um DataFrame
+################### (carga, filtro) ou as da entrada (graficos) e os bytes sao o tamanho do html devolvido (tabelas)
+def instrumented(name=None):
+    def decorator(function):
+        label = name or function.__name__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if _TRACE.get() is None:
+                return function(*args, **kwargs)
+            with span(label) as current:
+                result = function(*args, **kwargs)
+            current.rows = rows_of(result)
+            if current.rows is None:
+                current.rows = next((rows_of(arg) for arg in args if rows_of(arg) is not None), None)
+            if isinstance(result, str):
+                current.bytes = len(result.encode("utf-8"))
+            return result
+        return wrapper
+    return decorator
+
+################### encerrando o rerun atual: entra no historico e nos acumulados e e exportado quando configurado
+def finish_rerun():
+    trace = _TRACE.get()
+    if trace is None:
+        return None
+    _TRACE.set(None)
+    trace.total_ms = (time.perf_counter() - trace.start) * 1000
+    with _LOCK:
+        HISTORY.append(trace)
+        totals = RERUN_TOTALS.setdefault(trace.page, [0, 0.0])
+        totals[0] += 1
+        totals[1] += trace.total_ms / 1000
+        for current in trace.spans:
+            totals = SPAN_TOTALS.setdefault((trace.page, current.name), [0, 0.0, 0, 0])
+            totals[0] += 1
+            totals[1] += current.ms / 1000
+            totals[2] += current.rows or 0
+            totals[3] += current.bytes or 0
+    if JSONL_PATH:
+        with _LOCK, open(JSONL_PATH, "a", encoding="utf-8") as file:
+            file.write(json.dumps(trace.as_dict(), ensure_ascii=False) + "\n")
+    if PROMETHEUS_PATH:
+        write_prometheus(PROMETHEUS_PATH)
+    return trace
+
+################### trechos de um rerun como tabela (trechos aninhados marcados com "└" e indentados pelo nivel)
+def trace_table(trace):
+    return pd.DataFrame({"Trecho": [". " * (span.depth - 1) + "└ " * (span.depth > 0) + span.name for span in trace.spans],
+                         "ms": [round(span.ms, 1) for span in trace.spans],
+                         "Linhas": [span.rows for span in trace.spans],
+                         "Bytes": [span.bytes for span in trace.spans],
+                         "Cache": [{True: "acerto", False: "falha"}.get(span.cached, "") for span in trace.spans]})
+
+################### reruns guardados no formato JSON lines (um objeto por rerun)
+def to_json_lines(traces=None):
+    with _LOCK:
+        traces = list(HISTORY) if traces is None else list(traces)
+    return "".join(json.dumps(trace.as_dict(), ensure_ascii=False) + "\n" for trace in traces)
+
+################### acumulados do processo no formato texto do Prometheus (contadores por pagina e trecho)
+def to_prometheus():
+    def escape(value):
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    # contagens (reruns, chamadas, linhas, bytes) saem como inteiros exatos e segundos com todos os digitos (repr)
+    def number(value):
+        return repr(float(value)) if isinstance(value, float) else str(int(value))
+
+    with _LOCK:
+        spans = sorted(SPAN_TOTALS.items())
+        reruns = sorted(RERUN_TOTALS.items())
+    lines = []
+    for metric, help_text, index in [("reruns_total", "Reruns por pagina", 0),
+                                     ("rerun_seconds_total", "Tempo total dos reruns por pagina", 1)]:
+        lines += [f"# HELP {METRIC_PREFIX}_{metric} {help_text}", f"# TYPE {METRIC_PREFIX}_{metric} counter"]
+        lines += [f'{METRIC_PREFIX}_{metric}{{page="{escape(page)}"}} {number(totals[index])}'
+                  for page, totals in reruns]
+    for metric, help_text, index in [("span_calls_total", "Chamadas de cada trecho", 0),
+                                     ("span_seconds_total", "Tempo de parede de cada trecho", 1),
+                                     ("span_rows_total", "Linhas processadas por cada trecho", 2),
+                                     ("span_payload_bytes_total", "Bytes enviados ao navegador por cada trecho", 3)]:
+        lines += [f"# HELP {METRIC_PREFIX}_{metric} {help_text}", f"# TYPE {METRIC_PREFIX}_{metric} counter"]
+        lines += [f'{METRIC_PREFIX}_{metric}{{page="{escape(page)}",span="{escape(name)}"}} {number(totals[index])}'
+                  for (page, name), totals in spans]
+    return "\n".join(lines) + "\n"
+
+################### gravando o texto do Prometheus de forma atomica (o coletor nunca le um arquivo pela metade)
+def write_prometheus(path):
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        file.write(to_prometheus())
+    os.replace(tmp_path, path)
+    return path
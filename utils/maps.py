@@ -0,0 +1,198 @@
+################### bibliotecas necessarias (libraries)
+import functools
+import sys
+import time
+import numpy as np
+
+# folium (e branca/jinja2) sao importados somente quando um mapa e construido: quem usa apenas as constantes e
+# funcoes auxiliares deste modulo (map_view, viewport_mask, grid_clusters, ...) nao paga o custo dessas bibliotecas
+
+################### colunas usadas pelo mapa dos restaurantes
+MAP_COLUMNS = ["city", "aggregate_rating", "currency", "cuisines", "color_name", "restaurant_id", "restaurant_name",
+               "average_cost_for_two", "latitude", "longitude"]
+MAP_GROUPBY = ["city", "cuisines", "color_name", "currency", "restaurant_id", "restaurant_name"]
+
+################### colunas enviadas ao navegador no modo rapido (a ordem define os indices row[i] do callback)
+FAST_COLUMNS = ["latitude", "longitude", "color_name", "restaurant_name", "average_cost_for_two", "currency", "cuisines",
+                "aggregate_rating"]
+
+################### callback JavaScript que monta cada marcador no navegador (mesmo icone, cor, tooltip e popup do modo antigo)
+MARKER_CALLBACK = """function (row) {
+    var icon = L.AwesomeMarkers.icon({icon: 'home', markerColor: row[2], prefix: 'glyphicon', iconColor: 'white'});
+    var marker = L.marker(new L.LatLng(row[0], row[1]), {icon: icon});
+    var popup = '<div style="width: 250px;">' +
+                '<b>' + row[3] + '</b><br><br>' +
+                'Preço para dois: ' + row[4].toFixed(2) + ' ( ' + row[5] + ')<br> ' +
+                'Tipo de culinária: ' + row[6] + '<br>' +
+                'Avaliação média: ' + row[7].toFixed(1) + '/5.0' +
+                '</div>';
+    marker.bindPopup(popup, {maxWidth: '100%'});
+    marker.bindTooltip('Ver informações');
+    return marker;
+}"""
+
+################### nivel de detalhe do mapa: abaixo de DETAIL_ZOOM (ou com mais de MAX_MARKERS restaurantes visiveis) o
+################### navegador recebe somente os agrupamentos calculados no servidor, nunca os restaurantes individuais
+DEFAULT_VIEW = {"center": [20.0, 0.0], "zoom": 2, "bounds": None}
+DETAIL_ZOOM = 10
+MAX_MARKERS = 1500
+CELLS_PER_TILE = 4
+
+################### camada com os agrupamentos (um circulo por celula da grade, com a quantidade de restaurantes)
+# a classe depende do branca/jinja2, entao e criada na primeira construcao de um mapa de agrupamentos
+@functools.lru_cache(maxsize=None)
+def cluster_layer_class():
+    from branca.element import MacroElement
+    from jinja2 import Template
+
+    class ClusterLayer(MacroElement):
+        _template = Template("""
+            {% macro script(this, kwargs) %}
+                var {{ this.get_name() }} = (function(){
+                    var data = {{ this.data|tojson }};
+                    var layer = L.layerGroup();
+                    for (var i = 0; i < data.length; i++) {
+                        var row = data[i];
+                        L.circleMarker(new L.LatLng(row[0], row[1]), {radius: 8 + 4 * Math.log10(row[2]), color: '#800000',
+                                       fillColor: '#800000', fillOpacity: 0.6, weight: 1})
+                         .bindTooltip(row[2] + ' restaurantes')
+                         .addTo(layer);
+                    }
+                    layer.addTo({{ this._parent.get_name() }});
+                    return layer;
+                })();
+            {% endmacro %}""")
+
+        def __init__(self, lat, lon, counts):
+            super().__init__()
+            self._name = "ClusterLayer"
+            self.data = np.column_stack([np.round(lat, 5), np.round(lon, 5), counts]).tolist()
+            for row in self.data:
+                row[2] = int(row[2])
+
+    return ClusterLayer
+
+#----------------------------------------------------------------------------------------------------------------------------#
+#                                                        FUNCOES                                                             #
+#----------------------------------------------------------------------------------------------------------------------------#
+
+################### um registro por restaurante com as informacoes exibidas no mapa
+def map_data(df):
+    return df.loc[:, MAP_COLUMNS].groupby(MAP_GROUPBY, observed=True).median().reset_index()
+
+################### criando mapa dos restaurantes (um folium.Marker por restaurante)
+def map_restaurants(df):
+    import folium
+    from folium.plugins import MarkerCluster
+    df_aux = map_data(df)
+    map = folium.Map(zoom_start=11)
+    marker_cluster = MarkerCluster().add_to(map)
+    for i in range (len(df_aux)):
+        popup_html = f'<div style="width: 250px;">' \
+                     f"<b>{df_aux.loc[i, 'restaurant_name']}</b><br><br>" \
+                     \
+                     f"Preço para dois: {df_aux.loc[i, 'average_cost_for_two']:.2f} ( {df_aux.loc[i, 'currency']})<br> " \
+                     f"Tipo de culinária: {df_aux.loc[i, 'cuisines']}<br>" \
+                     f"Avaliação média: {df_aux.loc[i, 'aggregate_rating']}/5.0" \
+                     f'</div>'
+        folium.Marker ([df_aux.loc[i, 'latitude'], df_aux.loc[i, 'longitude']], popup=popup_html, width=500, height=500, 
+                       tooltip='Ver informações', parse_html=True, zoom_start=30, tiles= 'Stamen Toner',
+                       icon=folium.Icon(color=df_aux.loc[i, 'color_name'] , icon='home')).add_to(marker_cluster)
+    return map
+
+################### criando mapa dos restaurantes no modo rapido: os dados vao em colunas para o navegador e os
+################### marcadores/popups sao montados em JavaScript pelo FastMarkerCluster
+def fast_map_restaurants(df):
+    import folium
+    from folium.plugins import FastMarkerCluster
+    df_aux = map_data(df)
+    df_aux = df_aux.astype({"color_name": str, "restaurant_name": str, "currency": str, "cuisines": str,
+                            "average_cost_for_two": float, "aggregate_rating": float})
+    map = folium.Map(zoom_start=11)
+    FastMarkerCluster(df_aux[FAST_COLUMNS].values.tolist(), callback=MARKER_CALLBACK).add_to(map)
+    return map
+
+################### restaurantes dentro da area visivel do mapa (bounds no formato devolvido pelo st_folium)
+def viewport_mask(lat, lon, bounds):
+    south, west = bounds["_southWest"]["lat"], bounds["_southWest"]["lng"]
+    north, east = bounds["_northEast"]["lat"], bounds["_northEast"]["lng"]
+    in_lat = (lat >= south) & (lat <= north)
+    if east - west >= 360:
+        return in_lat
+    # normaliza as longitudes da tela para [-180, 180) e trata a area que cruza o antimeridiano
+    west = (west + 180) % 360 - 180
+    east = (east + 180) % 360 - 180
+    if west <= east:
+        return in_lat & (lon >= west) & (lon <= east)
+    return in_lat & ((lon >= west) | (lon <= east))
+
+################### agrupando as coordenadas numa grade cujo tamanho da celula depende do zoom
+def grid_clusters(lat, lon, zoom):
+    cell = 360.0 / (2 ** zoom) / CELLS_PER_TILE
+    rows = np.floor((lat + 90.0) / cell).astype(np.int64)
+    cols = np.floor((lon + 180.0) / cell).astype(np.int64)
+    keys = rows * (int(360.0 / cell) + 1) + cols
+    _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    lat_c = np.bincount(inverse, weights=lat) / counts
+    lon_c = np.bincount(inverse, weights=lon) / counts
+    return lat_c, lon_c, counts
+
+################### criando mapa dos restaurantes com nivel de detalhe: agrupamentos calculados no servidor no zoom baixo e
+################### restaurantes individuais (somente os da area visivel) no zoom alto
+def lod_map_restaurants(df, zoom=DEFAULT_VIEW["zoom"], bounds=None, center=DEFAULT_VIEW["center"]):
+    import folium
+    from folium.plugins import FastMarkerCluster
+    df_aux = map_data(df)
+    if bounds is not None:
+        df_aux = df_aux.loc[viewport_mask(df_aux["latitude"].to_numpy(), df_aux["longitude"].to_numpy(), bounds)]
+    map = folium.Map(location=center, zoom_start=zoom)
+    if zoom >= DETAIL_ZOOM and len(df_aux) <= MAX_MARKERS:
+        df_aux = df_aux.astype({"color_name": str, "restaurant_name": str, "currency": str, "cuisines": str,
+                                "average_cost_for_two": float, "aggregate_rating": float})
+        FastMarkerCluster(df_aux[FAST_COLUMNS].values.tolist(), callback=MARKER_CALLBACK).add_to(map)
+        return map, {"mode": "restaurantes", "points": len(df_aux), "restaurants": len(df_aux)}
+    lat_c, lon_c, counts = grid_clusters(df_aux["latitude"].to_numpy(), df_aux["longitude"].to_numpy(), zoom)
+    cluster_layer_class()(lat_c, lon_c, counts).add_to(map)
+    return map, {"mode": "agrupamentos", "points": len(counts), "restaurants": len(df_aux)}
+
+################### extraindo a visao atual (centro, zoom e area visivel) devolvida pelo st_folium
+def map_view(output, digits=4):
+    if not output or not output.get("bounds") or output.get("zoom") is None:
+        return None
+    bounds = output["bounds"]
+    if bounds.get("_southWest", {}).get("lat") is None:
+        return None
+    bounds = {corner: {axis: round(bounds[corner][axis], digits) for axis in ["lat", "lng"]}
+              for corner in ["_southWest", "_northEast"]}
+    center = output.get("center") or {}
+    center = [round(center.get("lat", 0.0), digits), round(center.get("lng", 0.0), digits)]
+    return {"center": center, "zoom": int(output["zoom"]), "bounds": bounds}
+
+################### tamanho (bytes) do HTML do mapa enviado ao navegador
+def map_payload_size(map):
+    return len(map.get_root().render().encode("utf-8"))
+
+################### medindo o tempo de construcao e o tamanho do HTML de um mapa
+def profile_map(builder, df):
+    start = time.perf_counter()
+    map = builder(df)
+    build_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    payload_bytes = map_payload_size(map)
+    render_seconds = time.perf_counter() - start
+    return {"builder": builder.__name__, "build_seconds": build_seconds, "render_seconds": render_seconds,
+            "payload_bytes": payload_bytes}
+
+#-----------------------------------------------------------------------------------------------------------------------------#
+#                                 COMPARACAO DOS MODOS DO MAPA (python -m utils.maps)                                         #
+#-----------------------------------------------------------------------------------------------------------------------------#
+
+if __name__ == "__main__":
+    from utils.data_loader import DATASET_PATH, load_data
+    df1 = load_data(sys.argv[1] if len(sys.argv) > 1 else DATASET_PATH, columns=MAP_COLUMNS)
+    lod_map = lambda df: lod_map_restaurants(df)[0]
+    lod_map.__name__ = "lod_map_restaurants"
+    for builder in [map_restaurants, fast_map_restaurants, lod_map]:
+        stats = profile_map(builder, df1)
+        print(f"{stats['builder']:<22} construção: {stats['build_seconds']:.3f}s  render: {stats['render_seconds']:.3f}s  "
+              f"payload: {stats['payload_bytes'] / 1e3:,.1f} KB")
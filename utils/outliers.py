@@ -0,0 +1,115 @@
+################### bibliotecas necessarias (libraries)
+import sys
+import numpy as np
+import pandas as pd
+
+################### coluna analisada e coluna que define os grupos (cada moeda tem sua propria escala de precos)
+OUTLIER_COLUMN = "Average Cost for two"
+OUTLIER_GROUP = "Currency"
+
+################### regra padrao: limite de IQR bem largo, que pega erros de digitacao (ex.: 25000017 dolares) sem
+################### descartar restaurantes caros de verdade; no dataset atual remove somente essa linha
+OUTLIER_RULES = {"method": "iqr", "k": 20.0}
+
+################### quantidade minima de linhas de uma moeda para calcular os limites (com menos linhas nada e descartado)
+MIN_ROWS = 20
+
+################### colunas do relatorio de linhas descartadas
+REPORT_COLUMNS = ["Restaurant ID", "Restaurant Name", "Country Code", "City"]
+
+#----------------------------------------------------------------------------------------------------------------------------#
+#                                                        FUNCOES                                                             #
+#----------------------------------------------------------------------------------------------------------------------------#
+
+################### limites inferior/superior por moeda, calculados em uma unica passada do groupby
+# metodos: "iqr" (q1 - k*iqr, q3 + k*iqr), "mad" (mediana +- k * 1,4826 * desvio absoluto mediano) e
+# "quantile" (quantis lower/upper de cada moeda); escala zero (todos os precos iguais) nao gera limite
+def outlier_thresholds(df, method="iqr", k=20.0, lower=0.0, upper=1.0, column=OUTLIER_COLUMN, by=OUTLIER_GROUP,
+                       min_rows=MIN_ROWS):
+    values = df[column].astype("float64")
+    groups = df[by].astype(str)
+    counts = groups.value_counts()
+    if method == "iqr":
+        q = values.groupby(groups).quantile([0.25, 0.75]).unstack()
+        scale = (q[0.75] - q[0.25]) * k
+        limits = pd.DataFrame({"lower": q[0.25] - scale, "upper": q[0.75] + scale})
+    elif method == "mad":
+        median = values.groupby(groups).transform("median")
+        stats = pd.DataFrame({"median": median, "deviation": (values - median).abs()}).groupby(groups).median()
+        scale = stats["deviation"] * 1.4826 * k
+        limits = pd.DataFrame({"lower": stats["median"] - scale, "upper": stats["median"] + scale})
+    elif method == "quantile":
+        q = values.groupby(groups).quantile([lower, upper]).unstack()
+        scale = q[upper] - q[lower]
+        limits = pd.DataFrame({"lower": q[lower], "upper": q[upper]})
+    else:
+        raise ValueError(f"Método de outlier desconhecido: '{method}' (use 'iqr', 'mad' ou 'quantile')")
+    degenerate = (scale <= 0).to_numpy()
+    limits.loc[degenerate, "lower"] = -np.inf
+    limits.loc[degenerate, "upper"] = np.inf
+    limits["rows"] = counts.reindex(limits.index).to_numpy()
+    limits.index.name = by
+    return limits.loc[limits["rows"] >= min_rows, :]
+
+################### etapa de remocao de outliers: aprende os limites por moeda e descarta as linhas fora deles
+# funciona no DataFrame inteiro ou bloco a bloco: os limites de uma moeda sao aprendidos no primeiro bloco com linhas
+# suficientes dela e reaproveitados nos blocos seguintes; todas as linhas descartadas ficam no relatorio
+class OutlierStage:
+    def __init__(self, column=OUTLIER_COLUMN, by=OUTLIER_GROUP, min_rows=MIN_ROWS, **rules):
+        self.column = column
+        self.by = by
+        self.min_rows = min_rows
+        self.rules = {**OUTLIER_RULES, **rules}
+        self.thresholds = pd.DataFrame(columns=["lower", "upper", "rows"])
+        self.dropped = []
+
+    ################### aprendendo os limites das moedas que ainda nao possuem limite
+    def fit(self, df):
+        known = df[self.by].astype(str).isin(self.thresholds.index)
+        if known.all():
+            return self
+        new = outlier_thresholds(df.loc[~known, :], column=self.column, by=self.by, min_rows=self.min_rows, **self.rules)
+        self.thresholds = new if self.thresholds.empty else pd.concat([self.thresholds, new])
+        return self
+
+    ################### mascara das linhas dentro dos limites (moedas sem limite sao mantidas)
+    def keep_mask(self, df):
+        limits = self.thresholds.reindex(df[self.by].astype(str))
+        values = df[self.column].to_numpy(dtype="float64")
+        lower = limits["lower"].to_numpy(dtype="float64")
+        upper = limits["upper"].to_numpy(dtype="float64")
+        return ~((values < lower) | (values > upper))
+
+    ################### aplicando a etapa: aprende os limites que faltam, guarda as linhas descartadas e devolve o restante
+    def apply(self, df):
+        self.fit(df)
+        keep = self.keep_mask(df)
+        if not keep.all():
+            dropped = df.loc[~keep, [col for col in REPORT_COLUMNS if col in df.columns] + [self.by, self.column]]
+            limits = self.thresholds.reindex(dropped[self.by].astype(str))
+            self.dropped.append(dropped.assign(lower=limits["lower"].to_numpy(), upper=limits["upper"].to_numpy()))
+        return df.loc[keep, :]
+
+    ################### relatorio com todas as linhas descartadas ate agora
+    def report(self):
+        if not self.dropped:
+            return pd.DataFrame(columns=REPORT_COLUMNS + [self.by, self.column, "lower", "upper"])
+        return pd.concat(self.dropped)
+
+#-----------------------------------------------------------------------------------------------------------------------------#
+#                     RELATORIO DE OUTLIERS (python -m utils.outliers [csv] [iqr|mad|quantile] [k])                           #
+#-----------------------------------------------------------------------------------------------------------------------------#
+
+if __name__ == "__main__":
+    from utils.data_loader import DATASET_PATH
+    path = sys.argv[1] if len(sys.argv) > 1 else DATASET_PATH
+    rules = {"method": sys.argv[2]} if len(sys.argv) > 2 else {}
+    if len(sys.argv) > 3:
+        rules["k"] = float(sys.argv[3])
+    stage = OutlierStage(**rules)
+    stage.apply(pd.read_csv(path).dropna().drop_duplicates())
+    pd.set_option("display.width", 200)
+    print("Limites por moeda:")
+    print(stage.thresholds.to_string(float_format="{:,.2f}".format))
+    print(f"\n{len(stage.report())} linha(s) descartada(s):")
+    print(stage.report().to_string(index=False, float_format="{:,.2f}".format))
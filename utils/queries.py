@@ -0,0 +1,174 @@
+################### bibliotecas necessarias (libraries)
+import functools
+import hashlib
+import numpy as np
+import pandas as pd
+from utils.cube import load_cube, load_cube_filters, rollup_count, rollup_nunique
+from utils.cuisines import load_cuisine_index
+from utils.data_loader import DATASET_PATH, dataset_version
+from utils.figure_cache import FigureCache, normalize
+from utils.filters import load_filter_engine
+from utils.ranking import top_k
+from utils.stats import describe_cost, load_cost_histogram, to_usd
+
+# consultas sem streamlit com os mesmos numeros dos dashboards: usam o mesmo cubo de agregados, o mesmo indice de
+# culinarias, os mesmos filtros e as mesmas funcoes de agregacao (rollups, top_k, describe_cost) dos graficos. Os resultados ficam em cache pela
+# (consulta, parametros, versao do dataset), entao uma atualizacao do dataset invalida as respostas automaticamente
+
+################### resultados ja calculados (dicionarios somente leitura)
+QUERY_CACHE = FigureCache(max_entries=512)
+
+################### filtros aceitos por todas as consultas: parametro -> dimensao do cubo (sem o parametro, todos os valores)
+FILTER_PARAMS = {"country": "country_name", "price_type": "price_type"}
+
+################### cortes de avaliacao e colunas de entrega das cidades (mesmos valores da Visao Cidades)
+CITY_METRICS = {"restaurants": None, "rating_above": 4.0, "rating_below": 2.5, "is_delivering_now": None,
+                "has_online_delivery": None}
+
+################### erro de consulta: status e o codigo HTTP correspondente (404 consulta inexistente, 400 parametro invalido)
+class QueryError(ValueError):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+################### dados filtrados de uma consulta, carregados sob demanda (cada consulta usa somente o que precisa):
+################### o cubo filtrado, o histograma de precos e a selecao das linhas do dataset (mascara do motor de filtros)
+class QuerySource:
+    def __init__(self, selections, path=DATASET_PATH):
+        self.selections = selections
+        self.path = path
+
+    @functools.cached_property
+    def cube(self):
+        return load_cube_filters(self.path).select(**self.selections).apply(load_cube(self.path))
+
+    @functools.cached_property
+    def histogram(self):
+        return load_cost_histogram(self.path)
+
+    @functools.cached_property
+    def selection(self):
+        return load_filter_engine(self.path).select(**self.selections)
+
+#----------------------------------------------------------------------------------------------------------------------------#
+#                                                       CONSULTAS                                                            #
+#----------------------------------------------------------------------------------------------------------------------------#
+
+################### restaurantes e cidades por pais (Visao Paises)
+def restaurants_by_country(source):
+    cube = source.cube
+    df_aux = rollup_count(cube, "country_name").join(rollup_nunique(cube, "country_name", "city").rename(columns={"city": "cities"}))
+    return df_aux.sort_values("restaurants", ascending=False)
+
+################### estatisticas do preco para dois por pais (tabela da Visao Paises), opcionalmente em dolar e com percentis
+def cost_statistics(source, usd=False, details=False):
+    stats = describe_cost(source.cube, source.histogram if details else None, ["country_name", "currency"])
+    return to_usd(stats) if usd else stats
+
+################### restaurantes que entregam (ou nao) por pais (Visao Paises)
+def delivery_by_country(source):
+    return rollup_count(source.cube, ["country_name", "is_delivering_now"]).sort_values("restaurants", ascending=False)
+
+################### ranking das cidades (Visao Cidades): por quantidade de restaurantes, por avaliacao acima/abaixo do corte
+################### ou por entrega/pedido online
+def top_cities(source, metric="restaurants", n=10, threshold=None):
+    cube = source.cube
+    if metric not in CITY_METRICS:
+        raise QueryError(f"metric deve ser um de: {', '.join(CITY_METRICS)}")
+    threshold = CITY_METRICS[metric] if threshold is None else threshold
+    if metric == "rating_above":
+        cube = cube.loc[cube["aggregate_rating"] > threshold, :]
+    elif metric == "rating_below":
+        cube = cube.loc[cube["aggregate_rating"] < threshold, :]
+    elif metric != "restaurants":
+        cube = cube.loc[cube[metric] == 1, :]
+    return top_k(rollup_count(cube, ["city", "country_name"]), "restaurants", n)
+
+################### tipos de culinaria com mais restaurantes (Visao Culinaria): com all_cuisines (padrao da pagina) cada
+################### restaurante conta em todas as suas culinarias (indice de culinarias); sem, somente na primeira (cubo)
+def top_cuisines(source, n=5, all_cuisines=True):
+    if all_cuisines:
+        counts = load_cuisine_index(source.path).counts(source.selection.mask)
+    else:
+        counts = rollup_count(source.cube, "cuisines")
+    return top_k(counts, "restaurants", n)
+
+################### consultas disponiveis: nome -> (funcao, parametros proprios com o tipo e o valor padrao)
+QUERIES = {
+"restaurants_by_country": (restaurants_by_country, {}),
+"cost_statistics": (cost_statistics, {"usd": (bool, False), "details": (bool, False)}),
+"delivery_by_country": (delivery_by_country, {}),
+"top_cities": (top_cities, {"metric": (str, "restaurants"), "n": (int, 10), "threshold": (float, None)}),
+"top_cuisines": (top_cuisines, {"n": (int, 5), "all_cuisines": (bool, True)}),
+}
+
+#----------------------------------------------------------------------------------------------------------------------------#
+#                                                        FUNCOES                                                             #
+#----------------------------------------------------------------------------------------------------------------------------#
+
+################### convertendo um valor recebido (texto da URL ou valor python) para o tipo do parametro
+def convert(name, kind, value):
+    if isinstance(value, (list, tuple)):
+        if len(value) != 1:
+            raise QueryError(f"o parâmetro '{name}' aceita um único valor")
+        value = value[0]
+    if kind is bool and isinstance(value, str):
+        if value.lower() not in ("1", "true", "0", "false"):
+            raise QueryError(f"o parâmetro '{name}' deve ser true ou false")
+        return value.lower() in ("1", "true")
+    try:
+        return kind(value)
+    except (TypeError, ValueError):
+        raise QueryError(f"o parâmetro '{name}' deve ser do tipo {kind.__name__}") from None
+
+################### validando os parametros de uma consulta: (filtros do cubo, argumentos da funcao)
+# filtros aceitam varios valores (lista ou texto separado por virgula); parametros desconhecidos sao recusados
+def parse_params(name, params):
+    if name not in QUERIES:
+        raise QueryError(f"consulta desconhecida: {name} (disponíveis: {', '.join(QUERIES)})", status=404)
+    _, spec = QUERIES[name]
+    unknown = set(params) - set(spec) - set(FILTER_PARAMS)
+    if unknown:
+        raise QueryError(f"parâmetro(s) desconhecido(s): {', '.join(sorted(unknown))}")
+    selections = {}
+    for param, dimension in FILTER_PARAMS.items():
+        if param in params:
+            values = [params[param]] if isinstance(params[param], str) else list(params[param])
+            selections[dimension] = [value for item in values for value in str(item).split(",") if value]
+    kwargs = {param: convert(param, kind, params[param]) for param, (kind, _) in spec.items() if param in params}
+    if kwargs.get("n", 1) < 1:
+        raise QueryError("o parâmetro 'n' deve ser maior que zero")
+    return selections, kwargs
+
+################### versao dos dados de uma consulta: considera somente os paises filtrados (como nos dashboards)
+def query_version(selections, path=DATASET_PATH):
+    return dataset_version(path, selections.get("country_name"))
+
+################### ETag da resposta: muda quando a consulta, os parametros ou a versao do dataset mudam
+def query_etag(name, selections, kwargs, version):
+    key = repr((name, normalize(selections, unordered=True), normalize(kwargs), version))
+    return '"' + hashlib.sha1(key.encode("utf-8")).hexdigest()[:24] + '"'
+
+################### DataFrame do resultado como lista de registros (indice vira coluna; NaN vira None)
+def records(df):
+    df = df.reset_index()
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(str)
+    values = df.astype(object).where(df.notna(), None)
+    return [{col: (value.item() if isinstance(value, np.generic) else value) for col, value in zip(df.columns, row)}
+            for row in values.itertuples(index=False, name=None)]
+
+################### executando uma consulta (em cache): params e um dicionario com os parametros (ex.: da URL)
+def run_query(name, params=None, path=DATASET_PATH):
+    selections, kwargs = parse_params(name, params or {})
+    version = query_version(selections, path)
+    key = (name, normalize(selections, unordered=True), normalize(kwargs), version)
+
+    def build():
+        function, _ = QUERIES[name]
+        result = function(QuerySource(selections, path), **kwargs)
+        return {"query": name, "filters": selections, "params": kwargs, "dataset_version": version,
+                "data": records(result)}
+
+    return QUERY_CACHE.get_or_build(key, build)
@@ -0,0 +1,44 @@
+################### bibliotecas necessarias (libraries)
+import numpy as np
+
+#----------------------------------------------------------------------------------------------------------------------------#
+#                                                        FUNCOES                                                             #
+#----------------------------------------------------------------------------------------------------------------------------#
+
+################### posicoes das k primeiras linhas de um ranking sem ordenar todas as linhas
+# np.partition separa em O(n) os candidatos (o k-esimo valor e todos os empatados com ele) e somente eles sao ordenados;
+# o desempate e pela coluna tiebreak (crescente) ou, sem ela, pela posicao da linha, como um sort estavel
+def top_k_positions(values, k, ascending=False, tiebreak=None):
+    values = np.asarray(values, dtype=np.float64)
+    key = values if ascending else -values
+    n = len(key)
+    if k <= 0 or n == 0:
+        return np.empty(0, dtype=np.int64)
+    if k < n:
+        kth = np.partition(key, k - 1)[k - 1]
+        candidates = np.flatnonzero(key <= kth)
+    else:
+        candidates = np.arange(n)
+    if tiebreak is None:
+        order = np.argsort(key[candidates], kind="stable")
+    else:
+        order = np.lexsort((np.asarray(tiebreak)[candidates], key[candidates]))
+    return candidates[order[:k]]
+
+################### as k primeiras linhas do DataFrame ordenadas pela coluna (equivale a sort_values(...).head(k))
+def top_k(df, column, k, ascending=False, tiebreak=None):
+    positions = top_k_positions(df[column].to_numpy(), k, ascending,
+                                None if tiebreak is None else df[tiebreak].to_numpy())
+    return df.iloc[positions]
+
+################### a melhor linha de cada grupo (ex.: o restaurante de maior avaliacao de cada culinaria) em uma passada
+# uma unica ordenacao por (valor decrescente, tiebreak crescente) e a primeira ocorrencia de cada grupo e a vencedora;
+# grupos sem linhas simplesmente nao aparecem no resultado (o indice e o proprio grupo)
+def best_per_group(df, group, column, tiebreak=None):
+    values = -df[column].to_numpy(dtype=np.float64)
+    keys = (values,) if tiebreak is None else (df[tiebreak].to_numpy(), values)
+    order = np.lexsort(keys)
+    codes = np.asarray(df[group].astype(str).to_numpy())[order]
+    _, first = np.unique(codes, return_index=True)
+    best = df.iloc[order[first]]
+    return best.set_index(best[group].astype(str).rename(group), drop=False)
@@ -0,0 +1,81 @@
+################### bibliotecas necessarias (libraries)
+import functools
+import io
+import os
+
+# streamlit, o painel de debug e os filtros (pandas) sao importados dentro das funcoes: as paginas ja os carregaram
+# quando chamam a barra lateral, e importar o modulo sozinho (testes, benchmarks de importacao) continua instantaneo
+
+################### logo exibido no topo da barra lateral de todas as paginas
+LOGO_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "zomato.jpg")
+LOGO_WIDTH = 210
+
+################### filtros da barra lateral: rotulo e chave em que a selecao fica guardada na sessao (a selecao padrao
+################### e DEFAULT_SELECTIONS de utils.filters)
+# (all_cuisines e cuisines compartilham a mesma selecao guardada)
+FILTER_LABELS = {
+"country_name": "Selecione os países:",
+"price_type": "Selecione os tipos de preço:",
+"cuisines": "Selecione os tipos de culinária:",
+"all_cuisines": "Selecione os tipos de culinária:",
+}
+STORAGE_KEYS = {"all_cuisines": "cuisines"}
+STATE_KEY = "sidebar_selections"
+
+#----------------------------------------------------------------------------------------------------------------------------#
+#                                                        FUNCOES                                                             #
+#----------------------------------------------------------------------------------------------------------------------------#
+
+################### logo ja decodificado e reduzido para a largura exibida, uma unica vez por processo
+# o streamlit recebe bytes JPEG do tamanho final e nao precisa converter/redimensionar a imagem a cada rerun
+@functools.lru_cache(maxsize=None)
+def logo_bytes(path=LOGO_PATH, width=LOGO_WIDTH):
+    # PIL so e importado na primeira chamada
+    from PIL import Image
+    with Image.open(path) as image:
+        height = int(1.0 * image.height * width / image.width)
+        resized = image.convert("RGB").resize((width, height), resample=Image.BILINEAR)
+    buffer = io.BytesIO()
+    resized.save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+################### topo da barra lateral (logo e titulo), igual em todas as paginas
+def sidebar_header():
+    import streamlit as st
+    st.sidebar.image(logo_bytes(), width=LOGO_WIDTH)
+    st.sidebar.markdown("# Zomato Restaurants")
+    st.sidebar.markdown("### Food Delivery")
+    st.sidebar.divider()
+
+################### filtros da barra lateral com as opcoes pre-calculadas pelo loader
+# a selecao fica guardada em st.session_state e e restaurada ao trocar de pagina (o streamlit descarta o estado dos
+# widgets que nao aparecem na pagina atual); valores que nao existem nas opcoes atuais sao ignorados.
+# devolve as selecoes e, quando um motor de filtros e informado, a selecao preguicosa dele (mascara/linhas prontas);
+# com title=False o titulo "Filtros" nao e repetido (para continuar a lista de filtros depois de outro widget)
+def sidebar_filters(dimensions=("country_name", "price_type"), engine=None, title=True):
+    import streamlit as st
+    from utils.filters import DEFAULT_SELECTIONS, load_filter_options
+    options = load_filter_options()
+    stored = st.session_state.setdefault(STATE_KEY, {})
+    if title:
+        st.sidebar.markdown("## Filtros:")
+    selections = {}
+    for dimension in dimensions:
+        storage_key = STORAGE_KEYS.get(dimension, dimension)
+        widget_key = f"filtro_{dimension}"
+        choices = options[dimension]
+        if widget_key not in st.session_state:
+            available = set(choices)
+            st.session_state[widget_key] = [value for value in stored.get(storage_key, DEFAULT_SELECTIONS[storage_key])
+                                            if value in available]
+        selections[dimension] = st.sidebar.multiselect(FILTER_LABELS[dimension], choices, key=widget_key)
+        stored[storage_key] = selections[dimension]
+    return selections, (engine.select(**selections) if engine is not None else None)
+
+################### rodape da barra lateral (painel de debug opcional e autoria)
+def sidebar_footer():
+    import streamlit as st
+    from utils.debug import debug_panel
+    st.sidebar.divider()
+    debug_panel()
+    st.sidebar.markdown(":gray[Developed by Thaylla Alves]")
@@ -0,0 +1,105 @@
+################### bibliotecas necessarias (libraries)
+import json
+import os
+import sys
+
+# pyarrow e opcional: sem ele os dashboards continuam funcionando a partir do CSV
+try:
+    import pyarrow as pa
+    from pyarrow import feather
+except ImportError:
+    pa = None
+    feather = None
+
+#----------------------------------------------------------------------------------------------------------------------------#
+#                                                        FUNCOES                                                             #
+#----------------------------------------------------------------------------------------------------------------------------#
+
+################### caminho do snapshot colunar correspondente ao CSV
+def snapshot_path(csv_path):
+    return os.path.splitext(csv_path)[0] + ".feather"
+
+################### caminho do snapshot do cubo de agregados (gravado pela atualizacao incremental)
+def cube_snapshot_path(csv_path):
+    return os.path.splitext(csv_path)[0] + ".cube.feather"
+
+################### caminho das impressoes digitais das linhas do CSV bruto (gravadas pela atualizacao incremental)
+def rows_snapshot_path(csv_path):
+    return os.path.splitext(csv_path)[0] + ".rows.feather"
+
+################### caminho do registro de versao do dataset (gravado pela atualizacao incremental)
+def manifest_path(csv_path):
+    return os.path.splitext(csv_path)[0] + ".version.json"
+
+################### diretorio das paginas estaticas pre-renderizadas (gravado por utils.static_export)
+def static_export_dir(csv_path):
+    return os.path.splitext(csv_path)[0] + ".static"
+
+################### registro de versao do dataset; com current=True so e devolvido se corresponder ao CSV atual
+################### (mesmo mtime e tamanho), caso contrario devolve o ultimo registro gravado
+def read_manifest(csv_path, current=True):
+    path = manifest_path(csv_path)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as file:
+        manifest = json.load(file)
+    if not current:
+        return manifest
+    if not os.path.exists(csv_path):
+        return None
+    stat = os.stat(csv_path)
+    if manifest.get("csv_mtime_ns") != stat.st_mtime_ns or manifest.get("csv_size") != stat.st_size:
+        return None
+    return manifest
+
+################### gravando o registro de versao do dataset
+def write_manifest(csv_path, manifest):
+    stat = os.stat(csv_path)
+    manifest = dict(manifest, csv_mtime_ns=stat.st_mtime_ns, csv_size=stat.st_size)
+    tmp_path = manifest_path(csv_path) + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(manifest, file, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, manifest_path(csv_path))
+    return manifest
+
+################### colunas gravadas no snapshot (le somente o esquema do arquivo)
+def snapshot_columns(path):
+    with pa.memory_map(path) as source:
+        return pa.ipc.open_file(source).schema.names
+
+################### o snapshot so e usado quando existe, e mais novo que o CSV e possui todas as colunas exigidas
+################### (um snapshot gravado por uma versao anterior do preparo, sem alguma coluna nova, e ignorado)
+def is_snapshot_fresh(csv_path, path=None, required=()):
+    path = path or snapshot_path(csv_path)
+    if feather is None or not os.path.exists(path):
+        return False
+    if required and not set(required) <= set(snapshot_columns(path)):
+        return False
+    if not os.path.exists(csv_path):
+        return True
+    return os.stat(path).st_mtime_ns >= os.stat(csv_path).st_mtime_ns
+
+################### gravando o DataFrame preparado em Feather sem compressao (permite memory-map na leitura)
+# os tipos compactos (category/bool/int) definidos em SCHEMA sao preservados no arquivo
+def write_snapshot(df, path):
+    if feather is None:
+        raise ImportError("pyarrow é necessário para gravar o snapshot colunar")
+    table = pa.Table.from_pandas(df.reset_index(drop=True), preserve_index=False)
+    tmp_path = path + ".tmp"
+    feather.write_feather(table, tmp_path, compression="uncompressed")
+    os.replace(tmp_path, path)
+    return path
+
+################### lendo somente as colunas pedidas do snapshot via memory-map
+def read_snapshot(path, columns=None):
+    table = feather.read_table(path, columns=list(columns) if columns else None, memory_map=True)
+    return table.to_pandas()
+
+#-----------------------------------------------------------------------------------------------------------------------------#
+#                                      GERACAO DO SNAPSHOT (python -m utils.snapshot)                                         #
+#-----------------------------------------------------------------------------------------------------------------------------#
+
+if __name__ == "__main__":
+    from utils.data_loader import DATASET_PATH, build_snapshot
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else DATASET_PATH
+    print(f"Snapshot gravado em {build_snapshot(csv_path)}")
@@ -0,0 +1,127 @@
+################### bibliotecas necessarias (libraries)
+import math
+import numpy as np
+from haversine import Unit, haversine_vector
+from utils.data_loader import DATASET_PATH, load_derived
+
+################### tamanho da celula da grade (graus) e raio medio da Terra usado para limitar a busca
+CELL_DEGREES = 0.5
+KM_PER_DEGREE = 111.195
+
+################### colunas devolvidas nas consultas de proximidade
+SPATIAL_COLUMNS = ["restaurant_id", "restaurant_name", "country_name", "city", "cuisines", "aggregate_rating",
+                   "average_cost_for_two", "currency", "latitude", "longitude"]
+
+#----------------------------------------------------------------------------------------------------------------------------#
+#                                                        FUNCOES                                                             #
+#----------------------------------------------------------------------------------------------------------------------------#
+
+################### distancia exata (km) de um ponto ate varias coordenadas
+def haversine_km(lat, lon, point_lat, point_lon):
+    if len(lat) == 0:
+        return np.empty(0)
+    points = np.column_stack([lat, lon])
+    return haversine_vector(points, np.array([[point_lat, point_lon]]), Unit.KILOMETERS, comb=True).ravel()
+
+################### indice espacial em grade: os pontos sao ordenados pela celula e cada celula guarda o intervalo
+################### [inicio, fim) de suas posicoes no vetor ordenado (formato CSR)
+class SpatialIndex:
+    def __init__(self, lat, lon, cell_degrees=CELL_DEGREES):
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lon = np.asarray(lon, dtype=np.float64)
+        self.cell = cell_degrees
+        self.n_rows = int(math.ceil(180.0 / cell_degrees)) + 1
+        self.n_cols = int(math.ceil(360.0 / cell_degrees))
+        keys = self._keys(self._row(self.lat), self._col(self.lon))
+        self.order = np.argsort(keys, kind="stable")
+        self.cell_keys, self.cell_starts = np.unique(keys[self.order], return_index=True)
+        self.cell_ends = np.append(self.cell_starts[1:], len(keys))
+
+    def _row(self, lat):
+        return np.floor((np.asarray(lat) + 90.0) / self.cell).astype(np.int64)
+
+    def _col(self, lon):
+        return np.floor((np.asarray(lon) + 180.0) / self.cell).astype(np.int64) % self.n_cols
+
+    def _keys(self, rows, cols):
+        return rows * self.n_cols + cols
+
+    ################### posicoes (no vetor original) dos pontos nas celulas que cobrem o circulo de raio radius_km
+    def candidates(self, lat, lon, radius_km):
+        dlat = radius_km / KM_PER_DEGREE
+        row_min, row_max = self._row(max(lat - dlat, -90.0)), self._row(min(lat + dlat, 90.0))
+        cos_lat = math.cos(math.radians(min(abs(lat) + dlat, 90.0)))
+        if cos_lat < 1e-6 or radius_km / (KM_PER_DEGREE * cos_lat) >= 180.0:
+            cols = np.arange(self.n_cols)
+        else:
+            dlon = radius_km / (KM_PER_DEGREE * cos_lat)
+            col_min = int(np.floor((lon - dlon + 180.0) / self.cell))
+            col_max = int(np.floor((lon + dlon + 180.0) / self.cell))
+            cols = np.unique(np.arange(col_min, col_max + 1) % self.n_cols)
+        rows = np.arange(row_min, row_max + 1)
+        if len(rows) * len(cols) >= len(self.cell_keys):
+            return np.arange(len(self.lat))
+        wanted = self._keys(rows[:, None], cols[None, :]).ravel()
+        pos = np.searchsorted(self.cell_keys, wanted)
+        found = pos < len(self.cell_keys)
+        pos, wanted = pos[found], wanted[found]
+        pos = pos[self.cell_keys[pos] == wanted]
+        if len(pos) == 0:
+            return np.empty(0, dtype=np.int64)
+        lengths = self.cell_ends[pos] - self.cell_starts[pos]
+        offsets = np.repeat(self.cell_starts[pos] - np.cumsum(lengths) + lengths, lengths)
+        return self.order[offsets + np.arange(lengths.sum())]
+
+    ################### restaurantes a ate radius_km do ponto: (posicoes, distancias) ordenados pela distancia
+    def within(self, lat, lon, radius_km):
+        idx = self.candidates(lat, lon, radius_km)
+        dist = haversine_km(self.lat[idx], self.lon[idx], lat, lon)
+        keep = dist <= radius_km
+        idx, dist = idx[keep], dist[keep]
+        order = np.argsort(dist, kind="stable")
+        return idx[order], dist[order]
+
+    ################### k restaurantes mais proximos: a busca comeca numa celula e dobra o raio ate garantir os k vizinhos
+    def nearest(self, lat, lon, k):
+        k = min(k, len(self.lat))
+        radius = self.cell * KM_PER_DEGREE
+        while True:
+            idx, dist = self.within(lat, lon, radius)
+            if len(idx) >= k or radius >= math.pi * 6371.0:
+                return idx[:k], dist[:k]
+            radius *= 2
+
+################### busca exaustiva (todas as linhas), usada como referencia no benchmark
+def brute_force_within(lat, lon, point_lat, point_lon, radius_km):
+    dist = haversine_km(lat, lon, point_lat, point_lon)
+    idx = np.flatnonzero(dist <= radius_km)
+    order = np.argsort(dist[idx], kind="stable")
+    return idx[order], dist[idx][order]
+
+################### busca exaustiva dos k mais proximos, usada como referencia no benchmark
+def brute_force_nearest(lat, lon, point_lat, point_lon, k):
+    dist = haversine_km(lat, lon, point_lat, point_lon)
+    idx = np.argsort(dist, kind="stable")[:k]
+    return idx, dist[idx]
+
+#----------------------------------------------------------------------------------------------------------------------------#
+#                                             INDICE COMPARTILHADO DO PROCESSO                                               #
+#----------------------------------------------------------------------------------------------------------------------------#
+
+# assim como o DataFrame preparado, o indice e construido uma vez por versao do dataset e compartilhado entre as sessoes
+################### carregando (ou construindo) o indice espacial do dataset
+def load_spatial_index(path=DATASET_PATH):
+    builder = lambda df1: (df1, SpatialIndex(df1["latitude"].to_numpy(), df1["longitude"].to_numpy()))
+    return load_derived("spatial_index", builder, path, columns=SPATIAL_COLUMNS)
+
+################### restaurantes a ate radius_km de um ponto, com a coluna distance_km
+def restaurants_within(lat, lon, radius_km, path=DATASET_PATH):
+    df1, index = load_spatial_index(path)
+    idx, dist = index.within(lat, lon, radius_km)
+    return df1.iloc[idx].assign(distance_km=dist).reset_index(drop=True)
+
+################### k restaurantes mais proximos de um ponto, com a coluna distance_km
+def nearest_restaurants(lat, lon, k=10, path=DATASET_PATH):
+    df1, index = load_spatial_index(path)
+    idx, dist = index.nearest(lat, lon, k)
+    return df1.iloc[idx].assign(distance_km=dist).reset_index(drop=True)
@@ -0,0 +1,254 @@
+################### bibliotecas necessarias (libraries)
+import html
+import json
+import os
+import pickle
+import sys
+import threading
+import time
+from utils.charts import (CITY_TITLES, barplot_bycity, barplot_bycountry, barplot_bycuisines, barplot_delivery,
+                          best_by_cuisine, best_restaurants, card_content, delivery_bycity, histogram_aggrating,
+                          pieplot_price, rating_bycity, table_statistic)
+from utils.cube import load_cube, load_cube_filters
+from utils.cuisines import load_cuisine_index
+from utils.data_loader import DATASET_PATH, dataset_version, load_data
+from utils.figure_cache import STATIC_FIGURES, STATIC_SCHEMA, code_stamp, figure_key, static_dir
+from utils.filters import DEFAULT_SELECTIONS, load_filter_engine
+from utils.maps import DEFAULT_VIEW, lod_map_restaurants
+
+# exportacao das paginas Home, Paises, Cidades e Culinaria para HTML estatico com os filtros padrao da barra lateral
+# (python -m utils.static_export [diretorio] [--every=segundos]; sem diretorio, ZOMATO_STATIC_DIR ou dataset/zomato.static). Cada pagina vira um arquivo HTML com as figuras plotly,
+# as tabelas e o mapa; as figuras e tabelas tambem sao gravadas com as chaves do cached_figure (figures.pkl), e com
+# ZOMATO_SERVE_STATIC=1 os dashboards as servem sem calcular quando os filtros e a versao do dataset coincidem.
+# O mapa do Home nao e gravado para os dashboards (o mapa folium nao e serializavel e e recalculado pela area visivel)
+
+################### valores padrao dos controles das paginas (sliders dos rankings e culinarias dos cards)
+TOP_CITIES = 10
+TOP_RATING = 10
+TOP_DELIVERY = 25
+TOP_CUISINES = 5
+TOP_RESTAURANTS = 15
+CARD_CUISINES = ["North Indian", "American", "Cafe", "Italian", "Pizza"]
+
+################### colunas lidas por cada pagina (mesmas listas COLUMNS do Home e da Visao Culinaria)
+HOME_COLUMNS = ["restaurant_id", "restaurant_name", "country_code", "country_name", "city", "cuisines", "price_type",
+                "votes", "aggregate_rating", "color_name", "currency", "average_cost_for_two", "latitude", "longitude"]
+CUISINE_COLUMNS = ["restaurant_id", "restaurant_name", "country_name", "city", "cuisines", "price_type",
+                   "average_cost_for_two", "currency", "aggregate_rating", "votes"]
+
+PAGE_TITLES = {"home": "📈 Zomato Restaurants Dashboard", "paises": "🌍 Visão de Negócios: Países",
+               "cidades": "🌇 Visão de Negócios: Cidades", "culinaria": "👩‍🍳 Visão de Negócios: Restaurantes"}
+MANIFEST = "manifest.json"
+PLOTLY_JS = "plotly.min.js"
+
+STYLE = """body {font-family: "Source Sans Pro", sans-serif; margin: 2rem auto; max-width: 1200px; color: #31333f}
+h2 {font-size: 15pt; color: gray; text-align: center; font-weight: normal}
+.row {display: flex; gap: 1rem} .row > div {flex: 1; min-width: 0}
+.metric {border: 1px solid #ccc; border-left: 0.5rem solid #800000; border-radius: 5px; padding: 0.5rem 1rem}
+.metric .label {font-size: 10pt} .metric .value {font-size: 20pt}
+iframe {width: 100%; height: 600px; border: none} hr {border: none; border-top: 1px solid #ddd; margin: 1.5rem 0}
+footer {font-size: 9pt; color: gray}"""
+
+#----------------------------------------------------------------------------------------------------------------------------#
+#                                                        FUNCOES                                                             #
+#----------------------------------------------------------------------------------------------------------------------------#
+
+################### uma pagina exportada: blocos na ordem da pagina e as figuras que os dashboards podem servir
+# blocos: ("title", texto), ("figure", figura plotly), ("html", tabela), ("metrics", [(rotulo, valor, ajuda)]),
+# ("map", mapa folium), ("divider", None), ("row", [blocos lado a lado]) e ("column", [blocos um abaixo do outro])
+class PageExport:
+    def __init__(self, page, selections, path=DATASET_PATH):
+        self.page = page
+        self.selections = selections
+        self.path = path
+        self.blocks = []
+        self.figures = {}
+
+    ################### executando uma funcao de grafico/tabela como a pagina faz no cached_figure e guardando o resultado
+    def figure(self, function, data, **kwargs):
+        value = function(data, **kwargs)
+        self.figures[figure_key(self.page, self.selections, function, self.path, **kwargs)] = value
+        return value
+
+################### selecoes padrao de cada pagina (as mesmas que a barra lateral mostra numa sessao nova)
+def default_selections(page):
+    selections = {dimension: list(DEFAULT_SELECTIONS[dimension]) for dimension in ["country_name", "price_type"]}
+    if page == "culinaria":
+        selections["all_cuisines"] = list(DEFAULT_SELECTIONS["cuisines"])
+    return selections
+
+################### Home: metricas e mapa na area visivel inicial
+def export_home(path=DATASET_PATH):
+    export = PageExport("home", default_selections("home"), path)
+    df1 = load_filter_engine(path).select(**export.selections).apply(load_data(path, columns=HOME_COLUMNS))
+    export.blocks += [("title", "Principais métricas do dashboard com base nos filtros:"),
+                      ("metrics", [("Restaurantes cadastrados", df1["restaurant_id"].nunique(), None),
+                                   ("Países cadastrados", df1["country_code"].nunique(), None),
+                                   ("Cidades cadastradas", df1["city"].nunique(), None),
+                                   ("Total de avaliações", "{0:,}".format(df1["votes"].sum()).replace(",", "."), None),
+                                   ("Tipos de culinária cadastrados", df1["cuisines"].nunique(), None)]),
+                      ("title", "Mapa com a localização dos restaurantes:")]
+    map, map_info = lod_map_restaurants(df1, zoom=DEFAULT_VIEW["zoom"], bounds=DEFAULT_VIEW["bounds"],
+                                        center=DEFAULT_VIEW["center"])
+    export.blocks += [("map", map), ("html", f"<footer>{map_info['points']:,} pontos no mapa ({map_info['mode']}) para "
+                                             f"{map_info['restaurants']:,} restaurantes</footer>".replace(",", "."))]
+    return export
+
+################### Visao Paises (a tabela e exportada nas quatro combinacoes das caixas de dolar e percentis)
+def export_paises(path=DATASET_PATH):
+    export = PageExport("paises", default_selections("paises"), path)
+    cube = load_cube_filters(path).select(**export.selections).apply(load_cube(path))
+    export.blocks += [("row", [("figure", export.figure(barplot_bycountry, cube, var2="restaurant_id",
+                                                        title="Quantidade de restaurantes")),
+                               ("figure", export.figure(barplot_bycountry, cube, var2="city",
+                                                        title="Quantidade de cidades"))]),
+                      ("divider", None), ("title", "Estatísticas Descritivas de preço para duas pessoas por País")]
+    for usd in [False, True]:
+        for details in [False, True]:
+            table = export.figure(table_statistic, cube, usd=usd, details=details, csv_path=path)
+            if not usd and not details:
+                export.blocks.append(("html", table))
+    export.blocks += [("divider", None), ("figure", export.figure(barplot_delivery, cube))]
+    return export
+
+################### Visao Cidades
+def export_cidades(path=DATASET_PATH):
+    export = PageExport("cidades", default_selections("cidades"), path)
+    cube = load_cube_filters(path).select(**export.selections).apply(load_cube(path))
+    export.blocks += [("figure", export.figure(barplot_bycity, cube, n=TOP_CITIES)), ("divider", None),
+                      ("row", [("figure", export.figure(rating_bycity, cube, restricao="maior", valor=4, n=TOP_RATING,
+                                                        title=CITY_TITLES["rating_above"])),
+                               ("figure", export.figure(rating_bycity, cube, restricao="menor", valor=2.5, n=TOP_RATING,
+                                                        title=CITY_TITLES["rating_below"]))])]
+    for column in ["is_delivering_now", "has_online_delivery"]:
+        export.blocks += [("divider", None), ("figure", export.figure(delivery_bycity, cube, var_selecao=column,
+                                                                      n=TOP_DELIVERY, title=CITY_TITLES[column]))]
+    return export
+
+################### Visao Culinaria (modo padrao: todas as culinarias de cada restaurante)
+def export_culinaria(path=DATASET_PATH):
+    export = PageExport("culinaria", default_selections("culinaria"), path)
+    data = load_data(path, columns=CUISINE_COLUMNS)
+    cuisine_index = load_cuisine_index(path)
+    cuisines = export.selections["all_cuisines"]
+    selection = load_filter_engine(path).select(**export.selections)
+    df1 = selection.apply(data)
+    best = export.figure(best_by_cuisine, cuisine_index.explode(data, selection.mask, cuisines))
+    export.blocks += [("title", f"Melhores restaurantes de {len(CARD_CUISINES)} tipos de culinária"),
+                      ("metrics", [card_content(best, type_food) for type_food in CARD_CUISINES]), ("divider", None),
+                      ("row", [("column", [("title", f"TOP{TOP_CUISINES} - Quantidade de restaurantes por Tipo de Culinária"),
+                                           ("figure", export.figure(barplot_bycuisines,
+                                                                    cuisine_index.counts(selection.mask, cuisines),
+                                                                    n=TOP_CUISINES))]),
+                               ("column", [("title", "Distribuição do tipo de preço dos restaurantes"),
+                                           ("figure", export.figure(pieplot_price, selection.counts("price_type").reset_index()))])]),
+                      ("divider", None), ("title", "Distribuição das avaliações médias dos restaurantes"),
+                      ("figure", export.figure(histogram_aggrating, df1)), ("divider", None),
+                      ("title", f"TOP {TOP_RESTAURANTS} Restaurantes com a maior avaliação média"),
+                      ("html", export.figure(best_restaurants, df1, n=TOP_RESTAURANTS)),
+                      ("html", "<footer>* Preço médio para duas pessoas</footer>")]
+    return export
+
+EXPORTERS = {"home": export_home, "paises": export_paises, "cidades": export_cidades, "culinaria": export_culinaria}
+
+################### html de um bloco (o javascript do plotly e carregado uma vez no cabecalho da pagina)
+def block_html(kind, content):
+    if kind == "title":
+        return f"<h2>{html.escape(content)}</h2>"
+    if kind == "figure":
+        return content.to_html(full_html=False, include_plotlyjs=False, config={"responsive": True})
+    if kind == "html":
+        return content
+    if kind == "metrics":
+        return "<div class='row'>" + "".join(
+            f"<div class='metric' title='{html.escape(str(help or ''))}'><div class='label'>{html.escape(str(label))}</div>"
+            f"<div class='value'>{html.escape(str(value))}</div></div>" for label, value, help in content) + "</div>"
+    if kind == "map":
+        return f"<iframe srcdoc=\"{html.escape(content.get_root().render(), quote=True)}\"></iframe>"
+    if kind == "divider":
+        return "<hr>"
+    if kind == "row":
+        return "<div class='row'>" + "".join(f"<div>{block_html(*block)}</div>" for block in content) + "</div>"
+    if kind == "column":
+        return "<div>" + "".join(block_html(*block) for block in content) + "</div>"
+    raise ValueError(f"bloco desconhecido: {kind}")
+
+################### pagina html completa (o filtro usado e a versao do dataset ficam no rodape)
+def page_html(export, version, generated_at):
+    links = " | ".join(f"<a href='{page}.html'>{html.escape(title)}</a>" for page, title in PAGE_TITLES.items())
+    filters = "; ".join(f"{dimension}: {', '.join(values)}" for dimension, values in export.selections.items())
+    body = "\n".join(block_html(*block) for block in export.blocks)
+    return (f"<!DOCTYPE html>\n<html lang='pt-BR'><head><meta charset='utf-8'><title>{html.escape(PAGE_TITLES[export.page])}"
+            f"</title><script src='{PLOTLY_JS}'></script><style>{STYLE}</style></head><body>\n<nav>{links}</nav>\n"
+            f"<h1>{html.escape(PAGE_TITLES[export.page])}</h1>\n{body}\n<hr><footer>Filtros: {html.escape(filters)}<br>"
+            f"Versão do dataset: {version} | Gerado em {generated_at}</footer>\n</body></html>\n")
+
+################### gravando um arquivo de forma atomica (os dashboards nunca leem um arquivo pela metade)
+def write_atomic(file, content):
+    tmp_path = f"{file}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(content.encode("utf-8") if isinstance(content, str) else content)
+    os.replace(tmp_path, file)
+    return file
+
+################### exportando as paginas: html de cada uma, figures.pkl (servido pelos dashboards) e manifest.json
+def export_static(directory=None, path=DATASET_PATH, pages=tuple(EXPORTERS)):
+    from plotly.offline import get_plotlyjs
+    directory = directory or static_dir(path)
+    os.makedirs(directory, exist_ok=True)
+    if not os.path.exists(os.path.join(directory, PLOTLY_JS)):
+        write_atomic(os.path.join(directory, PLOTLY_JS), get_plotlyjs())
+    version = dataset_version(path)
+    generated_at = time.strftime("%Y-%m-%d %H:%M:%S")
+    figures = {}
+    timings = {}
+    for page in pages:
+        start = time.perf_counter()
+        export = EXPORTERS[page](path)
+        write_atomic(os.path.join(directory, f"{page}.html"), page_html(export, version, generated_at))
+        figures.update(export.figures)
+        timings[page] = round(time.perf_counter() - start, 3)
+    # as figuras sao gravadas por ultimo: os dashboards passam a servir a nova exportacao de uma vez; o carimbo do codigo
+    # vai junto das figuras (os dashboards recusam uma exportacao feita por outro codigo dos graficos)
+    stamp = code_stamp()
+    write_atomic(os.path.join(directory, STATIC_FIGURES), pickle.dumps(
+        {"code_stamp": stamp, "schema": STATIC_SCHEMA, "figures": figures}, protocol=pickle.HIGHEST_PROTOCOL))
+    manifest = {"generated_at": generated_at, "dataset_version": version, "code_stamp": stamp, "schema": STATIC_SCHEMA,
+                "pages": list(pages), "figures": len(figures),
+                "seconds": timings, "selections": {page: default_selections(page) for page in pages}}
+    write_atomic(os.path.join(directory, MANIFEST), json.dumps(manifest, ensure_ascii=False, indent=2))
+    return manifest
+
+################### (versao do dataset, carimbo do codigo) da ultima exportacao do diretorio (None sem exportacao)
+def exported_version(directory):
+    try:
+        with open(os.path.join(directory, MANIFEST), encoding="utf-8") as f:
+            manifest = json.load(f)
+        return manifest["dataset_version"], manifest.get("code_stamp")
+    except (OSError, ValueError, KeyError):
+        return None
+
+################### exportacao agendada: a cada every segundos confere a versao do dataset e o carimbo do codigo e exporta
+################### somente quando algum deles mudou
+def export_every(every, directory=None, path=DATASET_PATH):
+    directory = directory or static_dir(path)
+    while True:
+        if exported_version(directory) != (dataset_version(path), code_stamp()):
+            manifest = export_static(directory, path)
+            print(f"{manifest['generated_at']}: {manifest['figures']} figuras exportadas em {directory} "
+                  f"(versão {manifest['dataset_version']})", flush=True)
+        time.sleep(every)
+
+#-----------------------------------------------------------------------------------------------------------------------------#
+#                          EXPORTACAO (python -m utils.static_export [diretorio] [--every=segundos])                          #
+#-----------------------------------------------------------------------------------------------------------------------------#
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--every=")]
+    every = [float(arg.split("=", 1)[1]) for arg in sys.argv[1:] if arg.startswith("--every=")]
+    directory = args[0] if args else None
+    if every:
+        export_every(every[0], directory)
+    else:
+        manifest = export_static(directory)
+        print(json.dumps(manifest, ensure_ascii=False, indent=2))
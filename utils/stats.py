@@ -0,0 +1,124 @@
+################### bibliotecas necessarias (libraries)
+import numpy as np
+import pandas as pd
+from utils.cube import CUBE_COLUMNS, CUBE_DIMENSIONS, load_cube, rollup_cost
+from utils.data_loader import DATASET_PATH, load_derived
+
+################### percentis calculados por padrao (a mediana e o percentil 50%)
+PERCENTILES = [0.25, 0.5, 0.75]
+
+################### tabela local de cambio: moeda real de cada pais e quantas unidades dela valem 1 dolar (USD)
+# valores de referencia aproximados, editaveis aqui; a chave e o pais porque a coluna currency do dataset repete
+# "Dollar($)" para Australia, Canada, Singapura e EUA (e a Philippines aparece como "Botswana Pula(P)")
+EXCHANGE_RATES = {
+"India": ("INR", 83.0),
+"Australia": ("AUD", 1.52),
+"Brazil": ("BRL", 5.0),
+"Canada": ("CAD", 1.36),
+"Indonesia": ("IDR", 15700.0),
+"New Zeland": ("NZD", 1.65),
+"Philippines": ("PHP", 56.5),
+"Qatar": ("QAR", 3.64),
+"Singapure": ("SGD", 1.34),
+"South Africa": ("ZAR", 18.5),
+"Sri Lanka": ("LKR", 300.0),
+"Turkey": ("TRY", 32.0),
+"United Arab Emirates": ("AED", 3.6725),
+"England": ("GBP", 0.79),
+"United States of America": ("USD", 1.0),
+}
+
+################### colunas monetarias da tabela de estatisticas (convertidas na visao em dolar)
+MONEY_COLUMNS = ["cost_mean", "cost_std", "cost_min", "cost_max"]
+
+#----------------------------------------------------------------------------------------------------------------------------#
+#                                                        FUNCOES                                                             #
+#----------------------------------------------------------------------------------------------------------------------------#
+
+################### histograma do preco para dois por celula do cubo: (celula, valor, quantidade de linhas)
+# o preco e inteiro e se repete muito, entao o histograma e pequeno, exato e somavel (blocos ou fatias de filtro sao
+# combinados somando as quantidades); "cell" e o rotulo da linha correspondente no cubo
+def build_cost_histogram(cube, df):
+    counts = df.groupby(CUBE_DIMENSIONS + ["average_cost_for_two"], observed=True).size()
+    cells = pd.MultiIndex.from_frame(cube[CUBE_DIMENSIONS].astype(object))
+    keys = pd.MultiIndex.from_frame(counts.index.to_frame(index=False)[CUBE_DIMENSIONS].astype(object))
+    return pd.DataFrame({"cell": cube.index.to_numpy()[cells.get_indexer(keys)].astype(np.int32),
+                         "value": counts.index.get_level_values("average_cost_for_two").to_numpy(dtype=np.float64),
+                         "count": counts.to_numpy(dtype=np.int64)})
+
+################### carregando (ou construindo) o histograma do cubo do dataset, compartilhado pelo processo
+def load_cost_histogram(path=DATASET_PATH):
+    return load_derived("cost_histogram", lambda df1: build_cost_histogram(load_cube(path), df1), path, columns=CUBE_COLUMNS)
+
+################### percentis por grupo a partir do histograma, com a mesma interpolacao linear do pandas (quantile)
+# ordena uma unica vez por (grupo, valor); o valor de posicao r de um grupo e achado por busca binaria na soma acumulada
+def histogram_percentiles(codes, values, counts, n_groups, percentiles=PERCENTILES):
+    order = np.lexsort((values, codes))
+    codes, values, cumulative = codes[order], values[order], np.cumsum(counts[order])
+    totals = np.bincount(codes, weights=counts[order], minlength=n_groups).astype(np.int64)
+    before = np.concatenate([[0], np.cumsum(totals)[:-1]])
+    result = np.full((n_groups, len(percentiles)), np.nan)
+    has_rows = totals > 0
+    for j, q in enumerate(percentiles):
+        position = (totals[has_rows] - 1) * q
+        low, high = np.floor(position).astype(np.int64), np.ceil(position).astype(np.int64)
+        low_value = values[np.searchsorted(cumulative, before[has_rows] + low, side="right")]
+        high_value = values[np.searchsorted(cumulative, before[has_rows] + high, side="right")]
+        result[has_rows, j] = low_value + (position - low) * (high_value - low_value)
+    return result
+
+################### estatisticas do preco para dois por grupo: n, media, desvio padrao, minimo e maximo a partir das
+################### parciais de Welford do cubo (combinadas pelo algoritmo de Chan) e mediana/percentis pelo histograma
+# o cubo pode estar filtrado (cube_filters.select(...).apply(cube)): somente as linhas do histograma das celulas
+# presentes no cubo sao consideradas
+def describe_cost(cube, histogram, by, percentiles=PERCENTILES):
+    by = [by] if isinstance(by, str) else list(by)
+    stats = rollup_cost(cube, by)[["cost_n", "cost_mean", "cost_std", "cost_min", "cost_max"]]
+    if histogram is None or not percentiles:
+        return stats
+    histogram = histogram.loc[histogram["cell"].isin(cube.index).to_numpy(), :]
+    groups = pd.MultiIndex.from_frame(cube.loc[histogram["cell"], by].astype(object))
+    codes = pd.MultiIndex.from_frame(stats.index.to_frame(index=False).astype(object)).get_indexer(groups)
+    result = histogram_percentiles(codes, histogram["value"].to_numpy(), histogram["count"].to_numpy(), len(stats),
+                                   percentiles)
+    for j, q in enumerate(percentiles):
+        stats[f"cost_p{q * 100:g}"] = result[:, j]
+    return stats
+
+################### convertendo as estatisticas para dolar pela tabela local de cambio (o grupo precisa conter o pais)
+# media, desvio, minimo, maximo e percentis sao lineares no preco, entao basta dividir pela taxa de cada pais
+def to_usd(stats, rates=EXCHANGE_RATES):
+    countries = stats.index.get_level_values("country_name").astype(str)
+    rate = countries.map(lambda country: rates[country][1]).to_numpy(dtype=np.float64)
+    money = MONEY_COLUMNS + [col for col in stats.columns if col.startswith("cost_p")]
+    stats = stats.copy()
+    stats[money] = stats[money].to_numpy(dtype=np.float64) / rate[:, None]
+    stats["currency_code"] = countries.map(lambda country: rates[country][0]).to_numpy()
+    return stats
+
+################### formatando numeros como "{:,.Nf}".format de forma vetorizada (sem chamar format celula a celula)
+# os digitos vem de np.char.mod (mesmo arredondamento do format) e a parte inteira e remontada em blocos de 3 digitos
+# separados por virgula; valores faltantes viram "nan"
+def format_number(values, decimals=2):
+    values = np.asarray(values, dtype=np.float64)
+    if values.size == 0:
+        return np.empty(values.shape, dtype="U1")
+    missing = np.isnan(values)
+    digits = np.char.mod(f"%.{decimals}f", np.abs(np.where(missing, 0.0, values)))
+    integer_text, _, fraction = np.char.partition(digits, ".").T
+    integer = integer_text.astype(np.int64)
+    levels = [integer % 1000]
+    rest = integer // 1000
+    while (rest > 0).any():
+        levels.append(rest % 1000)
+        rest = rest // 1000
+    text = np.full(values.shape, "", dtype="U1")
+    for k in reversed(range(len(levels))):
+        plain = levels[k].astype(str)
+        started = text != ""
+        text = np.where(started, np.char.add(np.char.add(text, ","), np.char.zfill(plain, 3)),
+                        np.where((levels[k] > 0) | (k == 0), plain, text))
+    if decimals > 0:
+        text = np.char.add(np.char.add(text, "."), fraction)
+    text = np.where(np.signbit(values) & ~missing, np.char.add("-", text), text)
+    return np.where(missing, "nan", text)
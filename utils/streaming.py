@@ -0,0 +1,96 @@
+################### bibliotecas necessarias (libraries)
+import sys
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from utils.cube import CUBE_DIMENSIONS, build_cube, merge_cubes
+from utils.data_loader import DATASET_PATH, enrich_data, optimize_dtypes, rename_columns, split_cuisines
+from utils.outliers import OutlierStage
+
+################### quantidade de linhas lidas do CSV por bloco
+CHUNK_SIZE = 100_000
+
+#----------------------------------------------------------------------------------------------------------------------------#
+#                                                        FUNCOES                                                             #
+#----------------------------------------------------------------------------------------------------------------------------#
+
+################### conjunto compacto das impressoes digitais (hash de 64 bits) das linhas ja vistas, mantido ordenado
+class RowFingerprints:
+    def __init__(self):
+        self.seen = np.empty(0, dtype=np.uint64)
+
+    ################### mascara das linhas do bloco que ainda nao apareceram (nem antes, nem repetidas no proprio bloco)
+    # as impressoes unicas do bloco (ja ordenadas pelo np.unique) sao procuradas nas vistas e as novas sao intercaladas
+    # nas posicoes encontradas (insert, uma copia linear por bloco), sem reordenar o conjunto inteiro a cada bloco
+    def new_rows(self, chunk):
+        fingerprints = pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+        unique, first = np.unique(fingerprints, return_index=True)
+        pos = np.searchsorted(self.seen, unique)
+        unseen = np.ones(len(unique), dtype=bool)
+        if len(self.seen):
+            unseen = self.seen[pos.clip(max=len(self.seen) - 1)] != unique
+        is_new = np.zeros(len(chunk), dtype=bool)
+        is_new[first[unseen]] = True
+        self.seen = np.insert(self.seen, pos[unseen], unique[unseen])
+        return is_new
+
+################### limpeza de um bloco com as mesmas regras de clean_code (dados faltantes, duplicadas entre blocos,
+################### coluna "Switch to order menu", outlier de preco e primeira culinaria)
+def clean_chunk(chunk, fingerprints, outliers):
+    chunk = chunk.dropna()
+    chunk = chunk.loc[fingerprints.new_rows(chunk), :]
+    chunk = chunk.drop(columns="Switch to order menu")
+    chunk = outliers.apply(chunk)
+    return split_cuisines(chunk)
+
+################### bloco limpo, enriquecido, renomeado e com os tipos compactos (mesmo formato de load_data)
+def prepare_chunk(chunk, fingerprints, outliers):
+    return optimize_dtypes(rename_columns(enrich_data(clean_chunk(chunk, fingerprints, outliers))))
+
+################### lendo o CSV em blocos ja limpos e enriquecidos (mesmo formato de load_data)
+# a etapa de outliers e compartilhada entre os blocos (mesmos limites por moeda); informe um OutlierStage para
+# consultar o relatorio das linhas descartadas
+def iter_chunks(path=DATASET_PATH, chunksize=CHUNK_SIZE, outliers=None):
+    fingerprints = RowFingerprints()
+    outliers = OutlierStage() if outliers is None else outliers
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        chunk = prepare_chunk(chunk, fingerprints, outliers)
+        if len(chunk):
+            yield chunk
+
+################### cubo parcial atualizado a cada bloco (permite exibir agregados enquanto o arquivo ainda e lido)
+def iter_cubes(path=DATASET_PATH, chunksize=CHUNK_SIZE):
+    cube = None
+    for chunk in iter_chunks(path, chunksize):
+        chunk_cube = build_cube(chunk)
+        cube = chunk_cube if cube is None else merge_cubes([cube, chunk_cube])
+        yield cube, len(chunk)
+
+################### cubo completo do arquivo, com memoria limitada pelo tamanho do bloco (+ o proprio cubo)
+def stream_cube(path=DATASET_PATH, chunksize=CHUNK_SIZE):
+    cube = None
+    for cube, _ in iter_cubes(path, chunksize):
+        pass
+    if cube is None:
+        raise ValueError(f"Nenhuma linha válida em {path}")
+    for col in CUBE_DIMENSIONS:
+        if cube[col].dtype == object:
+            cube[col] = cube[col].astype("category")
+    return cube
+
+#-----------------------------------------------------------------------------------------------------------------------------#
+#                          LEITURA EM BLOCOS (python -m utils.streaming [csv] [linhas_por_bloco])                             #
+#-----------------------------------------------------------------------------------------------------------------------------#
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else DATASET_PATH
+    chunksize = int(sys.argv[2]) if len(sys.argv) > 2 else CHUNK_SIZE
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = 0
+    for cube, chunk_rows in iter_cubes(path, chunksize):
+        rows += chunk_rows
+        print(f"{rows:>12,} linhas válidas | {len(cube):>9,} células no cubo | {cube['restaurants'].sum():>12,} restaurantes")
+    _, peak = tracemalloc.get_traced_memory()
+    print(f"Tempo: {time.perf_counter() - start:.2f}s | Pico de memória: {peak / 1024 ** 2:.1f} MB")
@@ -0,0 +1,197 @@
+################### bibliotecas necessarias (libraries)
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+from utils.data_loader import DATASET_PATH, clean_code, prepare_data
+from utils.outliers import OutlierStage
+from utils.snapshot import pa
+from utils.streaming import CHUNK_SIZE, RowFingerprints, prepare_chunk
+
+################### semente padrao: a mesma semente (e o mesmo tamanho de bloco) gera sempre o mesmo arquivo
+SEED = 42
+
+################### colunas do CSV original, na mesma ordem
+CSV_COLUMNS = ["Restaurant ID", "Restaurant Name", "Country Code", "City", "Address", "Locality", "Locality Verbose",
+               "Longitude", "Latitude", "Cuisines", "Average Cost for two", "Currency", "Has Table booking",
+               "Has Online delivery", "Is delivering now", "Switch to order menu", "Price range", "Aggregate rating",
+               "Rating color", "Rating text", "Votes"]
+FLAG_COLUMNS = ["Has Table booking", "Has Online delivery", "Is delivering now"]
+
+################### dispersao (graus) das coordenadas em volta do centro de cada cidade: o desvio padrao real da cidade,
+################### limitado a este intervalo (cidades com um unico restaurante ou com coordenadas espalhadas demais)
+MIN_SPREAD = 0.005
+MAX_SPREAD = 0.1
+
+#----------------------------------------------------------------------------------------------------------------------------#
+#                                                        FUNCOES                                                             #
+#----------------------------------------------------------------------------------------------------------------------------#
+
+################### amostragem empirica condicionada a um grupo: os valores de cada grupo ficam contiguos e o sorteio de
+################### um valor (com a frequencia real) e um indice uniforme dentro do trecho do grupo, para milhoes de linhas
+################### de uma vez
+class EmpiricalPool:
+    def __init__(self, groups, values, n_groups):
+        order = np.argsort(groups, kind="stable")
+        self.values = np.asarray(values)[order]
+        self.sizes = np.bincount(groups, minlength=n_groups)
+        self.offsets = np.concatenate([[0], np.cumsum(self.sizes)[:-1]])
+
+    def sample(self, rng, groups):
+        return self.values[self.offsets[groups] + (rng.random(len(groups)) * self.sizes[groups]).astype(np.int64)]
+
+################### distribuicoes aprendidas do dataset real (somente das linhas que sobrevivem a limpeza) por pais:
+# - pais: frequencia real; cidade | pais, (localidade, localidade detalhada) | cidade, nome | pais e culinarias | pais:
+#   sorteios empiricos;
+# - latitude/longitude | cidade: normal em volta da mediana real da cidade (dispersao entre MIN_SPREAD e MAX_SPREAD);
+# - (faixa de preco, preco para dois) | pais: pares reais, entao o preco segue a moeda do pais e a faixa de preco;
+# - avaliacao | pais: empirica; a cor vem da avaliacao (como no dataset real, cada nota tem uma unica cor, consistente
+#   com COLORS) e o texto vem de (pais, cor), respeitando o idioma de cada pais;
+# - votos | pais: log-normal ajustada aos restaurantes avaliados; os nao avaliados (nota 0) sorteiam os votos reais deles;
+# - entrega/reserva/pedido online | pais: proporcao real.
+class SyntheticModel:
+    def __init__(self, raw):
+        real = clean_code(raw.copy()).reset_index(drop=True)
+        self.first_id = int(raw["Restaurant ID"].max()) + 1
+        self.countries, country = np.unique(real["Country Code"].to_numpy(), return_inverse=True)
+        n_countries = len(self.countries)
+        self.country_p = np.bincount(country) / len(real)
+        self.currencies = real.groupby(country)["Currency"].first().to_numpy()
+
+        self.cities, city = np.unique(real["City"].to_numpy(dtype=str), return_inverse=True)
+        self.city_pool = EmpiricalPool(country, city, n_countries)
+        lat = real.groupby(city)["Latitude"]
+        lon = real.groupby(city)["Longitude"]
+        self.city_center = np.column_stack([lat.median().to_numpy(), lon.median().to_numpy()])
+        self.city_spread = np.column_stack([lat.std().fillna(0).to_numpy(), lon.std().fillna(0).to_numpy()])
+        self.city_spread = self.city_spread.clip(MIN_SPREAD, MAX_SPREAD)
+
+        self.localities = real[["Locality", "Locality Verbose"]].to_numpy(dtype=str)
+        self.locality_pool = EmpiricalPool(city, np.arange(len(real)), len(self.cities))
+        self.name_pool = EmpiricalPool(country, real["Restaurant Name"].to_numpy(dtype=str), n_countries)
+        self.cuisine_pool = EmpiricalPool(country, real["All Cuisines"].to_numpy(dtype=str), n_countries)
+        self.prices = real[["Price range", "Average Cost for two"]].to_numpy(dtype=np.int64)
+        self.price_pool = EmpiricalPool(country, np.arange(len(real)), n_countries)
+
+        rating = real["Aggregate rating"].to_numpy(dtype=np.float64)
+        self.rating_pool = EmpiricalPool(country, rating, n_countries)
+        self.colors, color = np.unique(real["Rating color"].to_numpy(dtype=str), return_inverse=True)
+        self.rating_color = np.zeros(51, dtype=np.int64)
+        self.rating_color[np.round(rating * 10).astype(np.int64)] = color
+        texts = real.groupby([country, color])["Rating text"].agg(lambda values: values.value_counts().index[0])
+        fallback = real.groupby(color)["Rating text"].agg(lambda values: values.value_counts().index[0]).to_numpy()
+        self.rating_text = np.tile(fallback.astype(object), (n_countries, 1))
+        self.rating_text[texts.index.get_level_values(0), texts.index.get_level_values(1)] = texts.to_numpy()
+
+        votes = real["Votes"].to_numpy(dtype=np.float64)
+        rated = rating > 0
+        log_votes = pd.Series(np.log1p(votes[rated])).groupby(country[rated])
+        self.votes_mu = log_votes.mean().reindex(range(n_countries)).fillna(0).to_numpy()
+        self.votes_sigma = log_votes.std().reindex(range(n_countries)).fillna(0).to_numpy()
+        unrated_votes = votes[~rated] if (~rated).any() else np.zeros(1)
+        self.unrated_votes = unrated_votes.astype(np.int64)
+        self.flag_p = real.groupby(country)[FLAG_COLUMNS].mean().to_numpy()
+
+    ################### um bloco de linhas sinteticas no esquema do CSV original, com ids a partir de first_id
+    def generate(self, rows, rng, first_id):
+        country = rng.choice(len(self.countries), size=rows, p=self.country_p)
+        city = self.city_pool.sample(rng, country)
+        coords = rng.normal(self.city_center[city], self.city_spread[city])
+        locality = self.localities[self.locality_pool.sample(rng, city)]
+        prices = self.prices[self.price_pool.sample(rng, country)]
+        rating = self.rating_pool.sample(rng, country)
+        color = self.rating_color[np.round(rating * 10).astype(np.int64)]
+        votes = np.rint(np.expm1(rng.normal(self.votes_mu[country], self.votes_sigma[country]))).clip(1, None)
+        votes = np.where(rating > 0, votes, self.unrated_votes[rng.integers(0, len(self.unrated_votes), rows)])
+        flags = rng.random((rows, len(FLAG_COLUMNS))) < self.flag_p[country]
+        numbers = rng.integers(1, 1000, rows).astype(str)
+        return pd.DataFrame({
+            "Restaurant ID": np.arange(first_id, first_id + rows, dtype=np.int64),
+            "Restaurant Name": self.name_pool.sample(rng, country),
+            "Country Code": self.countries[country],
+            "City": self.cities[city],
+            "Address": np.char.add(np.char.add(numbers, ", "), locality[:, 1]),
+            "Locality": locality[:, 0],
+            "Locality Verbose": locality[:, 1],
+            "Longitude": coords[:, 1].clip(-180, 180),
+            "Latitude": coords[:, 0].clip(-90, 90),
+            "Cuisines": self.cuisine_pool.sample(rng, country),
+            "Average Cost for two": prices[:, 1],
+            "Currency": self.currencies[country],
+            **{column: flags[:, i].astype(np.int64) for i, column in enumerate(FLAG_COLUMNS)},
+            "Switch to order menu": np.zeros(rows, dtype=np.int64),
+            "Price range": prices[:, 0],
+            "Aggregate rating": rating,
+            "Rating color": self.colors[color],
+            "Rating text": self.rating_text[country, color],
+            "Votes": votes.astype(np.int64)}, columns=CSV_COLUMNS)
+
+################### modelo aprendido do CSV real
+def learn_model(path=DATASET_PATH):
+    return SyntheticModel(pd.read_csv(path))
+
+################### gerando rows linhas sinteticas em blocos de chunksize linhas (memoria limitada pelo bloco)
+def iter_synthetic(rows, chunksize=CHUNK_SIZE, seed=SEED, model=None, path=DATASET_PATH):
+    model = learn_model(path) if model is None else model
+    rng = np.random.default_rng(seed)
+    for start in range(0, rows, chunksize):
+        yield model.generate(min(chunksize, rows - start), rng, model.first_id + start)
+
+################### dataset sintetico inteiro em memoria (para testes/benchmarks de tamanho moderado)
+def synthetic_dataset(rows, seed=SEED, path=DATASET_PATH):
+    return pd.concat(iter_synthetic(rows, seed=seed, path=path), ignore_index=True)
+
+################### gravando o CSV sintetico (mesmas 21 colunas do original) bloco a bloco
+def write_synthetic_csv(target, rows, chunksize=CHUNK_SIZE, seed=SEED, path=DATASET_PATH):
+    tmp_path = target + ".tmp"
+    for i, chunk in enumerate(iter_synthetic(rows, chunksize, seed, path=path)):
+        chunk.to_csv(tmp_path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+    os.replace(tmp_path, target)
+    return target
+
+################### gravando direto o snapshot colunar (mesmo formato de utils.snapshot) bloco a bloco
+# cada bloco passa pelo mesmo preparo da leitura em blocos (utils.streaming); as colunas category usam sempre as
+# categorias do dataset real preparado, entao todos os blocos tem o mesmo dicionario e sao gravados no mesmo arquivo
+def write_synthetic_snapshot(target, rows, chunksize=CHUNK_SIZE, seed=SEED, path=DATASET_PATH):
+    if pa is None:
+        raise ImportError("pyarrow é necessário para gravar o snapshot colunar")
+    raw = pd.read_csv(path)
+    model = SyntheticModel(raw)
+    reference = prepare_data(raw)
+    categories = {col: reference[col].cat.categories for col in reference.columns if reference[col].dtype == "category"}
+    fingerprints, outliers = RowFingerprints(), OutlierStage()
+    tmp_path = target + ".tmp"
+    writer, schema = None, None
+    try:
+        for chunk in iter_synthetic(rows, chunksize, seed, model):
+            chunk = prepare_chunk(chunk, fingerprints, outliers).reset_index(drop=True)
+            for col, values in categories.items():
+                chunk[col] = chunk[col].astype(pd.CategoricalDtype(values))
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                schema = table.schema
+                writer = pa.ipc.new_file(tmp_path, schema)
+            writer.write_table(table.cast(schema))
+    finally:
+        if writer is not None:
+            writer.close()
+    os.replace(tmp_path, target)
+    return target
+
+#-----------------------------------------------------------------------------------------------------------------------------#
+#        GERACAO DO DATASET SINTETICO (python -m utils.synthetic linhas destino.csv|destino.feather [semente])                #
+#-----------------------------------------------------------------------------------------------------------------------------#
+
+if __name__ == "__main__":
+    rows = int(float(sys.argv[1]))
+    target = sys.argv[2]
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else SEED
+    start = time.perf_counter()
+    if target.endswith(".feather"):
+        write_synthetic_snapshot(target, rows, seed=seed)
+    else:
+        write_synthetic_csv(target, rows, seed=seed)
+    seconds = time.perf_counter() - start
+    print(f"{rows:,} linhas gravadas em {target} ({os.path.getsize(target) / 1024 ** 2:,.1f} MB) em {seconds:.1f}s "
+          f"({rows / seconds:,.0f} linhas/s)")
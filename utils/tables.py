@@ -0,0 +1,50 @@
+################### bibliotecas necessarias (libraries)
+import hashlib
+import numpy as np
+import pandas as pd
+from utils.figure_cache import FigureCache
+
+################### estilo padrao das tabelas dos dashboards (cabecalho vinho com texto branco)
+HEADER_COLOR = "#800000"
+HEADER_TEXT_COLOR = "white"
+
+################### tabelas html ja montadas, guardadas pelo conteudo (a mesma tabela nao e montada duas vezes)
+TABLE_CACHE = FigureCache(max_entries=128)
+
+#----------------------------------------------------------------------------------------------------------------------------#
+#                                                        FUNCOES                                                             #
+#----------------------------------------------------------------------------------------------------------------------------#
+
+################### escapando os caracteres especiais do html de uma coluna inteira de uma vez
+def escape(values):
+    text = np.asarray(values).astype(str)
+    for char, entity in [("&", "&amp;"), ("<", "&lt;"), (">", "&gt;")]:
+        text = np.char.replace(text, char, entity)
+    return text
+
+################### impressao digital do conteudo da tabela (colunas + valores), usada no cache e no id da tabela
+def table_fingerprint(df):
+    hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    digest = hashlib.sha1("\x1f".join(map(str, df.columns)).encode("utf-8"))
+    digest.update(hashes.tobytes())
+    return digest.hexdigest()
+
+################### montando o html da tabela direto das colunas: mesmo visual do Styler usado antes
+################### (set_table_styles no cabecalho + set_properties nas celulas + hide do indice), sem id por celula
+def build_table_html(df, font_size, table_id, header_color=HEADER_COLOR, text_color=HEADER_TEXT_COLOR):
+    style = (f'<style type="text/css">\n#{table_id} th {{\n  background-color: {header_color};\n  color: {text_color};\n'
+             f'  font-size: {font_size};\n}}\n#{table_id} td {{\n  font-size: {font_size};\n}}\n</style>\n')
+    header = "".join(f'      <th class="col_heading level0 col{j}" >{name}</th>\n'
+                     for j, name in enumerate(escape(list(df.columns))))
+    rows = np.full(len(df), "    <tr>\n", dtype=object)
+    for col in range(df.shape[1]):
+        rows = rows + ("      <td>" + escape(df.iloc[:, col].to_numpy()).astype(object) + "</td>\n")
+    body = "".join(rows + "    </tr>\n")
+    return (f'{style}<table id="{table_id}">\n  <thead>\n    <tr>\n{header}    </tr>\n  </thead>\n'
+            f'  <tbody>\n{body}  </tbody>\n</table>\n')
+
+################### tabela html estilizada (em cache pelo conteudo): o indice nunca e exibido
+def render_table(df, font_size="11pt", header_color=HEADER_COLOR):
+    fingerprint = table_fingerprint(df)
+    key = (fingerprint, font_size, header_color)
+    return TABLE_CACHE.get_or_build(key, lambda: build_table_html(df, font_size, f"T_{fingerprint[:5]}", header_color))